@@ -6,15 +6,17 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from PyQt4 import QtGui, QtCore
-
-from QNotifications.abstractions import *
+from QNotifications.animation import AnimationDriver
+from QNotifications.qt import QtGui, QtWidgets, Signal
 
 __author__ = u"Daniel Schreij"
 __license__ = u"GPLv3"
 
+# The largest size of a QWidget (QWIDGETSIZE_MAX, which not all bindings expose).
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
 
-class MessageLabel(QtGui.QLabel):  # QtWidgets.QLabel
+class MessageLabel(QtWidgets.QLabel):
     """
     Subclass of QLabel, which re-implements the resizeEvent() function.
     This is necessary because otherwise the notifications take up too much vertical
@@ -22,9 +24,33 @@ class MessageLabel(QtGui.QLabel):  # QtWidgets.QLabel
     is calculated as the minimum height necessary for the text when the widget is horizontally re-sized to
     its minimum.
 
+    Since wrapping a text is expensive, the heights for widths can be cached in an LRUCache (see heightCache),
+    which can be shared by all labels of a notification area.
+
     :inherits: QtWidgets.QLabel
     """
 
+    def __init__(self, *args, **kwargs):
+        super(MessageLabel, self).__init__(*args, **kwargs)
+        # LRUCache of heights by (text, font, width), or None to disable caching.
+        self.heightCache = None
+
+    def heightForWidth(self, width):
+        """
+        Returns the height the wrapped text needs at the given width, from heightCache if possible.
+
+        :param width: int
+        """
+        if self.heightCache is None:
+            return super(MessageLabel, self).heightForWidth(width)
+
+        key = (self.text(), self.font().key(), width)
+        height = self.heightCache.get(key)
+        if height is None:
+            height = super(MessageLabel, self).heightForWidth(width)
+            self.heightCache.put(key, height)
+        return height
+
     def resizeEvent(self, event):
         """
 
@@ -33,22 +59,28 @@ class MessageLabel(QtGui.QLabel):  # QtWidgets.QLabel
         """
         super(MessageLabel, self).resizeEvent(event)
 
-        # QtWidgets.QSizePolicy.Minimum
-        if self.wordWrap() and self.sizePolicy().verticalPolicy() == QtGui.QSizePolicy.Minimum:
+        if self.wordWrap() and self.sizePolicy().verticalPolicy() == QtWidgets.QSizePolicy.Minimum:
             new_height = self.heightForWidth(self.width())
-            if new_height >= 1:
+            if new_height >= 1 and new_height != self.maximumHeight():
                 self.setMaximumHeight(new_height)
 
 
-class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
+class QNotification(QtWidgets.QWidget):
     """
     Class representing a single notification
 
     :inherits: QtWidgets.QWidget
     """
-    # PyQt signal for click on the notification's close button.
-    # closeClicked = QtCore.Signal()
-    closeClicked = QtCore.pyqtSignal()
+    # The categories a notification can have (adhering to the bootstrap standard classes).
+    allowed_categories = ['primary', 'success', 'info', 'warning', 'danger', 'space-grey']
+
+    # Signal for click on the notification's close button.
+    closeClicked = Signal()
+    # Signals for the mouse entering and leaving the notification.
+    mouseEntered = Signal()
+    mouseLeft = Signal()
+    # Height in pixels of the progress bar (see setProgress()).
+    progress_bar_height = 4
 
     def __init__(self, message, category, timeout=None, button_text=None, *args, **kwargs):
         """
@@ -69,43 +101,37 @@ class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
 
         # Set Object name for reference.
         self.setObjectName(category)
-        self.setLayout(QtGui.QHBoxLayout())  # QtWidgets.QHBoxLayout()
+        self.setLayout(QtWidgets.QHBoxLayout())
         self.setContentsMargins(0, 0, 0, 0)
-        # self.setSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
 
         # Create a message area.
-        # contents = QtWidgets.QWidget(self)
-        # messageArea = QtWidgets.QHBoxLayout()
-        messageArea = QtGui.QHBoxLayout()
+        messageArea = QtWidgets.QHBoxLayout()
         messageArea.setContentsMargins(0, 0, 0, 0)
 
         # Create the layout.
         self.message_display = MessageLabel()
         self.message_display.setObjectName("message")
-        # self.message_display.setSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
-        self.message_display.setSizePolicy(QtGui.QSizePolicy.Minimum, QtGui.QSizePolicy.Minimum)
+        self.message_display.setSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
         self.message_display.setWordWrap(True)
 
+        # The StyleEngine that styles this notification, or None if it is styled with style sheets. It is set
+        # before the close button is given its text, which depends on it.
+        self._styleEngine = None
+
         # Create a button that can close notifications.
-        # if button_text in (None, u''):
-        if button_text is None or button_text == u'':
-            # close_button = QtWidgets.QPushButton(u"\u2715")
-            close_button = QtGui.QPushButton(u"\u2715")
-        else:
-            # close_button = QtWidgets.QPushButton(button_text)
-            close_button = QtGui.QPushButton(button_text)
-            close_button.setStyleSheet(u'text-decoration: underline;')
+        self.close_button = QtWidgets.QPushButton()
+        self.button_text = button_text
+        self.__set_button_text(button_text)
 
-        # close_button.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        close_button.setSizePolicy(QtGui.QSizePolicy.Fixed, QtGui.QSizePolicy.Fixed)
-        close_button.setFlat(True)
-        close_button.setObjectName("closeButton")
-        close_button.clicked.connect(self.closeClicked)
+        self.close_button.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        self.close_button.setFlat(True)
+        self.close_button.setObjectName("closeButton")
+        self.close_button.clicked.connect(self.closeClicked)
 
         # Add everything together.
         messageArea.addWidget(self.message_display)
         # messageArea.addStretch(1)
-        messageArea.addWidget(close_button)
+        messageArea.addWidget(self.close_button)
         self.layout().addLayout(messageArea)
 
         # Initialize some variables.
@@ -118,27 +144,188 @@ class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
         # process of being removed.
         self.isBeingRemoved = False
 
-        self.__init_graphic_effects()
+        # Number of times this notification has been displayed (duplicates are counted on the same widget).
+        self.repeatCount = 1
+        # Priority with which the notification is queued by a notification area.
+        self.priority = 0
+        # Why the notification was removed (e.g. 'timeout' or 'user'), and when it was queued.
+        self.dismissReason = None
+        self.queuedAt = None
+        # Key under which the notification area indexes this notification for duplicate detection.
+        self.coalesceKey = None
+        # Displacement from the position the notification area gave the notification, used by slide effects.
+        self.offsetX = 0
+        self.offsetY = 0
+        # Key with which the notification was displayed, so it can be updated in place (see
+        # QNotificationArea.updateNotification()).
+        self.key = None
+        # Progress between 0 and 1, or None. The progress bar is only created once progress is set.
+        self.progress = None
+        self.progress_bar = None
+        # The QueuedNotification (the handle returned by QNotificationArea.display()) the notification was built
+        # for.
+        self.record = None
+
+        # The opacity effect is only created while the notification fades in or out, as it makes Qt render
+        # the widget offscreen. The driver is the AnimationDriver that runs the fade.
+        self.opacityEffect = None
+        self._animator = None
+
+    def __set_button_text(self, button_text):
+        """ Sets the text of the close button, or a cross if no text is given. """
+        # if button_text in (None, u''):
+        underlined = not (button_text is None or button_text == u'')
+        self.close_button.setText(button_text if underlined else u"\u2715")
+        if self._styleEngine is not None:
+            self.close_button.setFont(self._styleEngine.button_font(underlined))
+        else:
+            self.close_button.setStyleSheet(u'text-decoration: underline;' if underlined else u'')
+
+    def setStyleEngine(self, engine):
+        """
+        Styles the notification with a StyleEngine instead of style sheets.
+
+        :param engine: StyleEngine the engine to use, or None to use style sheets again.
+        """
+        self._styleEngine = engine
+        if engine is not None:
+            self.close_button.setStyleSheet(u'')
+            engine.apply(self)
+        self.__set_button_text(self.button_text)
+        self.update()
+
+    def reset(self, message, category, timeout=None, button_text=None):
+        """
+        Re-arms a notification that is no longer displayed with new contents, so the widget can be reused
+        instead of building a new one.
+
+        :param message: str the message to show.
+        :param category: str the type of notification (see __init__).
+        :param timeout: int (default: None)
+        :param button_text: (default: None)
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        # Validate before anything is changed.
+        self.category = category
+        self.message = message
+        self.timeout = timeout
+        self.button_text = button_text
+        self.repeatCount = 1
+        self.dismissReason = None
+        self.queuedAt = None
+        self.offsetX = 0
+        self.offsetY = 0
+        self.key = None
+        self.record = None
+        self.setProgress(None)
+
+        self.__apply_category()
+        self.__set_button_text(button_text)
+        # The label limits its height to that of the previous message (see MessageLabel.resizeEvent()), which
+        # would clip a longer message when the notification is measured again.
+        self.message_display.setMaximumHeight(QWIDGETSIZE_MAX)
+
+        # Stop any leftover animations and make sure the widget is drawn fully opaque.
+        if self._animator is not None:
+            self._animator.stop(self, u'opacity')
+        self.__remove_opacity_effect()
+
+        self.setVisible(False)
+        self.isBeingRemoved = False
+
+    def __apply_category(self):
+        """ Restyles the notification if its category changed. """
+        if self.objectName() == self.category:
+            return
+        self.setObjectName(self.category)
+        if self._styleEngine is not None:
+            self._styleEngine.apply(self)
+        else:
+            # The category is used as object name in the style sheets, so the widget needs to be re-polished.
+            self.style().unpolish(self)
+            self.style().polish(self)
+        self.update()
+
+    def __display_text(self):
+        """ The message, followed by a repeat counter if the notification has been displayed more than once. """
+        if self.repeatCount > 1:
+            return u'{} \u00d7{}'.format(self.message, self.repeatCount)
+        return self.message
+
+    def __show_text(self):
+        """ Shows the message in the label, which is measured again for the new text. """
+        # The label limits its height to that of the previous text (see MessageLabel.resizeEvent()), which would
+        # clip a longer text.
+        self.message_display.setMaximumHeight(QWIDGETSIZE_MAX)
+        self.message_display.setText(self.__display_text())
+
+    def setRepeatCount(self, count):
+        """
+        Sets the number of times this notification has been displayed, which is shown next to the message.
+
+        :param count: int the number of repeats.
+        """
+        self.repeatCount = count
+        # isVisible() would also be False while the window of the area is not shown (yet).
+        if not self.isHidden():
+            self.__show_text()
+
+    def setMessage(self, message):
+        """
+        Replaces the message of the notification, also while it is shown.
+
+        :param message: str the new message.
+        """
+        self.message = message
+        if not self.isHidden():
+            self.__show_text()
+
+    def setCategory(self, category):
+        """
+        Changes the category of the notification, also while it is shown.
+
+        :param category: str the type of notification (see __init__).
 
-    def __init_graphic_effects(self):
-        """ Initializes graphic effects. """
-        # Opacity effect for fade in/out.
-        # self.opacityEffect = QtWidgets.QGraphicsOpacityEffect(self)
-        self.opacityEffect = QtGui.QGraphicsOpacityEffect(self)
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        self.category = category
+        self.__apply_category()
 
-        # Fade in animation.
-        self.fadeInAnimation = QtCore.QPropertyAnimation(self.opacityEffect, safe_encode("opacity"))
-        self.fadeInAnimation.setStartValue(0.0)
-        self.fadeInAnimation.setEndValue(1.0)
+    def setProgress(self, progress):
+        """
+        Shows the progress of a task in a thin bar along the bottom edge of the notification. The bar is created
+        the first time progress is set, and is only repainted when the change of the value is visible.
 
-        # Fade out animation
-        self.fadeOutAnimation = QtCore.QPropertyAnimation(self.opacityEffect, safe_encode("opacity"))
-        self.fadeOutAnimation.setStartValue(1.0)
-        self.fadeOutAnimation.setEndValue(0.0)
+        :param progress: float between 0 and 1, or None to hide the bar.
+        """
+        self.progress = progress
+        if progress is None:
+            if self.progress_bar is not None:
+                self.progress_bar.hide()
+            return
+
+        if self.progress_bar is None:
+            self.progress_bar = QtWidgets.QProgressBar(self)
+            self.progress_bar.setObjectName("progress")
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setTextVisible(False)
+            self.progress_bar.setFixedHeight(self.progress_bar_height)
+            self.__place_progress_bar()
+        value = int(round(max(0.0, min(1.0, progress)) * 1000))
+        # QProgressBar only repaints if the new value changes the drawn bar.
+        if value != self.progress_bar.value():
+            self.progress_bar.setValue(value)
+        if self.progress_bar.isHidden():
+            self.progress_bar.show()
+
+    def __place_progress_bar(self):
+        self.progress_bar.setGeometry(0, self.height() - self.progress_bar_height, self.width(),
+                                      self.progress_bar_height)
 
     def display(self):
         """ Displays the notification. """
-        self.message_display.setText(self.message)
+        self.__show_text()
         self.show()
         self.raise_()
 
@@ -147,28 +334,30 @@ class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
         super(QNotification, self).close()
         self.deleteLater()
 
-    def fadeIn(self, duration):
+    def fadeIn(self, duration, driver=None):
         """
         Fades in the notification.
 
         :param duration: int the desired duration of the animation.
+        :param driver: AnimationDriver (default: None) the driver that runs the animation.
+                       If None, the driver shared by the whole application is used.
 
         :raises: TypeError if duration is not an integer.
         """
         if type(duration) != int:
             raise TypeError("duration should be an integer")
-        self.setGraphicsEffect(self.opacityEffect)
-        self.fadeInAnimation.setDuration(duration)
+        self.__animate_opacity(0.0, 1.0, duration, driver, self.__fade_in_finished)
         self.display()
-        self.fadeInAnimation.start()
 
-    def fadeOut(self, final_callback, duration):
+    def fadeOut(self, final_callback, duration, driver=None):
         """
         Fades out the notification.
 
         :param final_callback: callable the function to call after the animation has finished
                                 (for instance to clean up the notifications).
         :param duration: int the desired duration of the animation.
+        :param driver: AnimationDriver (default: None) the driver that runs the animation.
+                       If None, the driver shared by the whole application is used.
 
         :raises: TypeError if the wrong data-type is specified for any of the parameters.
         """
@@ -177,25 +366,57 @@ class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
         if type(duration) != int:
             raise TypeError("duration should be an integer")
 
-        self.setGraphicsEffect(self.opacityEffect)
-        self.fadeOutAnimation.setDuration(duration)
-        self.fadeOutAnimation.finished.connect(lambda: final_callback(self))
         self.isBeingRemoved = True
-        self.fadeOutAnimation.start()
+        self.__animate_opacity(1.0, 0.0, duration, driver, final_callback)
+
+    def __animate_opacity(self, start, end, duration, driver, finished):
+        """ Creates the opacity effect if necessary and animates it with the driver. """
+        if self.opacityEffect is None:
+            self.opacityEffect = QtWidgets.QGraphicsOpacityEffect(self)
+            self.setGraphicsEffect(self.opacityEffect)
+        self._animator = driver if driver is not None else AnimationDriver.instance()
+        self._animator.animate(self, u'opacity', self.opacityEffect.setOpacity, start, end, duration, finished)
+
+    def __fade_in_finished(self, _):
+        """ Removes the opacity effect once the notification is fully visible. """
+        self.__remove_opacity_effect()
+
+    def __remove_opacity_effect(self):
+        """ Removes the opacity effect (which deletes it), so the widget is no longer rendered offscreen. """
+        if self.opacityEffect is not None:
+            self.setGraphicsEffect(None)
+            self.opacityEffect = None
+
+    def resizeEvent(self, event):
+        """ Internal Qt function (do not call directly). Keeps the progress bar along the bottom edge. """
+        super(QNotification, self).resizeEvent(event)
+        if self.progress_bar is not None:
+            self.__place_progress_bar()
+
+    def enterEvent(self, event):
+        """ Internal Qt function (do not call directly). """
+        super(QNotification, self).enterEvent(event)
+        self.mouseEntered.emit()
+
+    def leaveEvent(self, event):
+        """ Internal Qt function (do not call directly). """
+        super(QNotification, self).leaveEvent(event)
+        self.mouseLeft.emit()
 
     def paintEvent(self, pe):
         """
-        Makes class QNotification available in style sheets.
-        Redefinition of paintEvent, do not call directly (internal Qt function).
+        Makes class QNotification available in style sheets, or draws the pre-rendered background of the
+        StyleEngine if one is used. Redefinition of paintEvent, do not call directly (internal Qt function).
         """
-        # o = QtWidgets.QStyleOption()
-        option = QtGui.QStyleOption()
-        # o.initFrom(self)
-        # p = QtGui.QPainter(self)
+        if self._styleEngine is not None:
+            painter = QtGui.QPainter(self)
+            painter.drawPixmap(0, 0, self._styleEngine.background(self.category, self.width(), self.height()))
+            return
+
+        option = QtWidgets.QStyleOption()
         option.initFrom(self)
         painter = QtGui.QPainter(self)
-        # self.style().drawPrimitive(QtWidgets.QStyle.PE_Widget, o, p, self)
-        self.style().drawPrimitive(QtGui.QStyle.PE_Widget, option, painter, self)
+        self.style().drawPrimitive(QtWidgets.QStyle.PE_Widget, option, painter, self)
 
     # Property attributes:
     @property
@@ -222,9 +443,9 @@ class QNotification(QtGui.QWidget):  # QtWidgets.QWidget
 
         :raises: ValueError if the category is other than one of the expected values.
         """
-        allowed_values = ['primary', 'success', 'info', 'warning', 'danger', 'space-grey']
-        if value not in allowed_values:
-            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(value, str(allowed_values)))
+        if value not in self.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                value, str(self.allowed_categories)))
 
         # Set that category as the value.
         self._category = value
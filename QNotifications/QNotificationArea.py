@@ -6,25 +6,33 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from PyQt4 import QtCore, QtGui
+import threading
+from collections import deque, OrderedDict
 
 from QNotifications.QNotification import QNotification
 from QNotifications.abstractions import *
-
-# Handle importing the correct queue modules for the correct Python version.
-if sys.version_info >= (3, 0, 0):
-    # Python 3.
-    from queue import Queue, Empty
-else:
-    # Python 2.
-    from Queue import Queue, Empty
+from QNotifications.animation import AnimationDriver
+from QNotifications.cache import LRUCache
+from QNotifications.flowcontrol import RateLimiter, overflow_policies
+from QNotifications.geometry import StackLayout
+from QNotifications.history import NotificationHistory
+from QNotifications.metrics import NotificationMetrics
+from QNotifications.painting import NotificationPainter, PaintedNotification
+from QNotifications.pool import NotificationPool
+from QNotifications.qt import QtCore, QtGui, QtWidgets, Signal, Slot
+from QNotifications.records import NotificationRecord, QueuedNotification, message_text
+from QNotifications.scheduler import DeadlineHeap, Empty, FifoScheduler, PriorityScheduler
+from QNotifications.styling import StyleEngine
+from QNotifications.timers import TimeoutScheduler
 
 
 __author__ = u"Daniel Schreij"
 __license__ = u"GPLv3"
 
+# Default of the arguments of updateNotification() for which None is a valid value.
+_unchanged = object()
 
-class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
+class QNotificationArea(QtWidgets.QWidget):
     """
     Notification area to show notifications in. Will be projected on top of
     another QWidget which should be passed as an argument to this class.
@@ -83,43 +91,279 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
         }
     """
 
+    # Priorities with which notifications of each category are queued if no priority is passed to display().
+    default_category_priorities = {
+        u'danger': 40,
+        u'warning': 30,
+        u'primary': 20,
+        u'success': 10,
+        u'info': 10,
+        u'space-grey': 0,
+    }
+
+    # Emitted by post() (from any thread) when posted notifications are waiting to be flushed.
+    _postRequested = Signal()
+    # Emitted with a notification when it is shown, and when it has been removed or dropped from the queue (see
+    # its dismissReason).
+    notificationShown = Signal(object)
+    notificationRemoved = Signal(object)
+    # Emitted with a displayed or queued notification whose message, category, progress, timeout or repeat count
+    # was changed in place (by updateNotification() or because a duplicate was coalesced into it).
+    notificationUpdated = Signal(object)
+    # Emitted with the message, category and reason ('overflow', 'rate_limited' or 'expired') of a dropped
+    # notification.
+    notificationDropped = Signal('QString', 'QString', 'QString')
+
     def __init__(self, target_widget, *args, **kwargs):
         """ Constructor
 
         :param target_widget: QtWidgets.QWidget The widget to project the notifications on
         :param useGlobalCSS: bool (default: False) Flag which indicates whether global style sheets should be used
-                             (which have been set at app-level). If False, the default style sheets stored at
-                             self.default_notification_styles will be loaded.
+                             (which have been set at app-level). If False, notifications are styled by a
+                             StyleEngine with the background colors, text color, font size and corner radius of
+                             self.default_notification_styles (other properties are ignored), without style sheets
+                             being applied to the widgets.
+        :param styleEngine: StyleEngine (default: None) The engine that styles the notifications if useGlobalCSS
+                            is False. If None, an engine shared by all notification areas with the same
+                            default_notification_styles is used.
         :param useQueue: bool (default: True) Indicates whether a message queue should be implemented.
                          This will only show *maxMessages* at the same time and will put all other messages in a queue.
                          Once a message disappears, the next one in the queue will be shown
                          (up to maxMessages at the same time)
         :param: maxMessages: int (default: 2) The number of messages to display at the same time.
+        :param scheduler: str or object (default: 'priority') The order in which queued notifications are shown.
+                          'priority' shows notifications with the highest priority first, 'fifo' shows them in the
+                          order in which they were queued. An object with the interface of
+                          QNotifications.scheduler.PriorityScheduler can be passed as well.
+        :param maxQueued: int (default: None) The maximum number of queued notifications. If None, the queue is
+                          unbounded.
+        :param overflowPolicy: str (default: 'drop-newest') What happens to a notification that arrives while
+                               maxQueued notifications are queued: 'drop-newest' drops the new notification,
+                               'drop-oldest' drops the notification that has been queued the longest,
+                               'drop-lowest-category' drops the queued or new notification with the lowest priority,
+                               and 'collapse' drops the new notification, but shows a summary with the number of
+                               dropped notifications ("+N more notifications") once there is room.
+        :param maxAge: int (default: None) The maximum time in milliseconds that a notification may wait in the
+                       queue. A notification that has not been shown by then is dropped without being shown. If
+                       None, notifications wait until they are shown. Can be set per notification with display().
+        :param expiredSummary: bool (default: False) If True, notifications that expired in the queue are
+                               replaced by a summary with their number ("N notifications expired").
+        :param rateLimits: dict (default: None) Rate limits per category, as a number of notifications per second
+                           or a (rate, burst) tuple, e.g. {'info': 5, 'warning': (1, 10)}. Notifications that
+                           exceed the limit of their category are dropped.
+        :param categoryPriorities: dict (default: None) Priorities per category that override the ones in
+                                   default_category_priorities.
+        :param preempt: bool (default: False) If True, a notification that is queued while maxMessages are shown
+                        dismisses the displayed notification with the lowest priority, if that priority is lower.
+        :param poolSize: int (default: 8) The maximum number of removed notification widgets that are kept to be
+                         reused by new notifications. 0 disables pooling.
+        :param poolIdleTimeout: int (default: 30000) Time in milliseconds after which unused pooled widgets
+                                are destroyed.
+        :param postBatchSize: int (default: 100) The maximum number of notifications passed to post() that are
+                              displayed per pass of the event loop.
+        :param postLatency: int (default: 10) The time in milliseconds that notifications passed to post() are
+                            collected before they are displayed as one batch.
+        :param renderMode: str (default: 'widgets') How notifications are rendered. With 'widgets', every
+                           notification is a QNotification widget that can be styled with style sheets. With
+                           'painter', the area draws all notifications itself, which uses much less memory and
+                           layout time when many notifications are shown, but ignores style sheets.
+        :param animationDriver: AnimationDriver (default: None) The driver that runs the entry and exit effects.
+                                If None, the area creates its own driver, which runs all its fades with a single
+                                timer.
+        :param heightCacheSize: int (default: 256) The number of message heights (by text, font and width) that
+                                are cached for all notifications of the area, so texts do not have to be laid
+                                out again while the area is resized. 0 disables the cache.
+        :param heightCache: LRUCache (default: None) A cache of message heights to use instead of creating one,
+                            e.g. to share it between areas. Overrides heightCacheSize.
+        :param timeoutScheduler: TimeoutScheduler (default: None) The scheduler that handles the timeouts of the
+                                 notifications. If None, the area creates its own.
+        :param resizeInterval: int (default: 16) The minimum time in milliseconds between two updates of the area's
+                               geometry while the target widget is being resized.
+        :param pauseOnHover: bool (default: True) If True, the timeout of a notification is paused while the mouse
+                             hovers over it.
+        :param metrics: bool or NotificationMetrics (default: False) If True (or a NotificationMetrics object), the
+                        area keeps counters, gauges and histograms of its activity in self.metrics.
+        :param metricsExportInterval: int (default: 10000) The interval in milliseconds with which the metrics
+                                      are exported, if an export target has been set on them.
+        :param history: bool or NotificationHistory (default: None) The history to which notifications are added
+                        when they are removed or dropped, with the reason. If True, an in-memory history of the
+                        last 1000 notifications is kept. Pass a NotificationHistory with a directory to keep a
+                        durable history on disk. The history is flushed when the area is destroyed and closed when
+                        the application quits.
+        :param coalesceWindow: int (default: None) If set, a notification with the same message, category and
+                               button text as one that is displayed or queued, and that arrives within this many
+                               milliseconds of the previous copy, is not shown separately. Instead, the existing
+                               notification shows a repeat counter and its timeout is restarted.
+        :param coalesceIndexSize: int (default: 256) The maximum number of notifications that are remembered
+                                  for duplicate detection.
+        :param updateInterval: int (default: 16) The interval in milliseconds with which updates of keyed
+                               notifications (see updateNotification()) are applied, so that a notification is
+                               repainted at most once per interval however often it is updated.
 
         :raises: TypeError if targetWidget is not an object that inherits QWidget.
         """
-        if not isinstance(target_widget, QtGui.QWidget):  # QtWidgets.QWidget
+        if not isinstance(target_widget, QtWidgets.QWidget):
             raise TypeError('targetWidget is not a QWidget (or child of it')
 
-        # Get some variables from kwargs.
-        useGlobalCSS = kwargs.get(u'useGlobalCSS', False)
-        self.useQueue = kwargs.get(u'useQueue', True)
-        self.maxMessages = kwargs.get(u'maxMessages', 2)
+        # Get some variables from kwargs (these should not be passed on to QWidget).
+        useGlobalCSS = kwargs.pop(u'useGlobalCSS', False)
+        styleEngine = kwargs.pop(u'styleEngine', None)
+        self.useQueue = kwargs.pop(u'useQueue', True)
+        self.maxMessages = kwargs.pop(u'maxMessages', 2)
+        scheduler = kwargs.pop(u'scheduler', u'priority')
+        self.categoryPriorities = dict(self.default_category_priorities)
+        self.categoryPriorities.update(kwargs.pop(u'categoryPriorities', None) or {})
+        self.preempt = kwargs.pop(u'preempt', False)
+        self.maxQueued = kwargs.pop(u'maxQueued', None)
+        self.maxAge = kwargs.pop(u'maxAge', None)
+        self.expiredSummary = kwargs.pop(u'expiredSummary', False)
+        self.overflowPolicy = kwargs.pop(u'overflowPolicy', u'drop-newest')
+        if self.overflowPolicy not in overflow_policies:
+            raise ValueError(u'Invalid overflow policy')
+        rateLimits = kwargs.pop(u'rateLimits', None)
+        poolSize = kwargs.pop(u'poolSize', 8)
+        poolIdleTimeout = kwargs.pop(u'poolIdleTimeout', 30000)
+        self.postBatchSize = kwargs.pop(u'postBatchSize', 100)
+        self.postLatency = kwargs.pop(u'postLatency', 10)
+        self.pauseOnHover = kwargs.pop(u'pauseOnHover', True)
+        resizeInterval = kwargs.pop(u'resizeInterval', 16)
+        heightCacheSize = kwargs.pop(u'heightCacheSize', 256)
+        heightCache = kwargs.pop(u'heightCache', None)
+        timeoutScheduler = kwargs.pop(u'timeoutScheduler', None)
+        animationDriver = kwargs.pop(u'animationDriver', None)
+        self.renderMode = kwargs.pop(u'renderMode', u'widgets')
+        if self.renderMode not in (u'widgets', u'painter'):
+            raise ValueError(u'Invalid render mode')
+        self.coalesceWindow = kwargs.pop(u'coalesceWindow', None)
+        self.coalesceIndexSize = kwargs.pop(u'coalesceIndexSize', 256)
+        updateInterval = kwargs.pop(u'updateInterval', 16)
+        metrics = kwargs.pop(u'metrics', False)
+        history = kwargs.pop(u'history', None)
+        metricsExportInterval = kwargs.pop(u'metricsExportInterval', 10000)
 
         super(QNotificationArea, self).__init__(*args, **kwargs)
 
-        if not useGlobalCSS:
-            self.setStyleSheet(self.default_notification_styles)
+        # Notifications are styled with shared palettes, fonts and backgrounds unless global style sheets are used.
+        if useGlobalCSS:
+            self.styleEngine = None
+        elif styleEngine is not None:
+            self.styleEngine = styleEngine
+        elif self.default_notification_styles == QNotificationArea.default_notification_styles:
+            self.styleEngine = StyleEngine.instance()
+        else:
+            # Subclasses that override the default styles get an engine with their colors.
+            self.styleEngine = StyleEngine.for_style_sheet(self.default_notification_styles)
 
         if self.useQueue:
-            self.queue = Queue()
+            if scheduler == u'priority':
+                self.queue = PriorityScheduler()
+            elif scheduler == u'fifo':
+                self.queue = FifoScheduler()
+            elif hasattr(scheduler, u'push') and hasattr(scheduler, u'pop'):
+                self.queue = scheduler
+            else:
+                raise ValueError(u'Invalid scheduler')
+
+        # Protection against floods: per-category rate limits, and counts of the notifications that were dropped.
+        self.rateLimiter = RateLimiter(rateLimits) if rateLimits else None
+        self._drops = {u'overflow': 0, u'rate_limited': 0, u'expired': 0}
+        self._drops_by_category = {}
+        # The "+N more notifications" summary of the 'collapse' overflow policy, and the N it shows.
+        self._summary = None
+        self._collapsed = 0
+        # The deadlines of the queued notifications that have a maximum age (with the maximum age in seconds as
+        # payload), and the "N notifications expired" summary and its N.
+        self._expiry = DeadlineHeap()
+        self._expired_summary = None
+        self._expired = 0
+        # The summaries that wait until there is room to show them, in the order in which they were created.
+        self._queued_summaries = []
+
+        # Heights of wrapped messages, shared by all notifications of this area.
+        if heightCache is None and heightCacheSize:
+            heightCache = LRUCache(heightCacheSize)
+        self.heightCache = heightCache
+
+        # Single timer that runs the fade animations of all notifications in this area.
+        if animationDriver is None:
+            animationDriver = AnimationDriver(parent=self)
+        self.animationDriver = animationDriver
+
+        # Single timer that handles the timeouts of all notifications in this area.
+        if timeoutScheduler is None:
+            timeoutScheduler = TimeoutScheduler(self)
+        self.timeouts = timeoutScheduler
+
+        # Pool of notification widgets that can be re-armed instead of being rebuilt.
+        self.pool = NotificationPool(self.__create_notification, poolSize, poolIdleTimeout, self)
+
+        # Buffer of records passed to post(), which are displayed in batches on the GUI thread.
+        self._posted = deque()
+        self._post_lock = threading.Lock()
+        self._post_scheduled = False
+        self._post_timer = QtCore.QTimer(self)
+        self._post_timer.setSingleShot(True)
+        self._post_timer.timeout.connect(self.__flush_posted)
+        self._postRequested.connect(self.__schedule_flush, QtCore.Qt.QueuedConnection)
+
+        # Displayed and queued notifications by (message, category, button_text), least recently seen first.
+        self._coalesce_index = OrderedDict()
+
+        # Displayed and queued notifications by the key they were displayed with, and the changes of keyed
+        # notifications that have not been applied yet, which are applied together by a timer.
+        self._keyed = {}
+        self._updates = OrderedDict()
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(updateInterval)
+        self._update_timer.timeout.connect(self.__apply_updates)
+
+        # Removed and dropped notifications are recorded in the history, if one is used.
+        if history is True:
+            history = NotificationHistory()
+        elif history is False:
+            history = None
+        self.history = history
+        if history is not None:
+            # Write the records that are still pending when the area goes away, and stop the writer thread of the
+            # history when the application quits (closing it twice is harmless if it is shared by several areas).
+            self.destroyed.connect(lambda *args: history.flush())
+            application = QtCore.QCoreApplication.instance()
+            if application is not None:
+                application.aboutToQuit.connect(history.close)
+
+        # Metrics are only collected if they are enabled; otherwise self.metrics is None.
+        if metrics is True:
+            metrics = NotificationMetrics()
+        self.metrics = metrics or None
+        if self.metrics is not None:
+            self.metrics.registerGauge(u'queue_depth', lambda: len(self.queue) if self.useQueue else 0)
+            self.metrics.registerGauge(u'visible', lambda: len(self._visible))
+            if self.metrics.exportTo is not None:
+                self._metrics_timer = QtCore.QTimer(self)
+                self._metrics_timer.timeout.connect(self.metrics.export)
+                self._metrics_timer.start(metricsExportInterval)
 
         self.setParent(target_widget)
         self.targetWidget = target_widget
         self.setContentsMargins(0, 0, 0, 0)
 
-        notification_area_layout = QtGui.QVBoxLayout()  # QtWidgets.QVBoxLayout()
-        self.setLayout(notification_area_layout)
+        # The notifications that are currently shown, from top to bottom.
+        self._visible = []
+        # While displayMany() runs, showing the area and updating its size are deferred to the end of the batch.
+        self._batch_depth = 0
+        self._batch_layout = False
+
+        # The notifications are positioned by the area itself, which only measures the notifications that are
+        # added or changed, instead of laying out all of them for every change.
+        if self.renderMode == u'widgets':
+            self._stack = StackLayout(self.__measure)
+        else:
+            # In 'painter' mode, notifications are drawn by the area itself, from the geometry in the stack.
+            self._painter = NotificationPainter(self.styleEngine)
+            self._stack = StackLayout(self._painter.measure, self._painter.margin, self._painter.spacing)
+            self._hovered = None
+            self.setMouseTracking(True)
 
         # Init effects to None
         self.entryEffect = None
@@ -127,51 +371,461 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
         self.exitEffect = None
         self.exitEffectDuration = None
 
-        # Notifications area geometry animation.
-        self.slideAnimation = QtCore.QPropertyAnimation(self, safe_encode("geometry"))
-        self._slide_right_limit = None
-
-        # Store original target classes resizeEvent to be called in our own function.
-        self.target_resize_event = target_widget.resizeEvent
-        # Overwrite resizeEvent function of targetWidget to capture it our-self
-        # (parent's resizeEvent will be called in our function too).
-        self.targetWidget.resizeEvent = self.resizeEvent
+        # Follow the size of the target widget through an event filter. Geometry updates are coalesced by a
+        # timer, so the notifications are laid out at most once per resizeInterval while the target is resized.
+        self._geometry_timer = QtCore.QTimer(self)
+        self._geometry_timer.setSingleShot(True)
+        self._geometry_timer.setInterval(resizeInterval)
+        self._geometry_timer.timeout.connect(self.__update_geometry)
+        self.targetWidget.installEventFilter(self)
         self.hide()
 
     # Private functions:
+    def __create_notification(self, message, category, timeout=None, button_text=None):
+        """ Builds a new notification widget for this area (used by the pool when it has no idle widgets). """
+        if self.renderMode == u'painter':
+            return PaintedNotification(self, message, category, timeout, button_text)
+
+        notification = QNotification(message, category, timeout, button_text, self)
+        if self.styleEngine is not None:
+            notification.setStyleEngine(self.styleEngine)
+        notification.message_display.heightCache = self.heightCache
+        notification.closeClicked.connect(self.__close_clicked)
+        notification.mouseEntered.connect(lambda: self.__hover_changed(notification, True))
+        notification.mouseLeft.connect(lambda: self.__hover_changed(notification, False))
+        # Changes of the size of the notification are picked up from its layout requests (see eventFilter()).
+        notification.installEventFilter(self)
+        return notification
+
+    def __measure(self, notification, width):
+        """ Returns the height of a notification widget at the given width. """
+        height = notification.heightForWidth(width) if notification.hasHeightForWidth() else -1
+        return max(height, notification.minimumSizeHint().height())
+
+    def __move_rows(self, rows):
+        """ Applies the geometries returned by the StackLayout to the notification widgets, displaced by their
+        offsets (or repaints the area in 'painter' mode). """
+        if self.renderMode == u'painter':
+            if rows:
+                self.update()
+            return
+        for notification, (x, y, width, height) in rows:
+            notification.setGeometry(x + int(notification.offsetX), y + int(notification.offsetY), width, height)
+
+    def __fit(self):
+        """ Updates the height of the area to that of the notifications it shows. """
+        if self.renderMode == u'widgets':
+            self.resize(self.width(), self.sizeHint().height())
+        else:
+            self.adjustSize()
+
+    def __row_extent(self, notification):
+        """ Returns the vertical space a shown notification takes up, including the spacing below it. """
+        return self._stack.geometry(notification)[3] + self._stack.spacing
+
+    def __animate_offset(self, notification, axis, start, end, duration, finished=None):
+        """ Moves a shown notification from an offset to another (along axis 'offsetX' or 'offsetY'), by moving
+        the rendered widget or row, without laying it out again. """
+        self.animationDriver.animate(notification, axis, lambda value: self.__set_offset(notification, axis, value),
+                                     start, end, duration, finished)
+
+    def __set_offset(self, notification, axis, value):
+        setattr(notification, axis, value)
+        if self.renderMode == u'widgets':
+            x, y, _, _ = self._stack.geometry(notification)
+            notification.move(x + int(notification.offsetX), y + int(notification.offsetY))
+        else:
+            self.update()
+        # The area keeps the height it had before a notification was removed until the notifications below it
+        # have moved into place.
+        if axis == u'offsetY' and not value and notification is self._visible[-1]:
+            self.__fit()
+
+    def __close_clicked(self):
+        """ Removes the notification whose close button was clicked. """
+        self.remove(self.sender(), u'user')
+
+    def __hover_changed(self, notification, hovered):
+        """ Pauses or resumes the timeout of a notification when the mouse enters or leaves it. """
+        if not self.pauseOnHover:
+            return
+        if hovered:
+            self.timeouts.pause(notification)
+        else:
+            self.timeouts.resume(notification)
+
     def __delete_notification(self, notification=None):
-        """ Closes and destroys the supplied notification.
+        """ Removes the supplied notification and hands it back to the pool for reuse.
 
         :param notification: (default: None)
         """
-        notification.close()
-        self.layout().removeWidget(notification)
-
-        self.adjustSize()
+        # With slide and collapse effects, the notifications below the removed one move into its place.
+        index = self._visible.index(notification)
+        shift = self.__row_extent(notification) if self.exitEffect in (u'slideOut', u'collapse') else 0
+        self._visible.remove(notification)
+        self.__move_rows(self._stack.remove(notification))
+        if self.renderMode == u'painter':
+            self.update()
+        if shift:
+            for below in self._visible[index:]:
+                self.__animate_offset(below, u'offsetY', below.offsetY + shift, 0, self.exitEffectDuration)
+        self.animationDriver.stop(notification)
+        self.timeouts.cancel(notification)
+        self.__forget_duplicate(notification)
+        self.__forget_key(notification)
+        if notification is self._summary:
+            self._summary = None
+            self._collapsed = 0
+        if notification is self._expired_summary:
+            self._expired_summary = None
+            self._expired = 0
+        # The record the notification was built for no longer refers to it once it is reused.
+        if notification.record is not None:
+            notification.record.notification = None
+            notification.record.isBeingRemoved = True
+            notification.record.dismissReason = notification.dismissReason
+        if self.metrics is not None:
+            reason = notification.dismissReason
+            self.metrics.increment(u'removed_' + reason if reason in (u'timeout', u'user') else u'removed_other')
+        if self.history is not None:
+            self.history.record(notification.message, notification.category, notification.dismissReason)
+        self.notificationRemoved.emit(notification)
+        self.pool.release(notification)
+
+        if self._batch_depth:
+            self._batch_layout = True
+        else:
+            self.__fit()
         # Hide notification area if it doesn't contain any items
-        if self.layout().count() == 0:
+        if not self._visible:
             self.hide()
 
         if self.useQueue:
+            self.__expire_queued()
+            # The summary of expired notifications may have taken the place that was freed.
+            if len(self._visible) >= self.maxMessages:
+                return
             try:
-                notification = self.queue.get(False)
-                self._show_notification(notification)
+                record = self.queue.pop()
             except Empty:
-                pass
+                # Summaries are shown once no notifications are queued anymore.
+                if not self._queued_summaries:
+                    return
+                record = self._queued_summaries.pop(0)
+            else:
+                if self.metrics is not None:
+                    self.metrics.increment(u'dequeued')
+                    self.metrics.queueTime.observe(monotonic() - record.queuedAt)
+            self._show_notification(self.__materialize(record))
+
+    def __materialize(self, record):
+        """ Builds the notification for a queued record when it is about to be shown.
+
+        :param record: QueuedNotification
+        :return: QNotification or PaintedNotification
+        """
+        self._expiry.cancel(record)
+        notification = self.pool.acquire(message_text(record.message), record.category, record.timeout,
+                                         record.button_text)
+        notification.priority = record.priority
+        notification.queuedAt = record.queuedAt
+        if record.repeatCount > 1:
+            notification.setRepeatCount(record.repeatCount)
+        if record.progress is not None:
+            notification.setProgress(record.progress)
+        # The notification takes the place of the record in the indices of the area.
+        if record.coalesceKey is not None:
+            entry = self._coalesce_index.get(record.coalesceKey)
+            if entry is not None and entry[0] is record:
+                self._coalesce_index[record.coalesceKey] = (notification, entry[1])
+            notification.coalesceKey = record.coalesceKey
+        if record.key is not None and self._keyed.get(record.key) is record:
+            notification.key = record.key
+            self._keyed[record.key] = notification
+        if record is self._summary:
+            self._summary = notification
+        elif record is self._expired_summary:
+            self._expired_summary = notification
+        notification.record = record
+        record.notification = notification
+        return notification
+
+    def __preempt(self, priority):
+        """ Dismisses the shown notification with the lowest priority, if it is lower than *priority*.
+
+        :param priority: int the priority of the notification that is waiting to be shown.
+        """
+        candidates = [n for n in self._visible if not n.isBeingRemoved]
+        if not candidates:
+            return
+        lowest = min(candidates, key=lambda n: n.priority)
+        if lowest.priority < priority:
+            self.remove(lowest, u'preempted')
+
+    def __enqueue(self, record, max_age=None):
+        """ Adds a notification to the queue.
+
+        :param record: QueuedNotification
+        :param max_age: int (default: None) The time in milliseconds after which the notification expires if it
+                        has not been shown, or None.
+        """
+        if self.metrics is not None:
+            self.metrics.increment(u'queued')
+            record.queuedAt = monotonic()
+        self.queue.push(record, record.priority)
+        if max_age is not None:
+            self._expiry.schedule(record, monotonic() + max_age / 1000.0, max_age / 1000.0)
+
+    def __refresh_expiry(self, record):
+        """ Restarts the maximum age of a queued notification (e.g. because it was repeated or updated). """
+        max_age = self._expiry.cancel(record)
+        if max_age is not None:
+            self._expiry.schedule(record, monotonic() + max_age, max_age)
+
+    def __expire_queued(self):
+        """ Drops the queued notifications whose maximum age has passed, earliest deadline first. """
+        # Only the expired deadlines are visited, so this is cheap while nothing expires.
+        expired = self._expiry.pop_expired(monotonic())
+        for record, _ in expired:
+            self.__count_drop(record.message, record.category, u'expired')
+            self.__unqueue(record, u'expired')
+        if expired and self.expiredSummary:
+            self._expired += len(expired)
+            text = u'{} notifications expired'.format(self._expired)
+            if self._expired_summary is not None:
+                self._expired_summary.setMessage(text)
+            else:
+                self._expired_summary = self.__show_summary(text, expired[-1][0].timeout)
+
+    def __make_room(self, message, category, timeout, priority):
+        """ Applies the overflow policy when a notification arrives while the queue is full.
+
+        :return: bool True if room was made for the new notification, False if it has been dropped.
+        """
+        # With maxQueued=0 there is nothing to drop but the new notification.
+        if self.overflowPolicy == u'drop-oldest' and self.queue.oldest() is not None:
+            self.__drop_queued(self.queue.oldest())
+            return True
+        if self.overflowPolicy == u'drop-lowest-category':
+            last = self.queue.last()
+            if last is not None and last[1] < priority:
+                self.__drop_queued(last[0])
+                return True
+
+        self.__count_drop(message, category, u'overflow')
+        if self.overflowPolicy == u'collapse':
+            self.__collapse(timeout)
+        return False
+
+    def __drop_queued(self, record):
+        """ Drops a notification from the queue to make room for a new one. """
+        self.__count_drop(record.message, record.category, u'overflow')
+        self.__unqueue(record, u'overflow')
+
+    def __unqueue(self, record, reason):
+        """ Removes a notification from the queue without showing it.
+
+        :param record: QueuedNotification
+        :param reason: str the dismissReason of the notification.
+        """
+        if record in self._queued_summaries:
+            self._queued_summaries.remove(record)
+        else:
+            self.queue.remove(record)
+        self._expiry.cancel(record)
+        self.__forget_duplicate(record)
+        self.__forget_key(record)
+        if record is self._summary:
+            self._summary = None
+            self._collapsed = 0
+        elif record is self._expired_summary:
+            self._expired_summary = None
+            self._expired = 0
+        record.isBeingRemoved = True
+        record.dismissReason = reason
+        self.notificationRemoved.emit(record)
+
+    def __collapse(self, timeout):
+        """ Updates (or creates) the summary of the notifications that were dropped by the 'collapse' policy. """
+        self._collapsed += 1
+        text = u'+{} more notifications'.format(self._collapsed)
+        if self._summary is not None:
+            self._summary.setMessage(text)
+        else:
+            self._summary = self.__show_summary(text, timeout)
+
+    def __show_summary(self, text, timeout):
+        """ Shows a summary of notifications that were not shown, or, if maxMessages are shown, shows it after
+        the notifications that are queued.
+
+        :return: the summary (a QueuedNotification if it has to wait).
+        """
+        priority = min(self.categoryPriorities.values()) - 1
+        if len(self._visible) >= self.maxMessages:
+            # The summary waits outside the queue, so it does not count towards maxQueued and the overflow
+            # policies never drop it.
+            summary = QueuedNotification(text, u'info', timeout, None, priority)
+            self._queued_summaries.append(summary)
+        else:
+            summary = self.pool.acquire(text, u'info', timeout)
+            summary.priority = priority
+            self._show_notification(summary)
+        return summary
+
+    def __count_drop(self, message, category, reason):
+        """ Counts a dropped notification and emits notificationDropped. """
+        self._drops[reason] += 1
+        self._drops_by_category[category] = self._drops_by_category.get(category, 0) + 1
+        if self.metrics is not None:
+            self.metrics.increment(u'dropped_' + reason)
+        # A callable message is only formatted if the text is recorded or received by a slot.
+        if callable(message):
+            if self.history is None and not self.__drops_connected():
+                return
+            message = message()
+        if self.history is not None:
+            self.history.record(message, category, reason)
+        self.notificationDropped.emit(message, category, reason)
+
+    def __drops_connected(self):
+        """ Returns whether any slots are connected to notificationDropped. """
+        try:
+            return self.receivers(self.notificationDropped) > 0
+        except TypeError:
+            # PySide expects the signature of the signal.
+            return self.receivers(QtCore.SIGNAL(u'notificationDropped(QString,QString,QString)')) > 0
+
+    def __find_duplicate(self, key):
+        """ Returns the displayed or queued notification that the notification with the given key repeats.
+
+        :param key: tuple (message, category, button_text)
+        :return: QNotification, QueuedNotification or None if there is no duplicate within coalesceWindow.
+        """
+        entry = self._coalesce_index.pop(key, None)
+        if entry is None:
+            return None
+
+        notification, last_seen = entry
+        now = monotonic()
+        if notification.isBeingRemoved or now - last_seen > self.coalesceWindow / 1000.0:
+            return None
+
+        # Re-insert to mark the entry as most recently seen.
+        self._coalesce_index[key] = (notification, now)
+        return notification
+
+    def __remember_duplicate(self, key, notification):
+        """ Adds a notification to the index used for duplicate detection, evicting the oldest entry if full. """
+        notification.coalesceKey = key
+        self._coalesce_index[key] = (notification, monotonic())
+        if len(self._coalesce_index) > self.coalesceIndexSize:
+            self._coalesce_index.popitem(last=False)
+
+    def __forget_duplicate(self, notification):
+        """ Removes a notification from the index used for duplicate detection. """
+        key = notification.coalesceKey
+        entry = self._coalesce_index.get(key)
+        if entry is not None and entry[0] is notification:
+            del self._coalesce_index[key]
+        notification.coalesceKey = None
+
+    def __forget_key(self, notification):
+        """ Removes a notification from the keyed notifications. """
+        if notification.key is not None and self._keyed.get(notification.key) is notification:
+            del self._keyed[notification.key]
+            self._updates.pop(notification.key, None)
+
+    def __apply_updates(self):
+        """ Applies the changes that were passed to updateNotification() since the last time. """
+        updates, self._updates = self._updates, OrderedDict()
+        for key, changes in updates.items():
+            notification = self._keyed.get(key)
+            if notification is None or notification.isBeingRemoved:
+                continue
+            if u'message' in changes:
+                # A callable message is only formatted once the notification is shown.
+                if isinstance(notification, QueuedNotification):
+                    notification.setMessage(changes[u'message'])
+                else:
+                    notification.setMessage(message_text(changes[u'message']))
+            if u'category' in changes:
+                notification.setCategory(changes[u'category'])
+            if u'progress' in changes:
+                notification.setProgress(changes[u'progress'])
+            if u'timeout' in changes:
+                notification.timeout = changes[u'timeout']
+                if notification in self._visible:
+                    self.timeouts.cancel(notification)
+                    self.__start_timeout(notification)
+            # A queued notification that is updated is no longer stale.
+            if isinstance(notification, QueuedNotification):
+                self.__refresh_expiry(notification)
+            if self.metrics is not None:
+                self.metrics.increment(u'updated')
+            self.notificationUpdated.emit(notification)
+
+    def __schedule_flush(self):
+        """ Starts the timer after which posted notifications are displayed (runs on the GUI thread). """
+        if not self._post_timer.isActive():
+            self._post_timer.start(self.postLatency)
+
+    def __flush_posted(self):
+        """ Displays up to postBatchSize posted notifications, and schedules another pass if more are waiting. """
+        batch = []
+        with self._post_lock:
+            while self._posted and len(batch) < self.postBatchSize:
+                batch.append(self._posted.popleft())
+            remaining = len(self._posted) > 0
+            if not remaining:
+                self._post_scheduled = False
+
+        self.displayMany(batch)
+
+        # Let the event loop process other events before the next batch is displayed.
+        if remaining:
+            self._post_timer.start(0)
 
     # Public functions:
+    def post(self, message, category, timeout=5000, button_text=None):
+        """ Displays a notification, and can safely be called from any thread.
+
+        The notification is stored in a buffer and displayed on the GUI thread together with other notifications
+        that have been posted in the meantime (see postBatchSize and postLatency). All notifications posted before
+        the buffer is flushed only cost a single wake-up of the GUI thread.
+
+        :param message: str The message to display.
+        :param category: str The type of notification (see display()).
+        :param timeout: int (optional) The duration for which the notification should be shown.
+        :param button_text: str (optional) The text to display on the closing button.
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if category not in QNotification.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(QNotification.allowed_categories)))
+
+        record = NotificationRecord(message, category, timeout, button_text)
+        with self._post_lock:
+            self._posted.append(record)
+            if self._post_scheduled:
+                return
+            self._post_scheduled = True
+        self._postRequested.emit()
+
     def setEntryEffect(self, effect, duration=250):
         """ Sets the effect with which the notifications are to appear.
 
-        :param effect: dict{'fadeIn', None} The effect which should be used (for now only 'fadeIn' is available)
-                       if None is passed for this argument, no effect will be used and the notifications will
+        :param effect: dict{'fadeIn', 'slideIn', None} The effect which should be used. 'fadeIn' fades the
+                       notification in, 'slideIn' slides it in from the right edge of the area (by moving the
+                       rendered notification, which is cheaper than fading when many notifications are shown).
+                       If None is passed for this argument, no effect will be used and the notifications will
                        just appear directly.
         :param duration: int (default: 250 ms) The duration of the effect in milliseconds.
 
         :raises: TypeError If the object provided for duration is not an integer.
         :raises: ValueError When duration is less than 0, or effect has an invalid value
         """
-        if effect not in [None, u'fadeIn']:
+        if effect not in [None, u'fadeIn', u'slideIn']:
             raise ValueError(u'Invalid entry effect')
         if not isinstance(duration, int):
             raise TypeError(u'Duration should be an int')
@@ -185,15 +839,18 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
     def setExitEffect(self, effect, duration=500):
         """ Sets the effect with which the notifications are to disappear.
 
-        :param effect: dict{'fadeOut', None} the effect which should be used (for now only 'fadeOut' is available)
-                       if None is passed for this argument, no effect will be used and the notifications will
-                       just appear directly.
-        :param duration: int (default: 1000 ms) The duration of the effect in milliseconds
+        :param effect: dict{'fadeOut', 'slideOut', 'collapse', None} the effect which should be used. 'fadeOut'
+                       fades the notification out, 'slideOut' slides it out over the right edge of the area, after
+                       which the notifications below it move up into its place, and 'collapse' removes it directly
+                       and moves the notifications below it up into its place. If None is passed for this
+                       argument, no effect will be used and the notifications will just disappear directly.
+        :param duration: int (default: 1000 ms) The duration of the effect in milliseconds. With 'slideOut',
+                         both sliding out and moving up take this long.
 
         :raises: TypeError If the object passed for duration is not an int.
         :raises: ValueError When duration is less than 0, or effect has an invalid value.
         """
-        if effect not in [None, u'fadeOut']:
+        if effect not in [None, u'fadeOut', u'slideOut', u'collapse']:
             raise ValueError(u'Invalid exit effect')
         if not isinstance(duration, int):
             raise TypeError(u'Duration should be an int')
@@ -204,18 +861,98 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
         self.exitEffect = effect
         self.exitEffectDuration = duration
 
+    def poolStatistics(self):
+        """ Returns the usage statistics of the notification widget pool.
+
+        :return: dict with the number of 'hits' (reused widgets), 'misses' (newly built widgets),
+                 the number of idle widgets ('size') and the pool's high-water mark ('maxSize').
+        """
+        return {
+            u'hits': self.pool.hits,
+            u'misses': self.pool.misses,
+            u'size': self.pool.size,
+            u'maxSize': self.pool.maxSize,
+        }
+
+    def heightCacheStatistics(self):
+        """ Returns the usage statistics of the cache of message heights.
+
+        :return: dict with the number of 'hits' and 'misses', the 'hitRate', and the number of cached
+                 heights ('size'), or None if the cache is disabled.
+        """
+        if self.heightCache is None:
+            return None
+        return {
+            u'hits': self.heightCache.hits,
+            u'misses': self.heightCache.misses,
+            u'hitRate': self.heightCache.hitRate,
+            u'size': len(self.heightCache),
+        }
+
+    def dropStatistics(self):
+        """ Returns the numbers of notifications that were dropped because the queue was full ('overflow'),
+        because they exceeded the rate limit of their category ('rateLimited') or because they waited in the queue
+        for longer than their maximum age ('expired'), and the number of dropped notifications per category
+        ('byCategory').
+
+        :return: dict
+        """
+        return {
+            u'overflow': self._drops[u'overflow'],
+            u'rateLimited': self._drops[u'rate_limited'],
+            u'expired': self._drops[u'expired'],
+            u'byCategory': dict(self._drops_by_category),
+        }
+
+    def layoutStatistics(self):
+        """ Returns how much layout work the area has done for its notification widgets.
+
+        :return: dict with the number of full layout passes in which all notifications were measured ('passes',
+                 only needed when the width of the area changes), the number of times a notification was measured
+                 ('measured') and the number of times a notification was moved without being measured ('moved').
+        """
+        return {
+            u'passes': self._stack.passes,
+            u'measured': self._stack.measured,
+            u'moved': self._stack.moved,
+        }
+
+    def visibleCount(self):
+        """ Returns the number of notifications that are currently shown. """
+        return len(self._visible)
+
+    def isShown(self, notification):
+        """ Returns whether a notification is currently shown (and not queued or removed). """
+        if isinstance(notification, QueuedNotification):
+            notification = notification.notification
+        return notification in self._visible
+
+    def metricsSnapshot(self):
+        """ Returns the current values of the area's metrics (see NotificationMetrics.snapshot()).
+
+        :return: dict, or None if metrics are disabled.
+        """
+        if self.metrics is None:
+            return None
+        return self.metrics.snapshot()
+
     # Events:
-    # @QtCore.Slot('QString', 'QString', int)
-    # @QtCore.Slot('QString', 'QString', int, 'QString')
-    @QtCore.pyqtSlot('QString', 'QString', int)
-    @QtCore.pyqtSlot('QString', 'QString', int, 'QString')
-    def display(self, message, category, timeout=5000, button_text=None):
+    @Slot('QString', 'QString', int)
+    @Slot('QString', 'QString', int, 'QString')
+    def display(self, message, category, timeout=5000, button_text=None, priority=None, key=None, max_age=None):
         """ Displays a notification.
 
         If a queue is used, then the notification will only be shown directly
         if the number of notifications shown is smaller than maxMessages.
 
-        :param message: str The message to display.
+        If a key is given and a notification with that key is still displayed or queued, no new notification is
+        created: the message, category and timeout of the existing one are updated instead (see
+        updateNotification()).
+
+        :param message: str The message to display, or a callable that returns it. A callable is only called when
+                        the notification is shown, so the text of a notification that waits in the queue is not
+                        formatted before it is needed. The text of a dropped notification is only formatted if it
+                        is recorded in the history or a slot is connected to notificationDropped.
         :param category : dict{'primary', 'success', 'info', 'warning', 'danger'}
                           The type of notification that should be shown. Adheres to bootstrap standards which are
                           primary, success, info, warning and danger.
@@ -223,17 +960,198 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
                          If None then the notification will be shown indefinitely.
         :param button_text: str (optional) The text to display on the closing button.
                             If not provided a cross will be shown.
+        :param priority: int (optional) The priority with which the notification is queued. If not provided, the
+                         priority of its category in categoryPriorities is used.
+        :param key: str (optional) The key by which the notification can be updated in place.
+        :param max_age: int (optional) The maximum time in milliseconds that the notification may wait in the
+                        queue before it is dropped. If not provided, the area's maxAge is used.
+        :return: QueuedNotification the handle of the notification (which is that of an existing one if the
+                 message was coalesced into it or if it has the same key), or None if the notification was dropped.
+                 The handle can be passed to remove() and isShown() also after the notification has been removed
+                 (and its widget reused). While the notification is shown, its widget is handle.notification.
 
         :raises: ValueError if the category is other than one of the expected values.
         """
-        notification = QNotification(message, category, timeout, button_text, self)
-        notification.closeClicked.connect(self.remove)
-
+        if self.metrics is None:
+            return self.__display(message, category, timeout, button_text, priority, key, max_age)
+
+        start = monotonic()
+        notification = self.__display(message, category, timeout, button_text, priority, key, max_age)
+        self.metrics.displayTime.observe(monotonic() - start)
+        return notification
+
+    def __display(self, message, category, timeout, button_text, priority, key, max_age):
+        """ Implementation of display(). """
+        if category not in QNotification.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(QNotification.allowed_categories)))
+        if key is not None and self.updateNotification(key, message, category, timeout=timeout):
+            return self.__handle(self._keyed[key])
+        if self.rateLimiter is not None and not self.rateLimiter.allow(category):
+            self.__count_drop(message, category, u'rate_limited')
+            return None
+
+        # Keyed notifications are updated by key instead.
+        coalesce = self.coalesceWindow and key is None
+        if coalesce:
+            coalesce_key = (message, category, button_text)
+            duplicate = self.__find_duplicate(coalesce_key)
+            if duplicate is not None:
+                if self.metrics is not None:
+                    self.metrics.increment(u'coalesced')
+                duplicate.setRepeatCount(duplicate.repeatCount + 1)
+                # Restart the timeout of a notification that is already shown, or the maximum age of a queued one.
+                if duplicate in self._visible:
+                    self.__start_timeout(duplicate)
+                else:
+                    self.__refresh_expiry(duplicate)
+                self.notificationUpdated.emit(duplicate)
+                return self.__handle(duplicate)
+
+        if priority is None:
+            priority = self.categoryPriorities.get(category, 0)
         # Queue if max amount of notifications is shown.
-        if self.useQueue and self.layout().count() >= self.maxMessages:
-            self.queue.put(notification)
+        queue = self.useQueue and len(self._visible) >= self.maxMessages
+        # Expired notifications do not take up room in the queue.
+        if queue:
+            self.__expire_queued()
+        # Apply the overflow policy before a widget is built for a notification that might be dropped.
+        if queue and self.maxQueued is not None and len(self.queue) >= self.maxQueued:
+            if not self.__make_room(message, category, timeout, priority):
+                return None
+
+        # Only a compact record is kept for a queued notification; its widget is built when it is shown.
+        if queue:
+            notification = QueuedNotification(message, category, timeout, button_text, priority)
+        else:
+            notification = self.pool.acquire(message_text(message), category, timeout, button_text)
+            notification.priority = priority
+            # The widget is reused once the notification has been removed, so a record of the notification is
+            # returned as its handle instead.
+            notification.record = QueuedNotification(message, category, timeout, button_text, priority)
+            notification.record.notification = notification
+        if coalesce:
+            self.__remember_duplicate(coalesce_key, notification)
+        if key is not None:
+            notification.key = key
+            self._keyed[key] = notification
+        if self.metrics is not None:
+            self.metrics.increment(u'displayed')
+
+        if queue:
+            self.__enqueue(notification, self.maxAge if max_age is None else max_age)
+            if self.preempt:
+                self.__preempt(priority)
         else:
             self._show_notification(notification)
+        return self.__handle(notification)
+
+    def __handle(self, notification):
+        """ Returns the record that display() returns as the handle of a displayed or queued notification. """
+        if isinstance(notification, QueuedNotification):
+            return notification
+        return notification.record
+
+    def displayMany(self, notifications):
+        """ Displays a number of notifications at once, e.g. to restore the notifications of a session.
+
+        The notifications are handled exactly as if display() was called for each of them (including queueing,
+        maxMessages and the overflow policy), but the area is shown, repainted and laid out only once, after all
+        of them have been added.
+
+        :param notifications: iterable of NotificationRecords, tuples with the arguments of display()
+                              ((message, category[, timeout[, button_text[, priority[, key[, max_age]]]]])) or
+                              dicts with its keyword arguments.
+        :return: list with the result of display() for every notification.
+
+        :raises: ValueError if the category of any of the notifications is other than one of the expected values.
+                 In that case, none of the notifications is displayed.
+        """
+        batch = []
+        for spec in notifications:
+            if isinstance(spec, NotificationRecord):
+                args = (spec.message, spec.category, spec.timeout, spec.button_text, None, None)
+            elif isinstance(spec, dict):
+                args = (spec[u'message'], spec[u'category'], spec.get(u'timeout', 5000), spec.get(u'button_text'),
+                        spec.get(u'priority'), spec.get(u'key'), spec.get(u'max_age'))
+            else:
+                args = tuple(spec)
+                args += (5000, None, None, None)[len(args) - 2:]
+            if args[1] not in QNotification.allowed_categories:
+                raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                    args[1], str(QNotification.allowed_categories)))
+            batch.append(args)
+        # Toggling updates of the area would repaint it, even if nothing was added.
+        if not batch:
+            return []
+
+        self.__begin_batch()
+        try:
+            return [self.display(*args) for args in batch]
+        finally:
+            self.__end_batch()
+
+    def updateNotification(self, key, message=None, category=None, progress=_unchanged, timeout=_unchanged):
+        """ Updates the notification that was displayed with a key in place, e.g. to report the status of a job.
+
+        Updates are not applied directly, but collected and applied together once per updateInterval, so a
+        notification that is updated more often is repainted only once per interval, with its latest state.
+
+        :param key: str the key the notification was displayed with.
+        :param message: str (default: None) The new message (or a callable that returns it), or None to keep the
+                        message.
+        :param category: str (default: None) The new category, or None to keep the category.
+        :param progress: float (optional) The progress between 0 and 1 to show in a progress bar, or None to
+                         hide the progress bar.
+        :param timeout: int (optional) A new timeout, which restarts if the notification is shown. None shows the
+                        notification indefinitely.
+        :return: bool whether a notification with the key is displayed or queued (if not, nothing is updated).
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if category is not None and category not in QNotification.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(QNotification.allowed_categories)))
+        notification = self._keyed.get(key)
+        if notification is None or notification.isBeingRemoved:
+            return False
+
+        changes = self._updates.setdefault(key, {})
+        if message is not None:
+            changes[u'message'] = message
+        if category is not None:
+            changes[u'category'] = category
+        if progress is not _unchanged:
+            changes[u'progress'] = progress
+        if timeout is not _unchanged:
+            changes[u'timeout'] = timeout
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+        return True
+
+    def __begin_batch(self):
+        """ Suspends repaints and size updates of the area until the matching call to __end_batch(). """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            self.setUpdatesEnabled(False)
+            # The notifications of the batch are measured as they are added, so the stack has to have its final
+            # width already (a hidden area is only resized when it is shown).
+            self.__sync_width()
+
+    def __end_batch(self):
+        """ Shows the area and updates its size once for all notifications shown since __begin_batch(). """
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        if self._batch_layout:
+            self._batch_layout = False
+            if self._visible and not self.isVisible():
+                self.__update_geometry()
+                self.show()
+                self.raise_()
+            else:
+                self.__fit()
+        self.setUpdatesEnabled(True)
 
     def _show_notification(self, notification):
         """
@@ -241,42 +1159,81 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
         :param notification:
         :return:
         """
-        if not self.isVisible():
+        if self._batch_depth:
+            self._batch_layout = True
+        elif not self.isVisible():
+            # The geometry is not updated while the area is hidden.
+            self.__update_geometry()
             self.show()
             self.raise_()
 
-        self.layout().addWidget(notification)
+        self._visible.append(notification)
+        if self.metrics is not None:
+            self.metrics.observeVisible(len(self._visible))
 
         # Check for entry effects
-        if self.entryEffect is not None:
-            if self.entryEffect == u"fadeIn":
-                notification.fadeIn(self.entryEffectDuration)
+        if self.entryEffect == u"fadeIn":
+            notification.fadeIn(self.entryEffectDuration, self.animationDriver)
         else:
             notification.display()
 
-        self.adjustSize()
+        # The notification is measured once its text has been set by display().
+        geometry = self._stack.append(notification)
+        if self.renderMode == u'widgets':
+            notification.setGeometry(*geometry)
+        if self.entryEffect == u'slideIn':
+            self.__animate_offset(notification, u'offsetX', self.width(), 0, self.entryEffectDuration)
+        if not self._batch_depth:
+            self.__fit()
+        self.__start_timeout(notification)
+        self.notificationShown.emit(notification)
+
+    def __update_geometry(self):
+        """ Matches the width of the area to that of the target widget, and updates its height. """
+        self._geometry_timer.stop()
+        self.__sync_width()
+        self.__fit()
+
+    def __sync_width(self):
+        """ Matches the width of the area and its stack of notifications to that of the target widget. """
+        width = self.targetWidget.width()
+        if self.width() != width:
+            self.setFixedWidth(width)
+        # All notifications only have to be measured again if the width changed.
+        if self._stack.width != width:
+            self.__move_rows(self._stack.relayout(width))
+
+    def _update_row(self, notification):
+        """ Measures a shown painted notification again after its text changed, and moves the notifications below
+        it if its height changed. (Notification widgets are measured again when they request a new layout, see
+        eventFilter().) """
+        if notification in self._stack:
+            rows = self._stack.update(notification)
+            if rows:
+                self.__move_rows(rows)
+                self.__fit()
+
+    def __start_timeout(self, notification):
+        """ (Re)starts the timeout after which a displayed notification is removed. """
         if notification.timeout is not None and notification.timeout > 0:
-            QtCore.QTimer.singleShot(notification.timeout, lambda: self.remove(notification))
-
-    # def slideIn(self, duration):
-    #     """
-    #     Moves the QNotification Area from
-    #
-    #     :param duration:
-    #     :return:
-    #     """
-    #     print(self.x(), self.y())
-    #     self.setGeometry(QtCore.QRect(100, 0, self.width(), self.height()))
-
-    # @QtCore.Slot()
-    @QtCore.pyqtSlot()
-    def remove(self, notification=None):
+            self.timeouts.schedule(notification, notification.timeout, self.__notification_timed_out)
+
+    def __notification_timed_out(self, notification):
+        """ Removes a notification whose timeout expired. """
+        self.remove(notification, u'timeout')
+
+    @Slot()
+    def remove(self, notification=None, reason=None):
         """ Removes a notification.
 
         :param notification: QNotification (default: None)
             The notification to remove. This function also serves as a PyQt slot
             for signals emitted from a QNotification. In this case, the QNotification
-            object is retrieved by using self.sender()
+            object is retrieved by using self.sender(). A notification can also be removed by passing the
+            handle that display() returned for it, which does nothing once it has been removed.
+        :param reason: str (default: None) Why the notification is removed, e.g. 'timeout' or 'user' (when the
+            close button was clicked). Stored as the notification's dismissReason. If None, 'user' is used
+            when this function is called as a slot, and 'api' otherwise.
 
         :raises: ValueError If notification is not None or a QNotification.
         """
@@ -289,47 +1246,136 @@ class QNotificationArea(QtGui.QWidget):  # QtWidgets.QWidget
                 raise ValueError(u'QNotification object needs to be passed or '
                                  u'this function should be used as a slot for a signal '
                                  u'emitted by a QNotification')
+            if reason is None:
+                reason = u'user'
+
+        if self.metrics is None:
+            self.__remove(notification, reason or u'api')
+            return
+
+        start = monotonic()
+        self.__remove(notification, reason or u'api')
+        self.metrics.removeTime.observe(monotonic() - start)
 
+    def __remove(self, notification, reason):
+        """ Implementation of remove(). """
+        if isinstance(notification, QueuedNotification) and notification.notification is not None:
+            notification = notification.notification
         if notification.isBeingRemoved:
             return
+        if isinstance(notification, QueuedNotification):
+            self.__remove_queued(notification, reason)
+            return
         else:
             notification.isBeingRemoved = True
+            notification.dismissReason = reason
 
         # Check if notification is still present (and has not manually been
         # closed before this function is called by a timeout)
-        if self.layout().indexOf(notification) < 0:
+        if notification not in self._visible:
             return
 
+        # The notification might be closed manually, so it should no longer time out.
+        self.timeouts.cancel(notification)
+
         # Implement animation here
         if self.exitEffect == u'fadeOut':
-            notification.fadeOut(self.__delete_notification, self.exitEffectDuration)
+            notification.fadeOut(self.__delete_notification, self.exitEffectDuration, self.animationDriver)
+        elif self.exitEffect == u'slideOut':
+            self.__animate_offset(notification, u'offsetX', notification.offsetX, self.width(),
+                                  self.exitEffectDuration, self.__delete_notification)
         else:
             self.__delete_notification(notification)
 
+    def __remove_queued(self, record, reason):
+        """ Removes a notification that has not been shown yet from the queue. """
+        if self.metrics is not None:
+            self.metrics.increment(u'removed_' + reason if reason in (u'timeout', u'user') else u'removed_other')
+        if self.history is not None:
+            self.history.record(message_text(record.message), record.category, reason)
+        self.__unqueue(record, reason)
+
     # Internal Qt functions:
-    def resizeEvent(self, event):
+    def eventFilter(self, watched, event):
+        """ Internal QT function (do not call directly). Schedules a geometry update when the target is resized.
+
+        :param watched: QtCore.QObject
+        :param event: QtCore.QEvent
+        """
+        if watched is self.targetWidget and event.type() == QtCore.QEvent.Resize:
+            # Hidden areas are updated when they are shown again.
+            if self.isVisible() and not self._geometry_timer.isActive():
+                self._geometry_timer.start()
+        elif event.type() == QtCore.QEvent.LayoutRequest and self.renderMode == u'widgets' \
+                and watched in self._stack:
+            # The contents of a notification changed (e.g. its message), which might have changed its height.
+            rows = self._stack.update(watched)
+            if rows:
+                self.__move_rows(rows)
+                self.__fit()
+        return super(QNotificationArea, self).eventFilter(watched, event)
+
+    def sizeHint(self):
+        """ Internal QT function (do not call directly). """
+        # While notifications move up into the place of a removed one, the area keeps room for them.
+        moving = int(self._visible[-1].offsetY) if self._visible else 0
+        return QtCore.QSize(self.width(), self._stack.height + moving)
+
+    def mousePressEvent(self, event):
+        """ Internal QT function (do not call directly). Closes painted notifications when their button is clicked.
+
+        :param event:
+        """
+        if self.renderMode == u'painter':
+            notification, on_button = self._painter.hit_test(self._stack, event.pos())
+            if notification is not None and on_button:
+                self.remove(notification, u'user')
+                return
+        super(QNotificationArea, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        """ Internal QT function (do not call directly). Tracks which painted notification is hovered.
+
+        :param event:
+        """
+        if self.renderMode == u'painter':
+            notification, _ = self._painter.hit_test(self._stack, event.pos())
+            self.__set_hovered(notification)
+        super(QNotificationArea, self).mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
         """ Internal QT function (do not call directly).
 
         :param event:
         """
-        self.target_resize_event(event)
-        newsize = event.size()
-        self.setFixedWidth(newsize.width())
-        self.adjustSize()
+        if self.renderMode == u'painter':
+            self.__set_hovered(None)
+        super(QNotificationArea, self).leaveEvent(event)
+
+    def __set_hovered(self, notification):
+        """ Pauses the timeout of the hovered painted notification, and resumes that of the previous one. """
+        if notification is self._hovered:
+            return
+        if self._hovered is not None:
+            self.__hover_changed(self._hovered, False)
+        self._hovered = notification
+        if notification is not None:
+            self.__hover_changed(notification, True)
 
     def paintEvent(self, pe):
         """ Redefinition of paintEvent.
 
         Makes class QNotificationArea available in style sheets. Internal QT function (do not call directly).
+        In 'painter' mode, the notifications are drawn here as well.
 
         :param pe:
         """
-        # o = QtWidgets.QStyleOption()
-        option = QtGui.QStyleOption()
-        # o.initFrom(self)
-        # p = QtGui.QPainter(self)
         painter = QtGui.QPainter(self)
-        option.initFrom(self)
-        # self.style().drawPrimitive(QtWidgets.QStyle.PE_Widget, o, p, self)
-        self.style().drawPrimitive(QtGui.QStyle.PE_Widget, option, painter, self)
+        if self.styleEngine is None:
+            option = QtWidgets.QStyleOption()
+            option.initFrom(self)
+            self.style().drawPrimitive(QtWidgets.QStyle.PE_Widget, option, painter, self)
+
+        if self.renderMode == u'painter':
+            self._painter.paint(painter, self._stack, pe.rect())
 
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+A scrollable "notification center" that lists the past and current notifications of a QNotificationArea.
+
+The entries are kept in a column-oriented NotificationStore (arrays of timestamps, categories and dismiss
+reasons, and a list of messages) and shown through a QAbstractListModel and a delegate that paints the rows,
+so there is no widget per entry. All rows have the same height, which lets the view lay out and paint only the
+rows that are visible, also with hundreds of thousands of entries.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import time
+from array import array
+from bisect import bisect_left
+
+from QNotifications.abstractions import *
+from QNotifications.history import categories, reasons
+from QNotifications.qt import QtCore, QtGui, QtWidgets
+from QNotifications.records import HistoryRecord
+from QNotifications.styling import StyleEngine
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# Item data roles (as plain integers, which all bindings accept).
+DISPLAY_ROLE = 0  # QtCore.Qt.DisplayRole
+TOOLTIP_ROLE = 3  # QtCore.Qt.ToolTipRole
+CATEGORY_ROLE = 0x0100  # QtCore.Qt.UserRole
+TIMESTAMP_ROLE = 0x0101
+REASON_ROLE = 0x0102
+
+
+class NotificationStore(object):
+    """
+    Column-oriented store of notification entries. Timestamps, categories and dismiss reasons are kept in
+    typed arrays, so an entry costs a few bytes next to its message.
+    """
+
+    def __init__(self):
+        self.timestamps = array(str('d'))
+        # Indices in QNotifications.history.categories and QNotifications.history.reasons.
+        self.categories = array(str('B'))
+        self.reasons = array(str('B'))
+        self.messages = []
+        # Lower-case messages for searching, built on the first search.
+        self._lowered = None
+
+    def __len__(self):
+        return len(self.messages)
+
+    def append(self, timestamp, category, message, reason=None):
+        """ Adds an entry.
+
+        :param timestamp: float (as returned by time.time())
+        :param category: str
+        :param message: str
+        :param reason: str (default: None) How the notification was dismissed, or None if it is still shown.
+        :return: int the index of the entry.
+        """
+        self.timestamps.append(timestamp)
+        self.categories.append(categories.index(category) if category in categories else 255)
+        self.reasons.append(reasons.index(reason) if reason in reasons else 0)
+        self.messages.append(message)
+        if self._lowered is not None:
+            self._lowered.append(safe_decode(message).lower())
+        return len(self.messages) - 1
+
+    def setReason(self, index, reason):
+        """ Sets the dismiss reason of an entry. """
+        self.reasons[index] = reasons.index(reason) if reason in reasons else 0
+
+    def update(self, index, category, message):
+        """ Sets the category and message of an entry (e.g. of a notification that was updated in place). """
+        self.categories[index] = categories.index(category) if category in categories else 255
+        self.messages[index] = message
+        if self._lowered is not None:
+            self._lowered[index] = safe_decode(message).lower()
+
+    def category(self, index):
+        code = self.categories[index]
+        return categories[code] if code < len(categories) else None
+
+    def reason(self, index):
+        return reasons[self.reasons[index]]
+
+    def record(self, index):
+        """ Returns an entry as a HistoryRecord. """
+        return HistoryRecord(self.timestamps[index], self.category(index), self.messages[index], self.reason(index))
+
+    def lowered(self):
+        """ Returns the list of lower-case messages. """
+        if self._lowered is None:
+            self._lowered = [safe_decode(message).lower() for message in self.messages]
+        return self._lowered
+
+
+class NotificationListModel(QtCore.QAbstractListModel):
+    """
+    List model over a NotificationStore, with the most recent entry first. Filters by category and text are
+    applied by the model itself (by keeping the indices of the matching entries), instead of by a proxy model
+    that would call back into Python for every row.
+    """
+
+    def __init__(self, store=None, parent=None):
+        """
+
+        :param store: NotificationStore (default: None) If None, an empty store is created.
+        :param parent: QtCore.QObject (default: None)
+        """
+        super(NotificationListModel, self).__init__(parent)
+        self.store = store if store is not None else NotificationStore()
+        # Category codes that are shown (None for all), the lower-case search text, and the store indices of the
+        # matching entries in increasing order (None if no filter is set).
+        self._category_codes = None
+        self._text = u''
+        self._matches = None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._matches) if self._matches is not None else len(self.store)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        entry = self.storeIndex(index.row())
+        if role == DISPLAY_ROLE or role == TOOLTIP_ROLE:
+            return self.store.messages[entry]
+        if role == CATEGORY_ROLE:
+            return self.store.category(entry)
+        if role == TIMESTAMP_ROLE:
+            return self.store.timestamps[entry]
+        if role == REASON_ROLE:
+            return self.store.reason(entry)
+        return None
+
+    def storeIndex(self, row):
+        """ Returns the index in the store of the entry in a row. """
+        if self._matches is not None:
+            return self._matches[len(self._matches) - 1 - row]
+        return len(self.store) - 1 - row
+
+    def __row(self, entry):
+        """ Returns the row of the entry with a store index, or None if it is filtered out. """
+        if self._matches is None:
+            return len(self.store) - 1 - entry
+        position = bisect_left(self._matches, entry)
+        if position < len(self._matches) and self._matches[position] == entry:
+            return len(self._matches) - 1 - position
+        return None
+
+    def __accepts(self, entry):
+        if self._category_codes is not None and self.store.categories[entry] not in self._category_codes:
+            return False
+        return not self._text or self._text in self.store.lowered()[entry]
+
+    def setFilter(self, categories_shown=None, text=u''):
+        """ Shows only the entries of some categories, and/or whose message contains a text.
+
+        :param categories_shown: iterable of str (default: None) The categories to show, or None for all.
+        :param text: str (default: '') Text that the messages should contain (case insensitive).
+        """
+        self.beginResetModel()
+        if categories_shown is None:
+            self._category_codes = None
+        else:
+            self._category_codes = set(categories.index(c) for c in categories_shown if c in categories)
+        self._text = safe_decode(text).lower()
+        if self._category_codes is None and not self._text:
+            self._matches = None
+        else:
+            codes = self._category_codes
+            column = self.store.categories
+            lowered = self.store.lowered() if self._text else None
+            text = self._text
+            self._matches = array(str('L'), (
+                entry for entry in range(len(self.store))
+                if (codes is None or column[entry] in codes) and (lowered is None or text in lowered[entry])))
+        self.endResetModel()
+
+    def append(self, timestamp, category, message, reason=None):
+        """ Adds an entry at the top of the list.
+
+        :return: int the index of the entry in the store.
+        """
+        entry = self.store.append(timestamp, category, message, reason)
+        if self._matches is None or self.__accepts(entry):
+            self.beginInsertRows(QtCore.QModelIndex(), 0, 0)
+            if self._matches is not None:
+                self._matches.append(entry)
+            self.endInsertRows()
+        return entry
+
+    def extend(self, records):
+        """ Adds a batch of HistoryRecords (oldest first) with a single model reset. """
+        self.beginResetModel()
+        for record in records:
+            self.store.append(record.timestamp, record.category, record.message, record.reason)
+        self.endResetModel()
+        # Re-apply the filter to include the new entries.
+        if self._matches is not None:
+            self.__refilter()
+
+    def __refilter(self):
+        """ Applies the current filter again. """
+        self.setFilter(None if self._category_codes is None else [categories[c] for c in self._category_codes],
+                       self._text)
+
+    def setReason(self, entry, reason):
+        """ Sets the dismiss reason of the entry with a store index, and updates its row. """
+        self.store.setReason(entry, reason)
+        row = self.__row(entry)
+        if row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def update(self, entry, category, message):
+        """ Sets the category and message of the entry with a store index, and updates its row. """
+        self.store.update(entry, category, message)
+        row = self.__row(entry)
+        # The entry might no longer match the filter, or match it now.
+        if self._matches is not None and (row is not None) != self.__accepts(entry):
+            self.__refilter()
+        elif row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+
+class NotificationDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints the rows of a NotificationListModel: the background of the category, the (elided) message, and the
+    time and dismiss reason. All rows have the same height, which is computed once.
+    """
+
+    def __init__(self, engine=None, parent=None, padding=8, spacing=3):
+        """
+
+        :param engine: StyleEngine (default: None) The engine that provides the font, colors and backgrounds.
+                       If None, the shared engine is used.
+        :param parent: QtCore.QObject (default: None)
+        :param padding: int (default: 8) The space between the border of a row and its contents.
+        :param spacing: int (default: 3) The space between two rows.
+        """
+        super(NotificationDelegate, self).__init__(parent)
+        self.engine = engine if engine is not None else StyleEngine.instance()
+        self.padding = padding
+        self.spacing = spacing
+        self.font = self.engine.font
+        self.metrics = QtGui.QFontMetrics(self.font)
+        self.detailFont = QtGui.QFont(self.font)
+        self.detailFont.setPixelSize(max(8, self.font.pixelSize() * 3 // 4))
+        self.detailMetrics = QtGui.QFontMetrics(self.detailFont)
+        self.rowHeight = self.metrics.height() + 2 * padding + spacing
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(option.rect.width(), self.rowHeight)
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        category = model.data(index, CATEGORY_ROLE) or u'space-grey'
+        rect = option.rect.adjusted(0, 0, 0, -self.spacing)
+
+        painter.save()
+        painter.drawPixmap(rect.topLeft(), self.engine.background(category, rect.width(), rect.height()))
+        painter.setPen(self.engine.textColor)
+
+        # Time and dismiss reason on the right, the message in the remaining space.
+        timestamp = model.data(index, TIMESTAMP_ROLE)
+        detail = time.strftime(u'%H:%M:%S', time.localtime(timestamp))
+        reason = model.data(index, REASON_ROLE)
+        detail += u' \u00b7 ' + (reason.replace(u'_', u' ') if reason else u'shown')
+        content = rect.adjusted(self.padding, self.padding, -self.padding, -self.padding)
+        painter.setFont(self.detailFont)
+        painter.drawText(content, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, detail)
+
+        content.setRight(content.right() - self.detailMetrics.boundingRect(detail).width() - self.padding)
+        message = model.data(index, DISPLAY_ROLE)
+        painter.setFont(self.font)
+        painter.drawText(content, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+                         self.metrics.elidedText(message, QtCore.Qt.ElideRight, content.width()))
+        painter.restore()
+
+
+class QNotificationPanel(QtWidgets.QWidget):
+    """
+    Notification center that lists the notifications of a QNotificationArea (the ones that are shown, and the
+    ones that have been removed or dropped), with a toggle per category and a search field.
+
+    :inherits: QtWidgets.QWidget
+    """
+
+    def __init__(self, area=None, parent=None, **kwargs):
+        """
+
+        :param area: QNotificationArea (default: None) The area whose notifications are listed (see setArea()).
+        :param parent: QtWidgets.QWidget (default: None)
+        :param styleEngine: StyleEngine (default: None) The engine that styles the rows. If None, the engine of
+                            the area, or else the shared engine, is used.
+        :param searchDelay: int (default: 150) The time in milliseconds after the last key press in the search
+                            field after which the list is filtered.
+        """
+        styleEngine = kwargs.pop(u'styleEngine', None)
+        searchDelay = kwargs.pop(u'searchDelay', 150)
+        super(QNotificationPanel, self).__init__(parent, **kwargs)
+        if styleEngine is None and area is not None:
+            styleEngine = area.styleEngine
+
+        self.area = None
+        # Store indices of the entries of the notifications that are currently shown, by notification.
+        self._open = {}
+
+        self.model = NotificationListModel(parent=self)
+        self.delegate = NotificationDelegate(styleEngine, self)
+
+        self.view = QtWidgets.QListView(self)
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(self.delegate)
+        # Rows of the same height are laid out by arithmetic, so only the visible rows are ever measured.
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+
+        self.searchField = QtWidgets.QLineEdit(self)
+        self.searchField.setPlaceholderText(u'Search notifications')
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(searchDelay)
+        self._search_timer.timeout.connect(self.__apply_filter)
+        self.searchField.textChanged.connect(lambda text: self._search_timer.start())
+
+        filters = QtWidgets.QHBoxLayout()
+        filters.setContentsMargins(0, 0, 0, 0)
+        self.categoryButtons = {}
+        for category in categories:
+            button = QtWidgets.QToolButton(self)
+            button.setText(category)
+            button.setCheckable(True)
+            button.setChecked(True)
+            button.toggled.connect(self.__apply_filter)
+            filters.addWidget(button)
+            self.categoryButtons[category] = button
+        filters.addStretch(1)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.searchField)
+        layout.addLayout(filters)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+        if area is not None:
+            self.setArea(area)
+
+    def setArea(self, area):
+        """ Lists the notifications of an area from now on, after the ones in its history (if it has one).
+
+        :param area: QNotificationArea
+        """
+        if self.area is not None:
+            self.area.notificationShown.disconnect(self.__notification_shown)
+            self.area.notificationUpdated.disconnect(self.__notification_updated)
+            self.area.notificationRemoved.disconnect(self.__notification_removed)
+            self.area.notificationDropped.disconnect(self.__notification_dropped)
+        self.area = area
+        self._open = {}
+        if area.history is not None:
+            self.model.extend(area.history.recent())
+        area.notificationShown.connect(self.__notification_shown)
+        area.notificationUpdated.connect(self.__notification_updated)
+        area.notificationRemoved.connect(self.__notification_removed)
+        area.notificationDropped.connect(self.__notification_dropped)
+
+    def loadHistory(self, records):
+        """ Adds HistoryRecords (e.g. from NotificationHistory.range()), oldest first, to the list. """
+        self.model.extend(records)
+
+    def __notification_shown(self, notification):
+        self._open[notification] = self.model.append(time.time(), notification.category, notification.message)
+
+    def __notification_updated(self, notification):
+        entry = self._open.get(notification)
+        if entry is not None:
+            self.model.update(entry, notification.category, notification.message)
+
+    def __notification_removed(self, notification):
+        entry = self._open.pop(notification, None)
+        if entry is not None:
+            self.model.setReason(entry, notification.dismissReason)
+
+    def __notification_dropped(self, message, category, reason):
+        self.model.append(time.time(), category, message, reason)
+
+    def __apply_filter(self, *args):
+        """ Filters the list by the checked categories and the search text. """
+        self._search_timer.stop()
+        shown = [category for category, button in self.categoryButtons.items() if button.isChecked()]
+        self.model.setFilter(None if len(shown) == len(categories) else shown, self.searchField.text())
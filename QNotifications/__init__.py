@@ -20,11 +20,51 @@ along with this module.>.
 __version__ = "1.1.1"
 __author__ = "Daniel Schreij (dschreij@gmail.com)"
 
-# Do some base imports
-# from PyQt4 import QtCore
-from QNotifications.QNotificationArea import QNotificationArea
-from QNotifications.QNotification import QNotification
+import sys
 
-# QtCore.Signal = QtCore.pyqtSignal
-# QtCore.Slot = QtCore.pyqtSlot
+# The public classes, by the module they are defined in. They are imported when they are first accessed, so
+# that importing QNotifications does not import Qt (and setup.py can read __version__ without it).
+_lazy_attributes = {
+    'QNotificationArea': 'QNotifications.QNotificationArea',
+    'QNotification': 'QNotifications.QNotification',
+    'QNotificationPanel': 'QNotifications.QNotificationPanel',
+    'NotificationCenter': 'QNotifications.center',
+}
 
+__all__ = ['QNotificationArea', 'QNotification', 'QNotificationPanel', 'NotificationCenter']
+
+# types.ModuleType, without importing the types module.
+_ModuleType = type(sys)
+
+
+class _Package(_ModuleType):
+    """ Module type of the package, which imports the public classes on first access. """
+
+    def __getattr__(self, name):
+        try:
+            module_name = _lazy_attributes[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(self.__name__, name))
+        __import__(module_name)
+        value = getattr(sys.modules[module_name], name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to the package, where it would shadow the class of the same name.
+        if name in _lazy_attributes and isinstance(value, _ModuleType):
+            value = getattr(value, name)
+        super(_Package, self).__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_lazy_attributes))
+
+
+if sys.version_info >= (3, 5):
+    sys.modules[__name__].__class__ = _Package
+else:
+    # The class of a module cannot be changed before Python 3.5.
+    from QNotifications.QNotificationArea import QNotificationArea
+    from QNotifications.QNotification import QNotification
+    from QNotifications.QNotificationPanel import QNotificationPanel
+    from QNotifications.center import NotificationCenter
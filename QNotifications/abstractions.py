@@ -16,6 +16,13 @@ else:
     universal_newline_mode = u'rU'
 
 
+# Clock that is not affected by changes of the system time (not available in Python 2).
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+
 def safe_decode(s, enc='utf-8', errors='strict'):
     """
 
@@ -68,6 +75,7 @@ else:
     safe_str = safe_encode
 
 __all__ = [
+    'monotonic',
     'py3',
     'safe_decode',
     'safe_encode',
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio integration of notification areas, for applications that run asyncio on the Qt event loop (e.g. with
+qasync). Requires Python 3.5 or newer.
+
+display() returns a NotificationHandle that can be awaited until the notification is dismissed::
+
+    reason = await aio.display(area, 'Upload finished', 'success', 5000)   # e.g. 'timeout' or 'user'
+
+and consume() displays the events of an async iterable in batches::
+
+    await aio.consume(area, build_events())
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import weakref
+
+from QNotifications.records import NotificationRecord, QueuedNotification
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# The _Watcher of every area for which handles have been created.
+_watchers = weakref.WeakKeyDictionary()
+
+
+class NotificationHandle(object):
+    """
+    Awaitable handle of a displayed notification. Awaiting it returns how the notification was dismissed:
+    'timeout', 'user' (the close button was clicked), 'api', 'preempted', or, if the notification was never
+    shown, 'overflow', 'rate_limited' or 'expired'.
+    """
+
+    def __init__(self, area, notification, loop):
+        """
+
+        :param area: QNotificationArea the area that displays the notification.
+        :param notification: the handle returned by QNotificationArea.display(), or None if it was dropped.
+        :param loop: the asyncio event loop the futures belong to.
+        """
+        self.area = area
+        self.notification = notification
+        # Resolved with True once the notification is shown.
+        self.shown = loop.create_future()
+        # Resolved with the dismiss reason once the notification is removed.
+        self.dismissed = loop.create_future()
+
+    def __await__(self):
+        return self.dismissed.__await__()
+
+    def done(self):
+        """ Returns whether the notification has been dismissed. """
+        return self.dismissed.done()
+
+    def dismiss(self):
+        """ Removes the notification from its area. """
+        if self.notification is not None and not self.dismissed.done():
+            self.area.remove(self.notification, u'api')
+
+    def _set_shown(self):
+        if not self.shown.done():
+            self.shown.set_result(True)
+
+    def _set_dismissed(self, reason):
+        # A notification that was dropped before it was shown will never be shown.
+        if not self.shown.done():
+            self.shown.set_result(False)
+        if not self.dismissed.done():
+            self.dismissed.set_result(reason)
+
+
+class _Watcher(object):
+    """ Resolves the handles of the notifications of one area, from the signals of the area. """
+
+    def __init__(self, area):
+        # Handles by the record that QNotificationArea.display() returned for their notification.
+        self.handles = {}
+        self.lastDropReason = None
+        area.notificationShown.connect(self.__shown)
+        area.notificationRemoved.connect(self.__removed)
+        area.notificationDropped.connect(self.__dropped)
+
+    def __shown(self, notification):
+        for handle in self.handles.get(notification.record, ()):
+            handle._set_shown()
+
+    def __removed(self, notification):
+        # The signal is emitted with the widget of a notification that was shown, or with the record of one that
+        # was dropped from the queue. The widget will be reused, so its handles are resolved now.
+        record = notification if isinstance(notification, QueuedNotification) else notification.record
+        for handle in self.handles.pop(record, ()):
+            handle._set_dismissed(notification.dismissReason)
+
+    def __dropped(self, message, category, reason):
+        self.lastDropReason = reason
+
+
+def _watcher(area):
+    watcher = _watchers.get(area)
+    if watcher is None:
+        watcher = _watchers[area] = _Watcher(area)
+    return watcher
+
+
+def display(area, message, category, timeout=5000, button_text=None, priority=None):
+    """ Displays a notification (see QNotificationArea.display()) and returns a handle to await its dismissal.
+
+    :return: NotificationHandle
+
+    :raises: ValueError if the category is other than one of the expected values.
+    """
+    watcher = _watcher(area)
+    watcher.lastDropReason = None
+    notification = area.display(message, category, timeout, button_text, priority)
+    handle = NotificationHandle(area, notification, asyncio.get_event_loop())
+    if notification is None:
+        handle._set_dismissed(watcher.lastDropReason)
+        return handle
+
+    watcher.handles.setdefault(notification, []).append(handle)
+    if area.isShown(notification):
+        handle._set_shown()
+    return handle
+
+
+def _record(event):
+    """ Converts an event into a NotificationRecord. """
+    if isinstance(event, NotificationRecord):
+        return event
+    return NotificationRecord(*event)
+
+
+async def consume(area, events, batch_size=100, latency=0.01):
+    """ Displays the events of an async iterable in an area, until the iterable is exhausted.
+
+    Events are collected into batches, which are displayed when batch_size events have arrived or when latency
+    seconds have passed since the first event of the batch, so that a fast producer does not cost an update of
+    the area per event.
+
+    :param area: QNotificationArea
+    :param events: async iterable of NotificationRecords or (message, category[, timeout[, button_text]]) tuples.
+    :param batch_size: int (default: 100) The maximum number of events that are displayed at once.
+    :param latency: float (default: 0.01) The maximum time in seconds that an event waits for its batch.
+    :return: int the number of events that were displayed.
+    """
+    loop = asyncio.get_event_loop()
+    iterator = events.__aiter__()
+    next_event = None
+    count = 0
+    exhausted = False
+    try:
+        while not exhausted:
+            batch = []
+            deadline = None
+            while len(batch) < batch_size:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(iterator.__anext__())
+                timeout = None if deadline is None else max(0, deadline - loop.time())
+                done, _ = await asyncio.wait([next_event], timeout=timeout)
+                if not done:
+                    # The batch has waited long enough; the pending event goes into the next one.
+                    break
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                finally:
+                    if next_event.done():
+                        next_event = None
+                batch.append(_record(event))
+                if deadline is None:
+                    deadline = loop.time() + latency
+            area.displayMany(batch)
+            count += len(batch)
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+    return count
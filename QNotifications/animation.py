@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+""" Animation support for the QNotifications module. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from QNotifications.abstractions import *
+from QNotifications.qt import QtCore
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class AnimationDriver(QtCore.QObject):
+    """
+    Drives any number of running animations with a single timer that ticks once per frame, instead of
+    every animation running its own QPropertyAnimation. The timer only runs while there are animations.
+
+    Animations are identified by their target object and a channel name (e.g. 'opacity'), so that starting
+    an animation on a channel replaces the animation that was running on it.
+
+    :inherits: QtCore.QObject
+    """
+    _instance = None
+
+    def __init__(self, interval=16, parent=None):
+        """
+
+        :param interval: int (default: 16) The time between frames in milliseconds.
+        :param parent: QtCore.QObject (default: None)
+        """
+        super(AnimationDriver, self).__init__(parent)
+        # Running animations: (id(target), channel) -> [target, setter, start, end, started_at, duration, finished]
+        self._animations = {}
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.__tick)
+
+    def __len__(self):
+        return len(self._animations)
+
+    @classmethod
+    def instance(cls):
+        """ Returns the driver that is shared by all animations that do not specify a driver. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def animate(self, target, channel, setter, start, end, duration, finished=None):
+        """ Starts an animation that linearly interpolates a value from start to end.
+
+        :param target: the object that is animated.
+        :param channel: str the name of the animated property.
+        :param setter: callable(value) that applies the interpolated value for each frame.
+        :param start: float the start value.
+        :param end: float the end value.
+        :param duration: int the duration of the animation in milliseconds.
+        :param finished: callable(target) (default: None) called when the animation has completed.
+        """
+        setter(start)
+        self._animations[(id(target), channel)] = [target, setter, start, end, monotonic(),
+                                                   duration / 1000.0, finished]
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self, target, channel=None):
+        """ Stops the animations of a target without calling their finished callbacks.
+
+        :param target: the animated object.
+        :param channel: str (default: None) the channel to stop. If None, all channels of the target are stopped.
+        """
+        if channel is not None:
+            self._animations.pop((id(target), channel), None)
+        else:
+            for key in [key for key in self._animations if key[0] == id(target)]:
+                del self._animations[key]
+        if not self._animations:
+            self._timer.stop()
+
+    def isAnimating(self, target, channel=None):
+        """ Returns whether an animation of the target (on the given channel) is running. """
+        if channel is not None:
+            return (id(target), channel) in self._animations
+        return any(key[0] == id(target) for key in self._animations)
+
+    def __tick(self):
+        """ Advances all running animations by one frame. """
+        now = monotonic()
+        completed = []
+        for key, (target, setter, start, end, started_at, duration, finished) in list(self._animations.items()):
+            progress = 1.0 if duration <= 0 else min(1.0, (now - started_at) / duration)
+            try:
+                setter(start + (end - start) * progress)
+            except RuntimeError:
+                # The underlying Qt object has been deleted.
+                del self._animations[key]
+                continue
+            if progress >= 1.0:
+                del self._animations[key]
+                if finished is not None:
+                    completed.append((finished, target))
+
+        if not self._animations:
+            self._timer.stop()
+
+        # Callbacks are called last, as they might start new animations.
+        for finished, target in completed:
+            finished(target)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+""" Caching utilities for the QNotifications module. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class LRUCache(object):
+    """
+    Mapping with a bounded size, that discards the least recently used entry when it is full.
+    Keeps count of the lookups that were (not) found in the cache.
+    """
+
+    def __init__(self, max_size=256):
+        """
+
+        :param max_size: int (default: 256) The maximum number of entries.
+
+        :raises: ValueError if max_size is smaller than 1.
+        """
+        if max_size < 1:
+            raise ValueError(u'max_size should be 1 or larger')
+        self.maxSize = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """ Returns the value of a key, and marks it as most recently used.
+
+        :param key: the key to look up.
+        :param default: (default: None) the value to return if the key is not in the cache.
+        """
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """ Stores the value of a key, discarding the least recently used entry if the cache is full. """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """ Removes all entries (the hit and miss counters are kept). """
+        self._entries.clear()
+
+    @property
+    def hitRate(self):
+        """ The fraction of lookups that were found in the cache. """
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
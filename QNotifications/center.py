@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+""" Process-wide dispatcher that routes notifications to the notification areas of many windows. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from QNotifications.QNotification import QNotification
+from QNotifications.QNotificationArea import QNotificationArea
+from QNotifications.animation import AnimationDriver
+from QNotifications.cache import LRUCache
+from QNotifications.qt import QtCore
+from QNotifications.records import NotificationRecord
+from QNotifications.scheduler import Empty, PriorityScheduler
+from QNotifications.styling import StyleEngine
+from QNotifications.timers import TimeoutScheduler
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class NotificationCenter(QtCore.QObject):
+    """
+    Routes notifications to registered notification areas, by the key of an area or by a topic that areas
+    subscribe to, and enforces a budget of visible notifications across all of them.
+
+    Notifications are not displayed by display() itself, but are queued in a single queue and dispatched by the
+    center's own timer, once per tick for everything that was queued in the meantime. The areas that the center
+    creates share its style engine, animation driver, timeout scheduler and cache of message heights, and do not
+    queue notifications themselves.
+    """
+    _instance = None
+
+    def __init__(self, parent=None, **kwargs):
+        """
+
+        :param parent: QtCore.QObject (default: None)
+        :param maxVisible: int (default: None) The maximum number of notifications that are shown at the same time
+                           in all areas together. If None, there is no limit.
+        :param tickInterval: int (default: 16) The time in milliseconds between queueing a notification and
+                             dispatching it, during which other notifications are collected.
+        :param heightCacheSize: int (default: 1024) The size of the cache of message heights shared by the areas.
+        :param categoryPriorities: dict (default: None) Priorities per category that override the ones in
+                                   QNotificationArea.default_category_priorities.
+        """
+        self.maxVisible = kwargs.pop(u'maxVisible', None)
+        tickInterval = kwargs.pop(u'tickInterval', 16)
+        heightCacheSize = kwargs.pop(u'heightCacheSize', 1024)
+        self.categoryPriorities = dict(QNotificationArea.default_category_priorities)
+        self.categoryPriorities.update(kwargs.pop(u'categoryPriorities', None) or {})
+        super(NotificationCenter, self).__init__(parent, **kwargs)
+
+        # Resources that are shared by all areas created by the center.
+        self.styleEngine = StyleEngine.instance()
+        self.animationDriver = AnimationDriver(parent=self)
+        self.timeouts = TimeoutScheduler(self)
+        self.heightCache = LRUCache(heightCacheSize)
+
+        # Registered areas by key, subscribed areas by topic, and the notifications each area shows.
+        self._keys = {}
+        self._topics = {}
+        self._shown = {}
+        self._visible_total = 0
+        # The slots connected to the signals of every registered area, which are disconnected when the area is
+        # unregistered.
+        self._connections = {}
+
+        # Queued (area, NotificationRecord, priority) entries.
+        self._pending = PriorityScheduler()
+        self._tick = QtCore.QTimer(self)
+        self._tick.setSingleShot(True)
+        self._tick.setInterval(tickInterval)
+        self._tick.timeout.connect(self.__dispatch)
+
+    @classmethod
+    def instance(cls):
+        """ Returns the notification center that is shared by the whole application. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    # Registration:
+    def createArea(self, target_widget, key=None, topics=(), **kwargs):
+        """ Creates a notification area that uses the shared resources of the center, and registers it.
+
+        :param target_widget: QtWidgets.QWidget the widget to project the notifications on.
+        :param key: str (default: None) The key by which notifications are routed to the area.
+        :param topics: iterable of str (default: ()) The topics the area subscribes to.
+        :param kwargs: passed on to QNotificationArea.
+        :return: QNotificationArea
+        """
+        kwargs.setdefault(u'styleEngine', self.styleEngine)
+        kwargs.setdefault(u'animationDriver', self.animationDriver)
+        kwargs.setdefault(u'timeoutScheduler', self.timeouts)
+        kwargs.setdefault(u'heightCache', self.heightCache)
+        # The center queues notifications, so they are only passed to the area when they can be shown.
+        kwargs.setdefault(u'useQueue', False)
+        area = QNotificationArea(target_widget, **kwargs)
+        self.register(area, key, topics)
+        return area
+
+    def register(self, area, key=None, topics=()):
+        """ Registers an area, so notifications can be routed to it. The area is unregistered when it is destroyed.
+
+        :param area: QNotificationArea
+        :param key: str (default: None) The key by which notifications are routed to the area.
+        :param topics: iterable of str (default: ()) The topics the area subscribes to.
+
+        :raises: ValueError if another area has been registered with the same key.
+        """
+        if key is not None:
+            if self._keys.get(key, area) is not area:
+                raise ValueError(u'An area has already been registered with key \"{}\"'.format(key))
+            self._keys[key] = area
+        for topic in topics:
+            self.subscribe(area, topic)
+        if area in self._shown:
+            return
+
+        # Notifications that the area already shows do not count towards the budget.
+        self._shown[area] = set()
+        connections = [
+            (area.notificationShown, lambda notification: self.__shown(area, notification)),
+            (area.notificationRemoved, lambda notification: self.__removed(area, notification)),
+            (area.destroyed, lambda *args: self.unregister(area)),
+        ]
+        for signal, slot in connections:
+            signal.connect(slot)
+        self._connections[area] = connections
+
+    def unregister(self, area):
+        """ Removes an area from the center. Its queued notifications are discarded. """
+        for key in [key for key, registered in self._keys.items() if registered is area]:
+            del self._keys[key]
+        for topic in list(self._topics):
+            self.unsubscribe(area, topic)
+        self._visible_total -= len(self._shown.pop(area, ()))
+        for signal, slot in self._connections.pop(area, ()):
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                # The area is being destroyed.
+                pass
+
+    def subscribe(self, area, topic):
+        """ Lets an area receive the notifications of a topic. """
+        subscribers = self._topics.setdefault(topic, [])
+        if area not in subscribers:
+            subscribers.append(area)
+
+    def unsubscribe(self, area, topic):
+        """ Stops an area from receiving the notifications of a topic. """
+        subscribers = self._topics.get(topic, [])
+        if area in subscribers:
+            subscribers.remove(area)
+        if not subscribers:
+            self._topics.pop(topic, None)
+
+    def area(self, key):
+        """ Returns the area registered with a key, or None. """
+        return self._keys.get(key)
+
+    def areas(self, topic=None):
+        """ Returns the areas that subscribe to a topic, or all registered areas if topic is None. """
+        if topic is None:
+            return list(self._shown)
+        return list(self._topics.get(topic, []))
+
+    # Dispatching:
+    def display(self, message, category, timeout=5000, button_text=None, key=None, topic=None, priority=None):
+        """ Queues a notification for the area with a key, or for all areas that subscribe to a topic.
+
+        :param message: str The message to display.
+        :param category: str The type of notification (see QNotificationArea.display()).
+        :param timeout: int (default: 5000) The duration for which the notification should be shown.
+        :param button_text: str (default: None) The text to display on the closing button.
+        :param key: str (default: None) The key of the area to show the notification in.
+        :param topic: str (default: None) The topic of the notification, if no key is given.
+        :param priority: int (default: None) The priority with which the notification is queued. If not
+                         provided, the priority of its category in categoryPriorities is used.
+        :return: int the number of areas the notification was queued for.
+
+        :raises: ValueError if neither a key nor a topic is given, if no area has been registered with the key, or
+                 if the category is other than one of the expected values.
+        """
+        if key is not None:
+            area = self._keys.get(key)
+            if area is None:
+                raise ValueError(u'No area has been registered with key \"{}\"'.format(key))
+            targets = [area]
+        elif topic is not None:
+            targets = self._topics.get(topic, [])
+        else:
+            raise ValueError(u'A key or a topic should be passed')
+        return self.__queue(targets, message, category, timeout, button_text, priority)
+
+    def broadcast(self, message, category, timeout=5000, button_text=None, priority=None):
+        """ Queues a notification for all registered areas (see display()).
+
+        :return: int the number of areas the notification was queued for.
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        return self.__queue(list(self._shown), message, category, timeout, button_text, priority)
+
+    def visibleCount(self):
+        """ Returns the number of notifications that are shown in all areas together. """
+        return self._visible_total
+
+    def pendingCount(self):
+        """ Returns the number of notifications that are waiting to be dispatched. """
+        return len(self._pending)
+
+    def __queue(self, targets, message, category, timeout, button_text, priority):
+        """ Queues one record, which is shared by all target areas, and schedules a dispatch. """
+        if category not in QNotification.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(QNotification.allowed_categories)))
+        if not targets:
+            return 0
+        if priority is None:
+            priority = self.categoryPriorities.get(category, 0)
+        record = NotificationRecord(message, category, timeout, button_text)
+        for area in targets:
+            self._pending.push((area, record, priority), priority)
+        self.__schedule()
+        return len(targets)
+
+    def __schedule(self):
+        if len(self._pending) and not self._tick.isActive():
+            self._tick.start()
+
+    def __dispatch(self):
+        """ Passes queued notifications to their areas, in order of priority, while the budget allows it. """
+        while self.maxVisible is None or self._visible_total < self.maxVisible:
+            try:
+                area, record, priority = self._pending.pop()
+            except Empty:
+                return
+            # The area might have been unregistered after the notification was queued.
+            if area not in self._shown:
+                continue
+            area.display(record.message, record.category, record.timeout, record.button_text, priority)
+
+    def __shown(self, area, notification):
+        shown = self._shown.get(area)
+        if shown is not None and notification not in shown:
+            shown.add(notification)
+            self._visible_total += 1
+
+    def __removed(self, area, notification):
+        # Notifications that are dropped from the queue of an area were never shown.
+        if notification in self._shown.get(area, ()):
+            self._shown[area].remove(notification)
+            self._visible_total -= 1
+        # Room might have been made for queued notifications.
+        self.__schedule()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+""" Rate limits and overflow policies that protect notification areas against floods of notifications. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from QNotifications.abstractions import *
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# What happens to a notification that arrives while the queue of an area is full:
+# 'drop-newest' discards the new notification, 'drop-oldest' discards the notification that has been queued the
+# longest, 'drop-lowest-category' discards the queued (or new) notification with the lowest priority, and
+# 'collapse' replaces all notifications that do not fit by a single "+N more notifications" summary.
+overflow_policies = (u'drop-newest', u'drop-oldest', u'drop-lowest-category', u'collapse')
+
+
+class TokenBucket(object):
+    """
+    Token bucket that allows bursts of up to *capacity* events, and *rate* events per second on average.
+    Tokens are refilled lazily when they are consumed, so the bucket does not need a timer.
+    """
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity=None):
+        """
+
+        :param rate: float the number of tokens that are added per second.
+        :param capacity: int (default: None) The maximum number of tokens, i.e. the largest burst that is allowed.
+                         If None, the capacity equals the rate (with a minimum of 1).
+
+        :raises: ValueError if rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(u'rate should be larger than 0')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = None
+
+    def consume(self, now=None):
+        """ Takes a token from the bucket, if one is available.
+
+        :param now: float (default: None) The current time of the monotonic clock.
+        :return: bool True if a token was taken, False if the event exceeds the rate limit.
+        """
+        if now is None:
+            now = monotonic()
+        if self.updated is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RateLimiter(object):
+    """ Applies a TokenBucket per category. Categories without a limit are never limited. """
+
+    def __init__(self, limits):
+        """
+
+        :param limits: dict with a rate (float, per second) or a (rate, burst) tuple per category,
+                       e.g. {'info': 5, 'warning': (1, 10)}.
+        """
+        self._buckets = {}
+        for category, limit in limits.items():
+            if isinstance(limit, (tuple, list)):
+                self._buckets[category] = TokenBucket(*limit)
+            else:
+                self._buckets[category] = TokenBucket(limit)
+
+    def allow(self, category, now=None):
+        """ Returns whether a notification of the given category is within the rate limit (and counts it). """
+        bucket = self._buckets.get(category)
+        return bucket is None or bucket.consume(now)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+""" Incremental geometry of the stack of notifications in a notification area. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class StackLayout(object):
+    """
+    Vertical stack of rows with known heights. Instead of asking every row for its size whenever one row is
+    added or removed (as QVBoxLayout does), the stack keeps the height and the top of every row, so adding a row
+    only measures that row, and removing a row only moves the rows below it. All rows are only measured again
+    when the width of the stack changes (see relayout()).
+
+    Keeps count of the full layout passes ('passes'), of the rows that were measured ('measured') and of the
+    rows that were moved without being measured ('moved').
+    """
+
+    def __init__(self, measure, margin=9, spacing=6):
+        """
+
+        :param measure: callable that returns the height of a row at a given width: measure(row, width).
+        :param margin: int (default: 9) The margin around the stack.
+        :param spacing: int (default: 6) The space between two rows.
+        """
+        self.measure = measure
+        self.margin = margin
+        self.spacing = spacing
+        self.width = 0
+        self._rows = []
+        self._heights = {}
+        self._tops = {}
+        self.passes = 0
+        self.measured = 0
+        self.moved = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, row):
+        return row in self._heights
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    @property
+    def rowWidth(self):
+        """ The width of the rows. """
+        return max(0, self.width - 2 * self.margin)
+
+    @property
+    def height(self):
+        """ The height of the stack, including its margins (0 if it is empty). """
+        if not self._rows:
+            return 0
+        last = self._rows[-1]
+        return self._tops[last] + self._heights[last] + self.margin
+
+    def geometry(self, row):
+        """ Returns the (x, y, width, height) of a row. """
+        return self.margin, self._tops[row], self.rowWidth, self._heights[row]
+
+    def rowAt(self, y):
+        """ Returns the row at a vertical position, or None if there is none (e.g. in the space between rows).
+        The rows are sorted by their top, so they are searched by bisection. """
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._tops[self._rows[middle]] <= y:
+                low = middle + 1
+            else:
+                high = middle
+        if not low:
+            return None
+        row = self._rows[low - 1]
+        return row if y < self._tops[row] + self._heights[row] else None
+
+    def append(self, row):
+        """ Adds a row at the bottom of the stack, and measures it.
+
+        :return: tuple (x, y, width, height) the geometry of the row.
+        """
+        if self._rows:
+            last = self._rows[-1]
+            top = self._tops[last] + self._heights[last] + self.spacing
+        else:
+            top = self.margin
+        self._rows.append(row)
+        self._tops[row] = top
+        self._heights[row] = self.__measure(row)
+        return self.geometry(row)
+
+    def remove(self, row):
+        """ Removes a row, and moves the rows below it up.
+
+        :return: list of (row, (x, y, width, height)) for the rows that were moved.
+        """
+        index = self._rows.index(row)
+        del self._rows[index]
+        del self._tops[row]
+        shift = self._heights.pop(row) + self.spacing
+        return self.__shift(index, -shift)
+
+    def update(self, row):
+        """ Measures a row again (e.g. after its text changed), and moves the rows below it if its height changed.
+
+        :return: list of (row, (x, y, width, height)) for the rows whose geometry changed, including the row
+                 itself, which is empty if its height did not change.
+        """
+        height = self.__measure(row)
+        shift = height - self._heights[row]
+        if not shift:
+            return []
+        self._heights[row] = height
+        return [(row, self.geometry(row))] + self.__shift(self._rows.index(row) + 1, shift)
+
+    def relayout(self, width):
+        """ Measures all rows at a new width.
+
+        :return: list of (row, (x, y, width, height)) for all rows.
+        """
+        self.width = width
+        self.passes += 1
+        rows = list(self._rows)
+        del self._rows[:]
+        self._tops.clear()
+        self._heights.clear()
+        return [(row, self.append(row)) for row in rows]
+
+    def __measure(self, row):
+        self.measured += 1
+        return self.measure(row, self.rowWidth)
+
+    def __shift(self, start, shift):
+        moved = []
+        for row in self._rows[start:]:
+            self._tops[row] += shift
+            moved.append((row, self.geometry(row)))
+        self.moved += len(moved)
+        return moved
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+Durable history of the notifications that have been removed from notification areas.
+
+NotificationHistory keeps the most recent records in a fixed-size ring buffer, and hands them to a background
+thread that appends them to a HistoryLog: a directory of memory-mapped segment files of a fixed size. Records
+are compact binary structures::
+
+    size (uint32) | timestamp (float64) | category (uint8) | reason (uint8) | reserved (uint16) |
+    message (utf-8) | size (uint32)
+
+The size at the end of every record allows the log to be read backwards, so the most recent records can be
+read without scanning the log. The size at the start of a record is written last, so a record that was only
+partly written (e.g. when the application crashed) reads as the end of the segment.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from QNotifications.abstractions import *
+from QNotifications.records import HistoryRecord
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# The categories and dismiss reasons are stored as their index in these tables.
+categories = (u'primary', u'success', u'info', u'warning', u'danger', u'space-grey')
+reasons = (None, u'timeout', u'user', u'api', u'preempted', u'overflow', u'rate_limited',
+           u'expired')
+
+_MAGIC = b'QNHLOG1\x00'
+_HEADER = struct.Struct(str('<IdBBH'))
+_FOOTER = struct.Struct(str('<I'))
+_OVERHEAD = _HEADER.size + _FOOTER.size
+_SUFFIX = u'.qnh'
+
+
+class _Segment(object):
+    """ One memory-mapped segment file of a HistoryLog. """
+
+    def __init__(self, path, size, create=False, writable=False):
+        """
+
+        :param path: str the path of the segment file.
+        :param size: int the size of new segment files in bytes.
+        :param create: bool (default: False) Whether to create a new (empty) segment.
+        :param writable: bool (default: False) Whether records will be appended to the segment.
+        """
+        self.path = path
+        if create:
+            with io.open(path, u'wb') as segment_file:
+                segment_file.write(_MAGIC)
+                segment_file.truncate(size)
+        with io.open(path, u'r+b' if writable else u'rb') as segment_file:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self.map = mmap.mmap(segment_file.fileno(), 0, access=access)
+        if self.map[:len(_MAGIC)] != _MAGIC:
+            self.map.close()
+            raise ValueError(u'{} is not a history segment'.format(path))
+        self.size = len(self.map)
+        self.end = self.__find_end()
+
+    def __find_end(self):
+        """ Returns the offset after the last complete record, by skipping from header to header. """
+        position = len(_MAGIC)
+        while position + _OVERHEAD <= self.size:
+            size = _HEADER.unpack_from(self.map, position)[0]
+            if size < _OVERHEAD or position + size > self.size:
+                break
+            position += size
+        return position
+
+    @property
+    def firstTimestamp(self):
+        """ The timestamp of the first record, or None if the segment is empty. """
+        if self.end == len(_MAGIC):
+            return None
+        return _HEADER.unpack_from(self.map, len(_MAGIC))[1]
+
+    def fits(self, data_size):
+        """ Returns whether a record with a message of *data_size* bytes fits in the segment. """
+        return self.end + _OVERHEAD + data_size <= self.size
+
+    def append(self, timestamp, category, reason, data):
+        """ Appends a record. The caller checks that it fits. """
+        position = self.end
+        size = _OVERHEAD + len(data)
+        # Write everything but the leading size first, so that readers never see a partial record.
+        _HEADER.pack_into(self.map, position, 0, timestamp, category, reason, 0)
+        self.map[position + _HEADER.size:position + _HEADER.size + len(data)] = data
+        _FOOTER.pack_into(self.map, position + size - _FOOTER.size, size)
+        _FOOTER.pack_into(self.map, position, size)
+        self.end = position + size
+
+    def read(self, position):
+        """ Returns the record at an offset and the size of the record. """
+        size, timestamp, category, reason, _ = _HEADER.unpack_from(self.map, position)
+        data = self.map[position + _HEADER.size:position + size - _FOOTER.size]
+        record = HistoryRecord(timestamp, categories[category] if category < len(categories) else None,
+                               data.decode(u'utf-8', u'replace'),
+                               reasons[reason] if reason < len(reasons) else None)
+        return record, size
+
+    def forward(self, start_time=None):
+        """ Yields the records in the order in which they were appended, from the first one at or after
+        start_time. Only the headers of skipped records are read. """
+        position = len(_MAGIC)
+        while position < self.end:
+            size, timestamp = _HEADER.unpack_from(self.map, position)[:2]
+            if start_time is None or timestamp >= start_time:
+                yield self.read(position)[0]
+            position += size
+
+    def backward(self):
+        """ Yields the records from the most recent one to the first one. """
+        position = self.end
+        while position > len(_MAGIC):
+            size = _FOOTER.unpack_from(self.map, position - _FOOTER.size)[0]
+            position -= size
+            yield self.read(position)[0]
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+
+
+class HistoryLog(object):
+    """
+    Append-only log of HistoryRecords, stored in memory-mapped segment files of a fixed size in a directory.
+    When a segment is full, a new one is started, and the oldest segments are deleted once there are more
+    than max_segments. Existing segments are mapped when the log is opened, so the history of previous
+    sessions is available without parsing it.
+
+    The log is not thread-safe; NotificationHistory serializes access to it.
+    """
+
+    def __init__(self, directory, segment_size=1 << 20, max_segments=16):
+        """
+
+        :param directory: str the directory of the segment files, which is created if it does not exist.
+        :param segment_size: int (default: 1 MiB) The size of a segment file in bytes.
+        :param max_segments: int (default: 16) The maximum number of segment files that are kept.
+        """
+        if segment_size < len(_MAGIC) + _OVERHEAD + 1:
+            raise ValueError(u'segment_size is too small')
+        self.directory = directory
+        self.segmentSize = segment_size
+        self.maxSegments = max(1, max_segments)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        names = sorted(name for name in os.listdir(directory) if name.endswith(_SUFFIX))
+        self._segments = [_Segment(os.path.join(directory, name), segment_size) for name in names[:-1]]
+        if names:
+            self._segments.append(_Segment(os.path.join(directory, names[-1]), segment_size, writable=True))
+            self._sequence = int(names[-1][:-len(_SUFFIX)])
+        else:
+            self._sequence = 0
+            self.__rotate()
+
+    def __rotate(self):
+        """ Starts a new segment, and deletes the oldest segments if there are more than maxSegments. """
+        if self._segments:
+            # Re-map the full segment read-only.
+            full = self._segments.pop()
+            full.close()
+            self._segments.append(_Segment(full.path, self.segmentSize))
+        self._sequence += 1
+        path = os.path.join(self.directory, u'{:08d}{}'.format(self._sequence, _SUFFIX))
+        self._segments.append(_Segment(path, self.segmentSize, create=True, writable=True))
+        while len(self._segments) > self.maxSegments:
+            oldest = self._segments.pop(0)
+            oldest.close()
+            os.remove(oldest.path)
+
+    def append(self, record):
+        """ Appends a HistoryRecord to the log. Messages that do not fit in a segment are truncated. """
+        data = safe_encode(safe_decode(record.message))
+        data = data[:self.segmentSize - len(_MAGIC) - _OVERHEAD]
+        try:
+            category = categories.index(record.category)
+        except ValueError:
+            category = 255
+        try:
+            reason = reasons.index(record.reason)
+        except ValueError:
+            reason = 0
+        if not self._segments[-1].fits(len(data)):
+            self.__rotate()
+        self._segments[-1].append(record.timestamp, category, reason, data)
+
+    def tail(self, count):
+        """ Returns the *count* most recent records, oldest first. """
+        records = []
+        for segment in reversed(self._segments):
+            for record in segment.backward():
+                if len(records) >= count:
+                    break
+                records.append(record)
+            if len(records) >= count:
+                break
+        records.reverse()
+        return records
+
+    def range(self, start_time, end_time=None):
+        """ Returns the records with a timestamp from start_time up to (but not including) end_time.
+
+        :param start_time: float the start of the range (as returned by time.time()).
+        :param end_time: float (default: None) the end of the range, or None for all records after start_time.
+        :return: list of HistoryRecord, oldest first.
+        """
+        # Skip the segments that only contain records before start_time.
+        first = 0
+        for index, segment in enumerate(self._segments):
+            timestamp = segment.firstTimestamp
+            if timestamp is not None and timestamp <= start_time:
+                first = index
+
+        records = []
+        for segment in self._segments[first:]:
+            for record in segment.forward(start_time):
+                if end_time is not None and record.timestamp >= end_time:
+                    return records
+                records.append(record)
+        return records
+
+    def __iter__(self):
+        for segment in self._segments:
+            for record in segment.forward():
+                yield record
+
+    def flush(self):
+        """ Writes the current segment to disk (if the log has not been closed). """
+        if self._segments:
+            self._segments[-1].flush()
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+
+class NotificationHistory(object):
+    """
+    History of the notifications that have been removed from notification areas. The most recent records are
+    kept in a ring buffer of a fixed size. If a directory is given, all records are also appended to a
+    HistoryLog in that directory by a background thread, so recording a notification never waits for disk I/O.
+    """
+
+    def __init__(self, directory=None, capacity=1000, segment_size=1 << 20, max_segments=16, flush_interval=1.0):
+        """
+
+        :param directory: str (default: None) The directory of the log. If None, only the ring buffer is kept.
+        :param capacity: int (default: 1000) The number of records in the ring buffer.
+        :param segment_size: int (default: 1 MiB) The size of the segment files of the log in bytes.
+        :param max_segments: int (default: 16) The maximum number of segment files that are kept.
+        :param flush_interval: float (default: 1.0) The time in seconds after which written records are flushed
+                               to disk.
+        """
+        self.flushInterval = flush_interval
+        self._ring = deque(maxlen=capacity)
+        self.log = None
+        self._closed = False
+        if directory is None:
+            return
+
+        self.log = HistoryLog(directory, segment_size, max_segments)
+        # Fill the ring buffer with the most recent records of previous sessions.
+        self._ring.extend(self.log.tail(capacity))
+
+        # Records waiting for the writer thread. Appending to a deque is atomic, so record() takes no locks.
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._writer = threading.Thread(target=self.__write_loop, name=u'QNotificationsHistoryWriter')
+        self._writer.daemon = True
+        self._writer.start()
+
+    def __len__(self):
+        return len(self._ring)
+
+    def record(self, message, category, reason=None, timestamp=None):
+        """ Adds a notification to the history. Safe to call from any thread; never blocks.
+
+        :param message: str the message of the notification.
+        :param category: str the type of notification.
+        :param reason: str (default: None) how the notification was dismissed.
+        :param timestamp: float (default: None) when the notification was dismissed. Defaults to now.
+        """
+        # Notifications removed while the application shuts down are no longer recorded.
+        if self._closed:
+            return
+        record = HistoryRecord(time.time() if timestamp is None else timestamp, category, message, reason)
+        self._ring.append(record)
+        if self.log is not None:
+            self._pending.append(record)
+            self._wake.set()
+
+    def recent(self, count=None):
+        """ Returns the (at most *count*) most recent records from the ring buffer, oldest first. """
+        records = list(self._ring)
+        return records if count is None else records[max(0, len(records) - count):]
+
+    def tail(self, count):
+        """ Returns the *count* most recent records, oldest first. Records that are no longer in the ring
+        buffer are read from the log. """
+        if count <= len(self._ring) or self.log is None:
+            return self.recent(count)
+        with self._write_lock:
+            self.__write_pending()
+            return self.log.tail(count)
+
+    def range(self, start_time, end_time=None):
+        """ Returns the records with a timestamp from start_time up to (but not including) end_time, oldest first.
+
+        :param start_time: float (as returned by time.time())
+        :param end_time: float (default: None)
+        """
+        if self.log is None:
+            return [record for record in self._ring
+                    if record.timestamp >= start_time and (end_time is None or record.timestamp < end_time)]
+        with self._write_lock:
+            self.__write_pending()
+            return self.log.range(start_time, end_time)
+
+    def flush(self):
+        """ Writes all pending records to the log and flushes it to disk. Does nothing once it is closed. """
+        if self.log is None or self._closed:
+            return
+        with self._write_lock:
+            self.__write_pending()
+            self.log.flush()
+
+    def close(self):
+        """ Writes all pending records, stops the writer thread and closes the log. """
+        if self.log is None or self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        with self._write_lock:
+            self.__write_pending()
+            self.log.close()
+
+    def __write_pending(self):
+        """ Appends the pending records to the log (with the write lock held). """
+        while True:
+            try:
+                record = self._pending.popleft()
+            except IndexError:
+                return
+            self.log.append(record)
+
+    def __write_loop(self):
+        """ Body of the writer thread. """
+        last_flush = monotonic()
+        while not self._closed:
+            self._wake.wait(self.flushInterval)
+            self._wake.clear()
+            with self._write_lock:
+                if self._closed:
+                    return
+                self.__write_pending()
+                if monotonic() - last_flush >= self.flushInterval:
+                    self.log.flush()
+                    last_flush = monotonic()
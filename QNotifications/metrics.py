@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+""" Operational metrics of notification areas. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import io
+import json
+import os
+
+from QNotifications.abstractions import *
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# Upper bounds (in seconds) of the buckets of the histograms of time spent in display() and remove().
+call_time_buckets = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+# Upper bounds (in seconds) of the buckets of the histogram of time spent in the queue.
+queue_time_buckets = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+class Histogram(object):
+    """ Histogram with fixed buckets, which keeps the count per bucket and the sum of all observations. """
+
+    def __init__(self, buckets):
+        """
+
+        :param buckets: sequence of float the upper bounds of the buckets, in increasing order. Values larger
+                        than the last bound are counted in an additional +Inf bucket.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """ Adds an observation. """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        """ Returns the histogram as a dict with the cumulative count per upper bound, the sum and the count. """
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets + (u'+Inf',), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return {u'buckets': cumulative, u'sum': self.sum, u'count': self.count}
+
+
+class NotificationMetrics(object):
+    """
+    Counters, gauges and histograms that describe what a notification area is doing. Snapshots can be
+    exported as JSON or in the Prometheus text format, to a file or to a callback.
+    """
+    counter_names = (u'displayed', u'coalesced', u'updated', u'queued', u'dequeued', u'removed_timeout',
+                     u'removed_user', u'removed_other', u'dropped_overflow', u'dropped_rate_limited',
+                     u'dropped_expired')
+
+    def __init__(self, export_to=None, export_format=u'json', labels=None):
+        """
+
+        :param export_to: str or callable (default: None) The file to which export() writes snapshots, or a
+                          callable that export() calls with the exported text.
+        :param export_format: str (default: 'json') The format of exported snapshots: 'json' or 'prometheus'.
+        :param labels: dict (default: None) Labels that are added to all metrics in the Prometheus format
+                       (e.g. {'area': 'editor'}).
+
+        :raises: ValueError if export_format is invalid.
+        """
+        if export_format not in (u'json', u'prometheus'):
+            raise ValueError(u'Invalid export format')
+        self.exportTo = export_to
+        self.exportFormat = export_format
+        self.labels = dict(labels or {})
+
+        self.counters = dict((name, 0) for name in self.counter_names)
+        self.peakVisible = 0
+        self.queueTime = Histogram(queue_time_buckets)
+        self.displayTime = Histogram(call_time_buckets)
+        self.removeTime = Histogram(call_time_buckets)
+        # Gauges are read when a snapshot is taken: name -> callable returning the current value.
+        self._gauges = {}
+
+    def increment(self, name, amount=1):
+        """ Increments a counter. """
+        self.counters[name] += amount
+
+    def registerGauge(self, name, source):
+        """ Registers a gauge, whose value is obtained by calling *source* when a snapshot is taken. """
+        self._gauges[name] = source
+
+    def observeVisible(self, count):
+        """ Updates the peak number of visible notifications. """
+        if count > self.peakVisible:
+            self.peakVisible = count
+
+    def snapshot(self):
+        """ Returns the current values of all metrics as a dict. """
+        gauges = dict((name, source()) for name, source in self._gauges.items())
+        gauges[u'peak_visible'] = self.peakVisible
+        return {
+            u'counters': dict(self.counters),
+            u'gauges': gauges,
+            u'histograms': {
+                u'queue_seconds': self.queueTime.snapshot(),
+                u'display_seconds': self.displayTime.snapshot(),
+                u'remove_seconds': self.removeTime.snapshot(),
+            },
+        }
+
+    def toJSON(self):
+        """ Returns a snapshot in JSON format. """
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def toPrometheus(self, prefix=u'qnotifications'):
+        """ Returns a snapshot in the Prometheus text exposition format.
+
+        :param prefix: str (default: 'qnotifications') The prefix of the metric names.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot[u'counters'].items()):
+            metric = u'{}_{}_total'.format(prefix, name)
+            lines.append(u'# TYPE {} counter'.format(metric))
+            lines.append(u'{}{} {}'.format(metric, self.__labels(), value))
+        for name, value in sorted(snapshot[u'gauges'].items()):
+            metric = u'{}_{}'.format(prefix, name)
+            lines.append(u'# TYPE {} gauge'.format(metric))
+            lines.append(u'{}{} {}'.format(metric, self.__labels(), value))
+        for name, histogram in sorted(snapshot[u'histograms'].items()):
+            metric = u'{}_{}'.format(prefix, name)
+            lines.append(u'# TYPE {} histogram'.format(metric))
+            for bound, count in histogram[u'buckets']:
+                lines.append(u'{}_bucket{} {}'.format(metric, self.__labels(le=bound), count))
+            lines.append(u'{}_sum{} {!r}'.format(metric, self.__labels(), histogram[u'sum']))
+            lines.append(u'{}_count{} {}'.format(metric, self.__labels(), histogram[u'count']))
+        return u'\n'.join(lines) + u'\n'
+
+    def __labels(self, **extra):
+        """ Formats the labels of a Prometheus sample. """
+        labels = dict(self.labels)
+        labels.update((key, safe_decode(value)) for key, value in extra.items())
+        if not labels:
+            return u''
+        return u'{' + u','.join(u'{}="{}"'.format(key, labels[key]) for key in sorted(labels)) + u'}'
+
+    def export(self):
+        """ Writes a snapshot to exportTo in exportFormat. Does nothing if exportTo is not set. """
+        if self.exportTo is None:
+            return
+        text = self.toPrometheus() if self.exportFormat == u'prometheus' else self.toJSON()
+        if callable(self.exportTo):
+            self.exportTo(text)
+            return
+        # Write to a temporary file first, so readers never see a partially written file.
+        temporary = self.exportTo + u'.tmp'
+        with io.open(temporary, u'w', encoding=u'utf-8') as output:
+            output.write(text)
+        # os.replace() also overwrites existing files on Windows, but is not available in Python 2.
+        getattr(os, u'replace', os.rename)(temporary, self.exportTo)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+""" Rendering of notifications without a widget per notification, for the 'painter' render mode. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from QNotifications.animation import AnimationDriver
+from QNotifications.qt import QtCore, QtGui
+from QNotifications.styling import StyleEngine, category_colors
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+def _per_mille(progress):
+    """ The drawn value of a progress between 0 and 1 (or None), in steps of 0.1%. """
+    if progress is None:
+        return None
+    return int(round(max(0.0, min(1.0, progress)) * 1000))
+
+
+class PaintedNotification(object):
+    """
+    A notification that is drawn by its QNotificationArea, instead of being a widget itself. It offers the
+    same interface as QNotification as far as the notification area is concerned.
+    """
+    allowed_categories = list(category_colors)
+
+    def __init__(self, area, message, category, timeout=None, button_text=None):
+        """
+
+        :param area: QNotificationArea the area that draws the notification.
+        :param message: str the message to show.
+        :param category: str the type of notification.
+        :param timeout: int (default: None)
+        :param button_text: str (default: None)
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        self.area = area
+        self.isBeingRemoved = False
+        self.priority = 0
+        self.dismissReason = None
+        self.queuedAt = None
+        self.coalesceKey = None
+        self.opacity = 1.0
+        self.offsetX = 0
+        self.offsetY = 0
+        self.key = None
+        self.progress = None
+        self.record = None
+        self.visible = False
+        self._animator = None
+        # Cached text layout: ((display text, text width), QStaticText, height)
+        self._text_layout = None
+        self.reset(message, category, timeout, button_text)
+
+    def reset(self, message, category, timeout=None, button_text=None):
+        """ Re-arms the notification with new contents (see QNotification.reset()).
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if category not in self.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(self.allowed_categories)))
+        self.category = category
+        self.message = message
+        self.timeout = timeout
+        self.button_text = button_text
+        self.repeatCount = 1
+        self.dismissReason = None
+        self.queuedAt = None
+        if self._animator is not None:
+            self._animator.stop(self, u'opacity')
+        self.opacity = 1.0
+        self.offsetX = 0
+        self.offsetY = 0
+        self.key = None
+        self.progress = None
+        self.record = None
+        self.visible = False
+        self.isBeingRemoved = False
+
+    @property
+    def displayText(self):
+        """ The message, followed by a repeat counter if the notification has been displayed more than once. """
+        if self.repeatCount > 1:
+            return u'{} \u00d7{}'.format(self.message, self.repeatCount)
+        return self.message
+
+    @property
+    def buttonText(self):
+        """ The text of the close button. """
+        if self.button_text is None or self.button_text == u'':
+            return u"\u2715"
+        return self.button_text
+
+    def setRepeatCount(self, count):
+        """ Sets the number of times this notification has been displayed. """
+        self.repeatCount = count
+        # The height of the notification might have changed.
+        self.area._update_row(self)
+        self.area.update()
+
+    def setMessage(self, message):
+        """ Replaces the message of the notification, also while it is shown. """
+        self.message = message
+        self.area._update_row(self)
+        self.area.update()
+
+    def setCategory(self, category):
+        """ Changes the category of the notification, also while it is shown.
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if category not in self.allowed_categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(
+                category, str(self.allowed_categories)))
+        if category != self.category:
+            self.category = category
+            self.area.update()
+
+    def setProgress(self, progress):
+        """ Shows the progress of a task in a bar along the bottom edge of the notification (see
+        QNotification.setProgress()). The area is only repainted if the drawn bar changes. """
+        drawn = _per_mille(self.progress)
+        self.progress = progress
+        if _per_mille(progress) != drawn:
+            self.area.update()
+
+    def isVisible(self):
+        return self.visible
+
+    def display(self):
+        """ Displays the notification. """
+        self.visible = True
+        self.area.update()
+
+    def hide(self):
+        self.visible = False
+
+    def close(self):
+        """ Closes the notification. """
+        self.visible = False
+        self._text_layout = None
+
+    def fadeIn(self, duration, driver=None):
+        """ Fades in the notification (see QNotification.fadeIn()). """
+        if type(duration) != int:
+            raise TypeError("duration should be an integer")
+        self._animator = driver if driver is not None else AnimationDriver.instance()
+        self._animator.animate(self, u'opacity', self.__set_opacity, 0.0, 1.0, duration)
+        self.display()
+
+    def fadeOut(self, final_callback, duration, driver=None):
+        """ Fades out the notification (see QNotification.fadeOut()). """
+        if not callable(final_callback):
+            raise TypeError("finishedCallback should be a callable")
+        if type(duration) != int:
+            raise TypeError("duration should be an integer")
+        self.isBeingRemoved = True
+        self._animator = driver if driver is not None else AnimationDriver.instance()
+        self._animator.animate(self, u'opacity', self.__set_opacity, 1.0, 0.0, duration, final_callback)
+
+    def __set_opacity(self, value):
+        self.opacity = value
+        self.area.update()
+
+
+class NotificationPainter(object):
+    """
+    Measures and draws the PaintedNotifications of a notification area. The area keeps the geometry of the rows
+    in a StackLayout, which only measures the rows that are added or whose text changes. Text layouts are cached
+    per notification and are only recomputed when the text or the available width changes.
+    """
+
+    def __init__(self, engine=None, margin=9, spacing=6, padding=10):
+        """
+
+        :param engine: StyleEngine (default: None) The engine that provides the fonts, colors and backgrounds.
+                       If None, the shared engine is used.
+        :param margin: int (default: 9) The margin around the stack of notifications.
+        :param spacing: int (default: 6) The space between two notifications.
+        :param padding: int (default: 10) The space between the border of a notification and its contents.
+        """
+        self.engine = engine if engine is not None else StyleEngine.instance()
+        self.font = self.engine.font
+        self.metrics = QtGui.QFontMetrics(self.font)
+        # QFontMetrics.width() was superseded by horizontalAdvance() in Qt 5.11 and is gone in Qt 6.
+        self.text_width = getattr(self.metrics, u'horizontalAdvance', None) or self.metrics.width
+        self.margin = margin
+        self.spacing = spacing
+        self.padding = padding
+
+    def text_layout(self, notification, width):
+        """ Returns the (cached) QStaticText and height of a notification's message at the given text width. """
+        key = (notification.displayText, width)
+        cached = notification._text_layout
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        static_text = QtGui.QStaticText(notification.displayText)
+        static_text.setTextFormat(QtCore.Qt.AutoText)
+        static_text.setTextWidth(width)
+        static_text.prepare(QtGui.QTransform(), self.font)
+        height = int(static_text.size().height())
+        notification._text_layout = (key, static_text, height)
+        return static_text, height
+
+    def __text_width(self, notification, row_width):
+        """ The width available to the message of a notification in a row of the given width. """
+        return max(1, row_width - 3 * self.padding - self.text_width(notification.buttonText))
+
+    def measure(self, notification, row_width):
+        """ Returns the height of the row of a notification at the given width (the measure of a StackLayout). """
+        _, text_height = self.text_layout(notification, self.__text_width(notification, row_width))
+        return max(text_height, self.metrics.height()) + 2 * self.padding
+
+    def rects(self, notification, geometry):
+        """ Returns the rectangles of the row, the message and the close button of a notification.
+
+        :param notification: PaintedNotification
+        :param geometry: tuple (x, y, width, height) of the row, as kept by the StackLayout.
+        :return: tuple of three QtCore.QRects.
+        """
+        row = QtCore.QRect(*geometry)
+        text_width = self.__text_width(notification, row.width())
+        _, text_height = self.text_layout(notification, text_width)
+        text = QtCore.QRect(row.left() + self.padding, row.top() + self.padding, text_width, text_height)
+        button_width = self.text_width(notification.buttonText)
+        button = QtCore.QRect(row.right() - self.padding - button_width, row.top(),
+                              button_width + self.padding, row.height())
+        return row, text, button
+
+    def paint(self, painter, stack, exposed):
+        """ Draws the rows of a StackLayout that intersect with the exposed rectangle, displaced by the offsets of
+        their notifications.
+
+        :param painter: QtGui.QPainter
+        :param stack: StackLayout of PaintedNotifications.
+        :param exposed: QtCore.QRect the part of the area that needs to be redrawn.
+        """
+        painter.setFont(self.font)
+        for notification in stack:
+            if not notification.visible:
+                continue
+            x, y, width, height = stack.geometry(notification)
+            x += int(notification.offsetX)
+            y += int(notification.offsetY)
+            # Rows outside of the exposed rectangle are skipped before anything is computed for them.
+            if y > exposed.bottom() or y + height <= exposed.top():
+                continue
+            row, text, button = self.rects(notification, (x, y, width, height))
+            if not row.intersects(exposed):
+                continue
+            painter.setOpacity(notification.opacity)
+            painter.drawPixmap(row.topLeft(),
+                               self.engine.background(notification.category, row.width(), row.height()))
+
+            painter.setPen(self.engine.textColor)
+            static_text, _ = self.text_layout(notification, text.width())
+            painter.drawStaticText(text.topLeft(), static_text)
+
+            painter.setFont(self.engine.button_font(notification.button_text not in (None, u'')))
+            painter.drawText(button, QtCore.Qt.AlignCenter, notification.buttonText)
+            painter.setFont(self.font)
+
+            if notification.progress is not None:
+                progress = max(0.0, min(1.0, notification.progress))
+                painter.fillRect(row.left(), row.bottom() - 3, int(row.width() * progress), 4, self.engine.textColor)
+        painter.setOpacity(1.0)
+
+    def hit_test(self, stack, pos):
+        """ Returns the notification at a position, and whether the position is on its close button.
+
+        :param stack: StackLayout of PaintedNotifications.
+        :param pos: QtCore.QPoint
+        :return: tuple (PaintedNotification or None, bool)
+        """
+        notification = stack.rowAt(pos.y())
+        if notification is None:
+            return None, False
+        row, _, button = self.rects(notification, stack.geometry(notification))
+        if not row.contains(pos):
+            return None, False
+        return notification, button.contains(pos)
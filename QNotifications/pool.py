@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+""" Recycling of notification widgets for the QNotifications module. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import deque
+
+from QNotifications.abstractions import monotonic
+from QNotifications.qt import QtCore, Slot
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class NotificationPool(QtCore.QObject):
+    """
+    Pool of QNotification widgets that have been removed from a notification area and that can be re-armed
+    with a new message instead of building a fresh widget (with its layouts, label, button and effects).
+
+    Idle widgets are kept up to *max_size* (the high-water mark). Widgets released while the pool is full
+    are destroyed, and widgets that have not been reused for *idle_timeout* milliseconds are trimmed.
+
+    :inherits: QtCore.QObject
+    """
+
+    def __init__(self, factory, max_size=8, idle_timeout=30000, parent=None):
+        """
+
+        :param factory: callable(message, category, timeout, button_text) that creates a new QNotification
+                        when no idle widget is available.
+        :param max_size: int (default: 8) The maximum number of idle widgets to keep. 0 disables pooling.
+        :param idle_timeout: int (default: 30000) The time in milliseconds after which idle widgets are destroyed.
+                             If None or 0, idle widgets are kept until the pool is destroyed.
+        :param parent: QtCore.QObject (default: None)
+
+        :raises: TypeError if factory is not callable.
+        :raises: ValueError if max_size is negative.
+        """
+        super(NotificationPool, self).__init__(parent)
+        if not callable(factory):
+            raise TypeError(u'factory should be a callable')
+        if max_size < 0:
+            raise ValueError(u'max_size should be 0 or larger')
+
+        self.factory = factory
+        self.maxSize = max_size
+        self.idleTimeout = idle_timeout
+
+        # Idle widgets with the time at which they were released, oldest first.
+        self._idle = deque()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._trim_timer = QtCore.QTimer(self)
+        self._trim_timer.timeout.connect(self.trim)
+        if idle_timeout:
+            self._trim_timer.setInterval(idle_timeout)
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self, message, category, timeout=None, button_text=None):
+        """ Returns a notification armed with the given contents, reusing an idle widget if one is available.
+
+        :param message: str the message to show.
+        :param category: str the category of the notification.
+        :param timeout: int (default: None)
+        :param button_text: str (default: None)
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if not self._idle:
+            self.misses += 1
+            return self.factory(message, category, timeout, button_text)
+
+        # Reuse the most recently released widget, so the oldest ones can be trimmed.
+        notification, released_at = self._idle.pop()
+        try:
+            notification.reset(message, category, timeout, button_text)
+        except Exception:
+            self._idle.append((notification, released_at))
+            raise
+        self.hits += 1
+        if not self._idle:
+            self._trim_timer.stop()
+        return notification
+
+    def release(self, notification):
+        """ Returns a notification that is no longer displayed to the pool.
+
+        :param notification: QNotification the notification to recycle.
+        """
+        if len(self._idle) >= self.maxSize:
+            notification.close()
+            return
+
+        notification.hide()
+        self._idle.append((notification, monotonic()))
+        if self.idleTimeout and not self._trim_timer.isActive():
+            self._trim_timer.start()
+
+    @Slot()
+    def trim(self):
+        """ Destroys widgets that have been idle for longer than idleTimeout. """
+        if self.idleTimeout:
+            threshold = monotonic() - self.idleTimeout / 1000.0
+            while self._idle and self._idle[0][1] <= threshold:
+                notification, _ = self._idle.popleft()
+                notification.close()
+        if not self._idle:
+            self._trim_timer.stop()
+
+    def clear(self):
+        """ Destroys all idle widgets. """
+        while self._idle:
+            notification, _ = self._idle.popleft()
+            notification.close()
+        self._trim_timer.stop()
+
+    @property
+    def size(self):
+        """ The number of idle widgets currently in the pool. """
+        return len(self._idle)
+
+    @property
+    def hitRate(self):
+        """ The fraction of acquired notifications that were served from the pool. """
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
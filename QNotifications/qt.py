@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Selects the Qt binding that QNotifications uses. The binding is chosen once, when this module is first
+imported: the one named by the QT_API environment variable ('pyqt5', 'pyside2', 'pyqt6' or 'pyqt4') if it is
+set, otherwise a binding that the application has already imported, otherwise the first one of
+the bindings that can be imported.
+
+The rest of the package imports QtCore, QtGui, QtWidgets, Signal and Slot from here. With PyQt4, QtWidgets is
+an alias of QtGui. With PyQt6, the members of scoped enums are also made available on their enclosing classes
+(e.g. QtCore.Qt.AlignCenter), as in the other bindings.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# The supported bindings in order of preference, with the name of their package.
+bindings = [
+    (u'pyqt5', u'PyQt5'),
+    (u'pyside2', u'PySide2'),
+    (u'pyqt6', u'PyQt6'),
+    (u'pyqt4', u'PyQt4'),
+]
+
+
+def _import_binding(api):
+    """ Imports a binding.
+
+    :param api: str the name of the binding.
+    :return: tuple (QtCore, QtGui, QtWidgets, Signal, Slot)
+    :raises: ImportError if the binding is not installed.
+    """
+    if api == u'pyqt5':
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        return QtCore, QtGui, QtWidgets, QtCore.pyqtSignal, QtCore.pyqtSlot
+    if api == u'pyside2':
+        from PySide2 import QtCore, QtGui, QtWidgets
+        return QtCore, QtGui, QtWidgets, QtCore.Signal, QtCore.Slot
+    if api == u'pyqt6':
+        from PyQt6 import QtCore, QtGui, QtWidgets
+        for module in (QtCore, QtGui, QtWidgets):
+            _promote_enums(module)
+        return QtCore, QtGui, QtWidgets, QtCore.pyqtSignal, QtCore.pyqtSlot
+    from PyQt4 import QtCore, QtGui
+    return QtCore, QtGui, QtGui, QtCore.pyqtSignal, QtCore.pyqtSlot
+
+
+def _promote_enums(module):
+    """ Makes the members of the scoped enums of PyQt6 available on the classes that define the enums. """
+    from enum import Enum
+    for class_name in dir(module):
+        cls = getattr(module, class_name)
+        if not isinstance(cls, type):
+            continue
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, type) and issubclass(value, Enum):
+                for member in value:
+                    if member.name not in vars(cls):
+                        setattr(cls, member.name, member)
+
+
+def _select_binding():
+    """ Returns the name of the binding to use (see the module docstring).
+
+    :raises: ValueError if QT_API is set to an unsupported binding.
+    """
+    requested = os.environ.get(u'QT_API')
+    if requested:
+        requested = requested.lower()
+        if requested not in [api for api, _ in bindings]:
+            raise ValueError(u'Unsupported QT_API \"{}\". Should be one of {}'.format(
+                requested, str([api for api, _ in bindings])))
+        return [requested]
+    # Never mix bindings: use the one the application already uses, if any.
+    imported = [api for api, package in bindings if package in sys.modules]
+    return imported[:1] or [api for api, _ in bindings]
+
+
+def _load():
+    errors = []
+    for api in _select_binding():
+        try:
+            return (api,) + _import_binding(api)
+        except ImportError as e:
+            errors.append(u'{}: {}'.format(api, e))
+    raise ImportError(u'No Qt binding could be imported ({})'.format(u'; '.join(errors)))
+
+
+API, QtCore, QtGui, QtWidgets, Signal, Slot = _load()
+
+__all__ = ['API', 'QtCore', 'QtGui', 'QtWidgets', 'Signal', 'Slot']
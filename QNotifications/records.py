@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+""" Lightweight data records used by the QNotifications module. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class NotificationRecord(object):
+    """
+    Compact description of a notification that has not been turned into a widget yet. Records are cheap to
+    create on any thread and are converted into QNotification widgets on the GUI thread.
+    """
+    __slots__ = ('message', 'category', 'timeout', 'button_text')
+
+    def __init__(self, message, category, timeout=5000, button_text=None):
+        """
+
+        :param message: str the message to show.
+        :param category: str the type of notification.
+        :param timeout: int (default: 5000)
+        :param button_text: str (default: None)
+        """
+        self.message = message
+        self.category = category
+        self.timeout = timeout
+        self.button_text = button_text
+
+    def __repr__(self):
+        return u'NotificationRecord({!r}, {!r}, {!r}, {!r})'.format(
+            self.message, self.category, self.timeout, self.button_text)
+
+
+def message_text(message):
+    """ Returns the text of a message, which can be a callable that formats the text when it is needed. """
+    if callable(message):
+        return message()
+    return message
+
+
+class QueuedNotification(object):
+    """
+    Record of a notification that has been displayed by a notification area. It is the handle of the
+    notification: it is returned by QNotificationArea.display(), and can be passed to QNotificationArea.remove()
+    and isShown(), also after the notification has been removed and its widget has been reused.
+
+    While the notification waits in the queue, no widget is built for it, and the record stands for it (e.g. it
+    is emitted by notificationRemoved if it is dropped from the queue). While the notification is shown, its
+    widget is *notification*.
+
+    The message can be a callable, which is only called when the notification is shown (or when the text is
+    needed otherwise, e.g. because the notification is dropped and recorded in the history).
+    """
+    __slots__ = ('message', 'category', 'timeout', 'button_text', 'priority', 'queuedAt', 'key', 'coalesceKey',
+                 'repeatCount', 'progress', 'dismissReason', 'isBeingRemoved', 'notification')
+
+    def __init__(self, message, category, timeout=5000, button_text=None, priority=0):
+        """
+
+        :param message: str or callable the message to show, or a callable that returns it.
+        :param category: str the type of notification.
+        :param timeout: int (default: 5000)
+        :param button_text: str (default: None)
+        :param priority: int (default: 0) The priority with which the notification is queued.
+        """
+        self.message = message
+        self.category = category
+        self.timeout = timeout
+        self.button_text = button_text
+        self.priority = priority
+        self.queuedAt = None
+        self.key = None
+        self.coalesceKey = None
+        self.repeatCount = 1
+        self.progress = None
+        self.dismissReason = None
+        self.isBeingRemoved = False
+        # The notification widget while the notification is shown.
+        self.notification = None
+
+    def __repr__(self):
+        return u'QueuedNotification({!r}, {!r}, {!r}, {!r})'.format(
+            self.message, self.category, self.timeout, self.button_text)
+
+    # The interface with which a notification area changes notifications, whether they are shown or queued:
+    def setMessage(self, message):
+        self.message = message
+
+    def setCategory(self, category):
+        self.category = category
+
+    def setProgress(self, progress):
+        self.progress = progress
+
+    def setRepeatCount(self, count):
+        self.repeatCount = count
+
+
+class HistoryRecord(object):
+    """ A notification that has been removed from a notification area, as stored in its history. """
+    __slots__ = ('timestamp', 'category', 'message', 'reason')
+
+    def __init__(self, timestamp, category, message, reason=None):
+        """
+
+        :param timestamp: float the time (as returned by time.time()) at which the notification was removed.
+        :param category: str the type of notification.
+        :param message: str the message of the notification.
+        :param reason: str (default: None) how the notification was dismissed, e.g. 'timeout' or 'user'.
+        """
+        self.timestamp = timestamp
+        self.category = category
+        self.message = message
+        self.reason = reason
+
+    def __repr__(self):
+        return u'HistoryRecord({!r}, {!r}, {!r}, {!r})'.format(
+            self.timestamp, self.category, self.message, self.reason)
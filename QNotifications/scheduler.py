@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+""" Schedulers that determine the order in which queued notifications are shown, and a heap of deadlines. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+import sys
+from collections import deque, OrderedDict
+
+# Handle importing the correct queue modules for the correct Python version.
+if sys.version_info >= (3, 0, 0):
+    # Python 3.
+    from queue import Empty
+else:
+    # Python 2.
+    from Queue import Empty
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# Placeholder for entries that have been removed from a scheduler, but not yet popped from its queue or heap.
+_REMOVED = object()
+
+
+class FifoScheduler(object):
+    """
+    Scheduler that shows queued notifications in the order in which they were queued. Priorities are ignored.
+    Unlike queue.Queue, it does not use any locks, as notifications are only queued on the GUI thread. All
+    operations take (amortized) O(1): removed items are only marked as such, and are discarded once they reach
+    either end of the queue.
+    """
+
+    def __init__(self):
+        # Entries ([item]) in the order in which they were queued.
+        self._items = deque()
+        # Entries by the id of their items, used to remove items.
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, item, priority=0):
+        """ Adds an item to the end of the queue.
+
+        :param item: the item to queue.
+        :param priority: int (default: 0) ignored.
+        """
+        entry = [item]
+        self._entries[id(item)] = entry
+        self._items.append(entry)
+
+    def pop(self):
+        """ Removes and returns the item that has been queued the longest.
+
+        :raises: Empty if there are no queued items.
+        """
+        while self._items:
+            item = self._items.popleft()[0]
+            if item is not _REMOVED:
+                del self._entries[id(item)]
+                return item
+        raise Empty
+
+    def peek_priority(self):
+        """ The priority of the next item (always 0), or None if there are no queued items. """
+        return 0 if self._entries else None
+
+    def oldest(self):
+        """ The item that has been queued the longest, or None if there are no queued items. """
+        while self._items and self._items[0][0] is _REMOVED:
+            self._items.popleft()
+        return self._items[0][0] if self._items else None
+
+    def last(self):
+        """ The item that would be popped last and its priority (always 0), or None if there are no queued items.
+
+        :return: tuple (item, priority) or None
+        """
+        while self._items and self._items[-1][0] is _REMOVED:
+            self._items.pop()
+        return (self._items[-1][0], 0) if self._items else None
+
+    def remove(self, item):
+        """ Removes an item from the queue.
+
+        :param item: the item to remove.
+        :return: bool True if the item was queued.
+        """
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return False
+        entry[0] = _REMOVED
+        return True
+
+
+class PriorityScheduler(object):
+    """
+    Scheduler that shows queued notifications with the highest priority first, and notifications with the
+    same priority in the order in which they were queued. It is backed by a binary heap, so that queueing and
+    popping an item take O(log n). Removed items are only marked as such, and are discarded once they reach
+    the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap = []
+        # Heap entries by the id of their items, used to remove items, in the order in which they were queued.
+        self._entries = OrderedDict()
+        # Tie-breaker that keeps items with the same priority in FIFO order.
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, item, priority=0):
+        """ Queues an item.
+
+        :param item: the item to queue.
+        :param priority: int (default: 0) higher priorities are popped first.
+        """
+        entry = [-priority, next(self._counter), item]
+        self._entries[id(item)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def pop(self):
+        """ Removes and returns the item with the highest priority.
+
+        :raises: Empty if there are no queued items.
+        """
+        while self._heap:
+            _, _, item = heapq.heappop(self._heap)
+            if item is not _REMOVED:
+                del self._entries[id(item)]
+                return item
+        raise Empty
+
+    def peek_priority(self):
+        """ The priority of the next item, or None if there are no queued items. """
+        while self._heap and self._heap[0][2] is _REMOVED:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return -self._heap[0][0]
+
+    def oldest(self):
+        """ The item that has been queued the longest, or None if there are no queued items. """
+        for entry in self._entries.values():
+            return entry[2]
+        return None
+
+    def last(self):
+        """ The item that would be popped last and its priority, or None if there are no queued items. Unlike the
+        other operations this takes O(n), so it should only be used when the queue overflows.
+
+        :return: tuple (item, priority) or None
+        """
+        if not self._entries:
+            return None
+        priority, _, item = max(self._entries.values(), key=lambda entry: (entry[0], entry[1]))
+        return item, -priority
+
+    def remove(self, item):
+        """ Removes an item from the queue.
+
+        :param item: the item to remove.
+        :return: bool True if the item was queued.
+        """
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return False
+        entry[2] = _REMOVED
+        return True
+
+
+# Placeholder for entries that have been cancelled, but not yet popped from the heap.
+_CANCELLED = object()
+
+
+class DeadlineHeap(object):
+    """
+    Binary heap of deadlines, with at most one deadline per object. Scheduling and popping a deadline take
+    O(log n), cancelling takes O(1) (cancelled entries are discarded once they reach the top of the heap).
+    Cancelled entries drop their references to the object and payload right away.
+    """
+
+    def __init__(self):
+        self._heap = []
+        # Heap entries by the id of their objects.
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self._entries
+
+    def schedule(self, obj, deadline, payload=None):
+        """ Sets the deadline of an object, replacing its previous deadline (if any).
+
+        :param obj: the object the deadline belongs to.
+        :param deadline: float the deadline.
+        :param payload: (default: None) data that is returned with the object when the deadline expires.
+        """
+        self.cancel(obj)
+        entry = [deadline, next(self._counter), obj, payload]
+        self._entries[id(obj)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, obj):
+        """ Removes the deadline of an object.
+
+        :param obj: the object the deadline belongs to.
+        :return: the payload of the cancelled deadline, or None if the object had no deadline.
+        """
+        entry = self._entries.pop(id(obj), None)
+        if entry is None:
+            return None
+        payload = entry[3]
+        entry[2] = _CANCELLED
+        entry[3] = None
+        return payload
+
+    def deadline(self, obj):
+        """ Returns the deadline of an object, or None if it has no deadline. """
+        entry = self._entries.get(id(obj))
+        return entry[0] if entry is not None else None
+
+    def next_deadline(self):
+        """ Returns the earliest deadline, or None if there are no deadlines. """
+        while self._heap and self._heap[0][2] is _CANCELLED:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return self._heap[0][0]
+
+    def pop_expired(self, now):
+        """ Removes and returns all objects with a deadline before or at *now*, earliest first.
+
+        :param now: float the current time.
+        :return: list of (object, payload) tuples.
+        """
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, obj, payload = heapq.heappop(self._heap)
+            if obj is not _CANCELLED:
+                del self._entries[id(obj)]
+                expired.append((obj, payload))
+        return expired
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Transport of notifications from multiprocessing workers to the GUI process through shared memory
+(multiprocessing.shared_memory, Python 3.8 or newer).
+
+Every worker gets its own RingBuffer: a single-producer, single-consumer ring of fixed-size slots in a
+shared memory block, which needs no locks because the worker only writes the tail index and the GUI process only
+writes the head index. A SharedMemoryBridge (see QNotifications.shmbridge) in the GUI process polls its rings
+with a timer and displays the notifications in batches::
+
+    bridge = SharedMemoryBridge(area)
+    ring = bridge.createChannel()
+    worker = multiprocessing.Process(target=work, args=(ring.name,))
+
+    def work(name):
+        ring = RingBuffer.attach(name)
+        ring.put('Finished processing item', 'success', 2000)
+
+Slots hold the category code, the timeout and the UTF-8 encoded message, which is truncated if it does not fit.
+The indices are written after the slots they publish; this relies on the stores of a process becoming visible
+to other processes in order, as they do on x86 and as the shared memory implementations of CPython assume.
+
+This module does not import Qt, so workers can use RingBuffer without a Qt binding.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import struct
+from multiprocessing import shared_memory
+
+from QNotifications.abstractions import *
+from QNotifications.history import categories
+from QNotifications.records import NotificationRecord
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+_MAGIC = b'QNRING1\x00'
+# Layout of the block: the magic, capacity and slot size, then the tail and the head index on separate cache
+# lines (so the producer and the consumer do not write to the same line), then the slots.
+_LAYOUT = struct.Struct(str('<8sII'))
+_TAIL_OFFSET = 64
+_HEAD_OFFSET = 128
+# Positions of the indices in a view of the block from _TAIL_OFFSET as unsigned 64-bit integers. Assigning to
+# such a view copies the 8 aligned bytes at once, whereas struct.pack_into() clears the bytes before writing
+# them, so the other process could read an index as zero.
+_TAIL = 0
+_HEAD = (_HEAD_OFFSET - _TAIL_OFFSET) // 8
+_SLOTS_OFFSET = 192
+# Slot header: category code, message length, timeout in milliseconds (-1 for no timeout).
+_SLOT = struct.Struct(str('<BxHi'))
+
+
+def _open_shared_memory(name):
+    """ Attaches to an existing block without registering it with the resource tracker of this process
+    (where possible), so a worker that exits does not destroy the block of the GUI process. """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # The track argument was added in Python 3.13.
+        return shared_memory.SharedMemory(name=name)
+
+
+class RingBuffer(object):
+    """ Single-producer, single-consumer ring of notification records in a shared memory block. """
+
+    def __init__(self, capacity=1024, slot_size=256, name=None, _memory=None):
+        """ Creates a ring buffer (in the GUI process). Workers attach to it with RingBuffer.attach().
+
+        :param capacity: int (default: 1024) The number of slots.
+        :param slot_size: int (default: 256) The size of a slot in bytes, which limits the length of messages.
+        :param name: str (default: None) The name of the shared memory block. If None, a unique name is chosen.
+        """
+        if _memory is not None:
+            self.memory = _memory
+            magic, self.capacity, self.slotSize = _LAYOUT.unpack_from(self.memory.buf, 0)
+            if magic != _MAGIC:
+                raise ValueError(u'{} is not a notification ring buffer'.format(self.memory.name))
+        else:
+            if slot_size <= _SLOT.size or slot_size - _SLOT.size > 0xFFFF:
+                raise ValueError(u'Invalid slot size')
+            self.capacity = capacity
+            self.slotSize = slot_size
+            self.memory = shared_memory.SharedMemory(name=name, create=True,
+                                                     size=_SLOTS_OFFSET + capacity * slot_size)
+            _LAYOUT.pack_into(self.memory.buf, 0, _MAGIC, capacity, slot_size)
+        self.name = self.memory.name
+        self.buf = self.memory.buf
+        self.indices = self.buf[_TAIL_OFFSET:_HEAD_OFFSET + 8].cast(str('Q'))
+        # Each side keeps its own index, and only reads the index of the other side.
+        self._tail = self.indices[_TAIL]
+        self._head = self.indices[_HEAD]
+        # Number of records that put() could not write because the ring was full.
+        self.dropped = 0
+
+    @classmethod
+    def attach(cls, name):
+        """ Attaches to the ring buffer with a name (in a worker process). """
+        return cls(_memory=_open_shared_memory(name))
+
+    def __len__(self):
+        """ The number of records that have been written but not yet read. """
+        return self.indices[_TAIL] - self.indices[_HEAD]
+
+    def put(self, message, category, timeout=5000):
+        """ Writes a notification to the ring (producer side). Never blocks.
+
+        :param message: str the message; it is truncated if it does not fit in a slot.
+        :param category: str the type of notification.
+        :param timeout: int (default: 5000) The duration for which the notification should be shown, or None.
+        :return: bool False if the ring was full and the notification was dropped.
+
+        :raises: ValueError if the category is other than one of the expected values.
+        """
+        if category not in categories:
+            raise ValueError(u'\"{}\" is not a valid value. Should be one of {}'.format(category, str(categories)))
+        if self._tail - self.indices[_HEAD] >= self.capacity:
+            self.dropped += 1
+            return False
+
+        data = safe_encode(safe_decode(message))[:self.slotSize - _SLOT.size]
+        offset = _SLOTS_OFFSET + (self._tail % self.capacity) * self.slotSize
+        _SLOT.pack_into(self.buf, offset, categories.index(category), len(data), -1 if timeout is None else timeout)
+        self.buf[offset + _SLOT.size:offset + _SLOT.size + len(data)] = data
+        # Publish the slot.
+        self._tail += 1
+        self.indices[_TAIL] = self._tail
+        return True
+
+    def drain(self, max_records=None):
+        """ Reads the records that have been written (consumer side).
+
+        :param max_records: int (default: None) The maximum number of records to read, or None for all.
+        :return: list of NotificationRecord
+        """
+        available = self.indices[_TAIL] - self._head
+        if max_records is not None:
+            available = min(available, max_records)
+        records = []
+        for index in range(self._head, self._head + available):
+            offset = _SLOTS_OFFSET + (index % self.capacity) * self.slotSize
+            category, length, timeout = _SLOT.unpack_from(self.buf, offset)
+            start = offset + _SLOT.size
+            # A message that was truncated in the middle of a character loses that character.
+            message = bytes(self.buf[start:start + length]).decode(u'utf-8', u'ignore')
+            records.append(NotificationRecord(message, categories[category], None if timeout < 0 else timeout))
+        if available:
+            # Release the slots.
+            self._head += available
+            self.indices[_HEAD] = self._head
+        return records
+
+    def close(self):
+        """ Detaches from the shared memory block. """
+        # The views have to be released before the block can be unmapped.
+        self.indices.release()
+        self.indices = self.buf = None
+        self.memory.close()
+
+    def unlink(self):
+        """ Destroys the shared memory block (in the process that created it). """
+        self.memory.unlink()
+
+
+def __getattr__(name):
+    # SharedMemoryBridge is imported on first access, so that workers do not import Qt.
+    if name == u'SharedMemoryBridge':
+        from QNotifications.shmbridge import SharedMemoryBridge
+        return SharedMemoryBridge
+    raise AttributeError(u'module {!r} has no attribute {!r}'.format(__name__, name))
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Displays the notifications that worker processes send through the shared memory RingBuffers of
+QNotifications.shm. This is the part of the transport that runs in the GUI process, and is kept separate from
+QNotifications.shm so that workers do not have to import Qt.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from QNotifications.qt import QtCore
+from QNotifications.shm import RingBuffer
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class SharedMemoryBridge(QtCore.QObject):
+    """
+    Displays the notifications that worker processes write to RingBuffers in a notification area. The rings
+    are polled by a single timer, which slows down to idleInterval while no notifications arrive.
+    """
+
+    def __init__(self, area, parent=None, **kwargs):
+        """
+
+        :param area: QNotificationArea the area to display the notifications in.
+        :param parent: QtCore.QObject (default: None)
+        :param pollInterval: int (default: 16) The interval in milliseconds with which the rings are polled while
+                             notifications arrive.
+        :param idleInterval: int (default: 100) The interval in milliseconds with which the rings are polled when
+                             no notifications arrived during the last poll.
+        :param batchSize: int (default: 256) The maximum number of notifications that are read from a ring per poll.
+        """
+        self.pollInterval = kwargs.pop(u'pollInterval', 16)
+        self.idleInterval = kwargs.pop(u'idleInterval', 100)
+        self.batchSize = kwargs.pop(u'batchSize', 256)
+        super(SharedMemoryBridge, self).__init__(parent, **kwargs)
+        self.area = area
+        self.channels = []
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.poll)
+
+    def createChannel(self, capacity=1024, slot_size=256):
+        """ Creates a ring buffer for a worker. Pass its name to the worker, which attaches with RingBuffer.attach().
+
+        :return: RingBuffer
+        """
+        ring = RingBuffer(capacity, slot_size)
+        self.channels.append(ring)
+        if not self._timer.isActive():
+            self._timer.start(self.pollInterval)
+        return ring
+
+    def removeChannel(self, ring):
+        """ Displays the remaining notifications of a ring, and destroys it. """
+        self.area.displayMany(ring.drain())
+        self.channels.remove(ring)
+        ring.close()
+        ring.unlink()
+        if not self.channels:
+            self._timer.stop()
+
+    def poll(self):
+        """ Displays up to batchSize notifications of every ring. """
+        received = 0
+        for ring in self.channels:
+            records = ring.drain(self.batchSize)
+            # Most polls of an idle bridge find nothing, which should not cost the area any work.
+            if records:
+                received += len(records)
+                self.area.displayMany(records)
+        interval = self.pollInterval if received else self.idleInterval
+        if self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+
+    def close(self):
+        """ Destroys all rings. """
+        for ring in list(self.channels):
+            self.removeChannel(ring)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+""" Styling of notifications without style sheets. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+from collections import OrderedDict
+
+from QNotifications.qt import QtCore, QtGui
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# Background colors of the categories (the same as in the default style sheets). The default style sheets also
+# set border colors, but no border style, so borders are not drawn.
+category_colors = OrderedDict([
+    (u'primary', u'#337ab7'),
+    (u'success', u'#5cb85c'),
+    (u'info', u'#5bc0de'),
+    (u'warning', u'#f0ad4e'),
+    (u'danger', u'#d9534f'),
+    (u'space-grey', u'#343d46'),
+])
+
+# A rule of a style sheet: selectors and declarations.
+_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def parse_style_sheet(style_sheet):
+    """ Returns the declarations of the rules of a (simple) style sheet by selector.
+
+    :param style_sheet: str
+    :return: dict {selector: {property: value}}, with the whitespace in selectors normalized.
+    """
+    rules = {}
+    for selectors, body in _RULE.findall(_COMMENT.sub(u'', style_sheet)):
+        declarations = {}
+        for declaration in body.split(u';'):
+            name, colon, value = declaration.partition(u':')
+            if colon:
+                declarations[name.strip().lower()] = value.strip()
+        for selector in selectors.split(u','):
+            rules.setdefault(u' '.join(selector.split()), {}).update(declarations)
+    return rules
+
+
+def _pixels(value, default):
+    """ Returns the number of pixels of a length such as '16px', or default if it is not a valid length. """
+    try:
+        return int(value.strip().lower().replace(u'px', u''))
+    except (AttributeError, ValueError):
+        return default
+
+
+class CategoryStyle(object):
+    """ The colors, brush and palette of one notification category. """
+    __slots__ = ('background', 'brush', 'palette')
+
+    def __init__(self, background, text_color):
+        """
+
+        :param background: str the background color.
+        :param text_color: QtGui.QColor the color of the message and the button.
+        """
+        self.background = QtGui.QColor(background)
+        self.brush = QtGui.QBrush(self.background)
+
+        self.palette = QtGui.QPalette()
+        for role in (QtGui.QPalette.WindowText, QtGui.QPalette.ButtonText, QtGui.QPalette.Text):
+            self.palette.setColor(role, text_color)
+        self.palette.setColor(QtGui.QPalette.Window, self.background)
+
+
+class StyleEngine(object):
+    """
+    Styles notifications with palettes, fonts and pre-rendered backgrounds that are shared by all
+    notifications (and notification areas), instead of having Qt parse style sheets and re-polish widgets.
+    """
+    _instance = None
+    # The engines created by for_style_sheet(), by style sheet.
+    _style_sheet_engines = {}
+
+    def __init__(self, font_size=16, radius=6, text_color=u'#FFFFFF', cache_size=64, colors=None):
+        """
+
+        :param font_size: int (default: 16) The pixel size of the notification font.
+        :param radius: int (default: 6) The radius of the rounded corners of notifications.
+        :param text_color: str (default: '#FFFFFF') The color of the messages and buttons.
+        :param cache_size: int (default: 64) The maximum number of pre-rendered backgrounds that are cached.
+        :param colors: dict (default: None) Background colors by category, which override those in
+                       category_colors.
+        """
+        self.radius = radius
+        self.textColor = QtGui.QColor(text_color)
+        self.cacheSize = cache_size
+
+        self.font = QtGui.QFont()
+        self.font.setPixelSize(font_size)
+        self.underlinedFont = QtGui.QFont(self.font)
+        self.underlinedFont.setUnderline(True)
+
+        backgrounds = dict(category_colors)
+        backgrounds.update(colors or {})
+        self._styles = dict((category, CategoryStyle(background, self.textColor))
+                            for category, background in backgrounds.items())
+        # Pre-rendered backgrounds by (category, width, height), least recently used first.
+        self._backgrounds = OrderedDict()
+
+    @classmethod
+    def instance(cls):
+        """ Returns the style engine that is shared by all notification areas. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def for_style_sheet(cls, style_sheet):
+        """ Returns an engine with the colors, font size and corner radius of a style sheet in the format of
+        QNotificationArea.default_notification_styles, which is shared by all areas with the same style sheet.
+        Other properties of the style sheet are ignored.
+
+        :param style_sheet: str
+        :return: StyleEngine
+        """
+        engine = cls._style_sheet_engines.get(style_sheet)
+        if engine is not None:
+            return engine
+
+        rules = parse_style_sheet(style_sheet)
+        notification = rules.get(u'QNotification', {})
+        colors = {}
+        for category in category_colors:
+            color = rules.get(u'QNotification#' + category, {}).get(u'background-color')
+            if color is not None and QtGui.QColor(color).isValid():
+                colors[category] = color
+        text_color = rules.get(u'QNotification #message', {}).get(u'color', u'#FFFFFF')
+        if not QtGui.QColor(text_color).isValid():
+            text_color = u'#FFFFFF'
+        engine = cls(font_size=_pixels(notification.get(u'font-size'), 16),
+                     radius=_pixels(notification.get(u'border-radius'), 6), text_color=text_color, colors=colors)
+        cls._style_sheet_engines[style_sheet] = engine
+        return engine
+
+    def style(self, category):
+        """ Returns the CategoryStyle of a category. """
+        return self._styles[category]
+
+    def background(self, category, width, height):
+        """ Returns a (cached) pixmap of the rounded background of a notification.
+
+        :param category: str the category of the notification.
+        :param width: int
+        :param height: int
+        :return: QtGui.QPixmap
+        """
+        key = (category, width, height)
+        pixmap = self._backgrounds.pop(key, None)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(max(1, width), max(1, height))
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(self._styles[category].brush)
+            painter.drawRoundedRect(QtCore.QRectF(0, 0, width, height), self.radius, self.radius)
+            painter.end()
+            if len(self._backgrounds) >= self.cacheSize:
+                self._backgrounds.popitem(last=False)
+        self._backgrounds[key] = pixmap
+        return pixmap
+
+    def apply(self, notification):
+        """ Applies the palette and fonts of its category to a QNotification and its children.
+
+        :param notification: QNotification
+        """
+        # The children inherit the palette and font of the notification.
+        notification.setPalette(self._styles[notification.category].palette)
+        notification.setFont(self.font)
+
+    def button_font(self, underlined):
+        """ Returns the font of a close button, which is underlined if the button has a custom text. """
+        return self.underlinedFont if underlined else self.font
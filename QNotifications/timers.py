@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+""" Timeout handling for the QNotifications module. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+
+from QNotifications.abstractions import *
+from QNotifications.qt import QtCore
+# DeadlineHeap is defined with the other pure-Python queues, so it can be used without Qt.
+from QNotifications.scheduler import DeadlineHeap
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class TimeoutScheduler(QtCore.QObject):
+    """
+    Runs the timeouts of many notifications with a single timer, which is only armed for the earliest
+    deadline. Timeouts can be cancelled, restarted and paused (e.g. while the mouse hovers over a notification).
+
+    :inherits: QtCore.QObject
+    """
+
+    def __init__(self, parent=None):
+        super(TimeoutScheduler, self).__init__(parent)
+        self._deadlines = DeadlineHeap()
+        # Paused timeouts: id(obj) -> (obj, remaining seconds, callback)
+        self._paused = {}
+        # Deadline the timer is currently armed for.
+        self._armed_for = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.__fire)
+
+    def __len__(self):
+        return len(self._deadlines) + len(self._paused)
+
+    def schedule(self, obj, timeout, callback):
+        """ (Re)starts the timeout of an object.
+
+        If the timeout of the object is paused, it is restarted with the full duration once it is resumed.
+
+        :param obj: the object the timeout belongs to.
+        :param timeout: int the timeout in milliseconds.
+        :param callback: callable(obj) that is called when the timeout expires.
+        """
+        if id(obj) in self._paused:
+            self._paused[id(obj)] = (obj, timeout / 1000.0, callback)
+            return
+        self._deadlines.schedule(obj, monotonic() + timeout / 1000.0, callback)
+        self.__rearm()
+
+    def cancel(self, obj):
+        """ Cancels the timeout of an object (if it has one).
+
+        :param obj: the object the timeout belongs to.
+        """
+        self._paused.pop(id(obj), None)
+        if self._deadlines.cancel(obj) is not None:
+            self.__rearm()
+
+    def pause(self, obj):
+        """ Stops the countdown of an object's timeout until resume() is called.
+
+        :param obj: the object the timeout belongs to.
+        """
+        deadline = self._deadlines.deadline(obj)
+        if deadline is None:
+            return
+        callback = self._deadlines.cancel(obj)
+        self._paused[id(obj)] = (obj, max(0.0, deadline - monotonic()), callback)
+        self.__rearm()
+
+    def resume(self, obj):
+        """ Continues the countdown of a paused timeout.
+
+        :param obj: the object the timeout belongs to.
+        """
+        paused = self._paused.pop(id(obj), None)
+        if paused is None:
+            return
+        _, remaining, callback = paused
+        self._deadlines.schedule(obj, monotonic() + remaining, callback)
+        self.__rearm()
+
+    def remaining(self, obj):
+        """ Returns the remaining time of an object's timeout in milliseconds, or None if it has no timeout. """
+        paused = self._paused.get(id(obj))
+        if paused is not None:
+            return int(paused[1] * 1000)
+        deadline = self._deadlines.deadline(obj)
+        if deadline is None:
+            return None
+        return max(0, int((deadline - monotonic()) * 1000))
+
+    def __rearm(self):
+        """ Arms the timer for the earliest deadline, if it is not already armed for it. """
+        deadline = self._deadlines.next_deadline()
+        if deadline == self._armed_for:
+            return
+        self._armed_for = deadline
+        if deadline is None:
+            self._timer.stop()
+        else:
+            delay = int(math.ceil(max(0.0, deadline - monotonic()) * 1000))
+            self._timer.start(delay)
+
+    def __fire(self):
+        """ Calls the callbacks of all expired timeouts. """
+        self._armed_for = None
+        for obj, callback in self._deadlines.pop_expired(monotonic()):
+            callback(obj)
+        self.__rearm()
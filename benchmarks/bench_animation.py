@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the frame time of the entry and exit effects while many notifications are shown: the time the event
+loop spends on a frame of the animation driver (advancing the animations and repainting), on average and at
+most. A frame budget of 60 frames per second is 16.7 ms.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_animation
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from benchmarks.common import application, clock, print_results, process_events
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+CATEGORIES = [u'primary', u'success', u'info', u'warning', u'danger']
+
+
+def _frame_times(area, start, duration):
+    """ Calls start(), and processes events until the animations it started have finished.
+
+    :return: list of the times in seconds of the passes of the event loop in which a frame was drawn.
+    """
+    frames = []
+    ticks = [0]
+    timer = area.animationDriver._timer
+    timer.timeout.connect(lambda: ticks.__setitem__(0, ticks[0] + 1))
+    start()
+    deadline = clock() + duration / 1000.0 + 1.0
+    while len(area.animationDriver) and clock() < deadline:
+        before = ticks[0]
+        began = clock()
+        process_events()
+        if ticks[0] != before:
+            frames.append(clock() - began)
+    return frames
+
+
+def frame_time(effect, visible=50, duration=300, **kwargs):
+    """ Returns the mean and the maximum frame time in seconds of an effect with *visible* notifications. """
+    from QNotifications.qt import QtWidgets
+    from QNotifications import QNotificationArea
+    target = QtWidgets.QWidget()
+    target.resize(800, 2400)
+    target.show()
+    area = QNotificationArea(target, useQueue=False, **kwargs)
+    area.displayMany((u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None) for i in range(visible))
+    process_events()
+
+    if effect in (u'fadeIn', u'slideIn'):
+        area.setEntryEffect(effect, duration)
+        start = lambda: area.display(u'A new notification', u'info', None)
+    else:
+        area.setExitEffect(effect, duration)
+        # Removing the first notification moves all others.
+        start = lambda: area.remove(area._visible[0])
+    frames = _frame_times(area, start, 2 * duration)
+    target.deleteLater()
+    process_events()
+    if not frames:
+        return 0.0, 0.0
+    return sum(frames) / len(frames), max(frames)
+
+
+def run(visible=50):
+    """ Runs the benchmark.
+
+    :param visible: int the number of notifications that are shown.
+    :return: dict with the mean and maximum frame times in seconds per effect and render mode.
+    """
+    application()
+    results = {}
+    for mode in (u'widgets', u'painter'):
+        for effect in (u'fadeIn', u'slideIn', u'fadeOut', u'slideOut', u'collapse'):
+            mean, maximum = frame_time(effect, visible, renderMode=mode)
+            results[u'animation.{}.{}.frame'.format(mode, effect)] = mean
+            results[u'animation.{}.{}.frame_max'.format(mode, effect)] = maximum
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput and latency of the hot paths of QNotificationArea: display() calls per second, the time from
+display() to the first paint of the notification, the time it takes to remove a notification (with and
+without fade effects), the time it takes to drain a queue and to drop expired notifications from it, the
+layout work of adding and removing a notification while many are shown, the cost of updating a keyed
+notification, and the memory used per live and per queued notification.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_area
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import time
+
+from benchmarks.common import application, best_of, clock, print_results, process_events, rss
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+CATEGORIES = [u'primary', u'success', u'info', u'warning', u'danger']
+
+
+def _target():
+    from QNotifications.qt import QtWidgets
+    target = QtWidgets.QWidget()
+    target.resize(800, 600)
+    target.show()
+    process_events()
+    return target
+
+
+def _dispose(target):
+    target.deleteLater()
+    process_events()
+
+
+def _wait_until(condition, timeout=5.0):
+    """ Processes events until condition() is true, and returns the time that took in seconds. """
+    start = clock()
+    while not condition():
+        if clock() - start > timeout:
+            raise RuntimeError(u'Timed out waiting for condition')
+        process_events()
+    return clock() - start
+
+
+def _paint_counter():
+    """ Returns an event filter that counts the paint events of the objects it is installed on. """
+    from QNotifications.qt import QtCore
+
+    class PaintCounter(QtCore.QObject):
+        def __init__(self):
+            super(PaintCounter, self).__init__()
+            self.count = 0
+
+        def eventFilter(self, watched, event):
+            if event.type() == QtCore.QEvent.Paint:
+                self.count += 1
+            return False
+
+    return PaintCounter()
+
+
+def display_throughput(count=500, repeat=3, many=False, **kwargs):
+    """ Returns the number of notifications displayed per second (including processing the resulting events),
+    with a display() call per notification or, if many is True, with a single call to displayMany(). """
+    from QNotifications import QNotificationArea
+
+    def display_all():
+        target = _target()
+        area = QNotificationArea(target, **kwargs)
+        if many:
+            area.displayMany((u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+                             for i in range(count))
+        else:
+            for i in range(count):
+                area.display(u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+        process_events()
+        _dispose(target)
+
+    return count / best_of(display_all, repeat)
+
+
+def first_paint_latency(fade=False, repeat=5):
+    """ Returns the time from display() until the notification (or area, in painter mode) is painted. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=False)
+    if fade:
+        area.setEntryEffect(u'fadeIn', 100)
+    counter = _paint_counter()
+    area.installEventFilter(counter)
+    latencies = []
+    for i in range(repeat):
+        counter.count = 0
+        start = clock()
+        area.display(u'Notification {}'.format(i), u'info', None)
+        notification = area._visible[-1]
+        if hasattr(notification, u'installEventFilter'):
+            notification.installEventFilter(counter)
+        _wait_until(lambda: counter.count > 0)
+        latencies.append(clock() - start)
+    _dispose(target)
+    return min(latencies)
+
+
+def removal_time(fade=False, repeat=5):
+    """ Returns the time from remove() until the notification is no longer shown. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=False)
+    if fade:
+        area.setExitEffect(u'fadeOut', 100)
+    times = []
+    for i in range(repeat):
+        area.display(u'Notification {}'.format(i), u'info', None)
+        notification = area._visible[-1]
+        process_events()
+        start = clock()
+        area.remove(notification)
+        _wait_until(lambda: notification not in area._visible)
+        times.append(clock() - start)
+    _dispose(target)
+    return min(times)
+
+
+def queue_drain_time(count=500, max_messages=2, repeat=3):
+    """ Returns the time it takes to show and remove *count* queued notifications. """
+    from QNotifications import QNotificationArea
+
+    def drain():
+        target = _target()
+        area = QNotificationArea(target, useQueue=True, maxMessages=max_messages)
+        for i in range(count):
+            area.display(u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+        while area._visible:
+            area.remove(area._visible[0])
+        process_events()
+        _dispose(target)
+
+    return best_of(drain, repeat)
+
+
+def expiry_time(count=5000, max_age=50):
+    """ Returns the time per expired notification it takes to drop *count* queued notifications that exceeded
+    their maximum age, when the next notification is dequeued. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=True, maxMessages=1, maxAge=max_age)
+    area.display(u'Shown notification', u'info', None)
+    for i in range(count):
+        area.display(u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+    time.sleep(2 * max_age / 1000.0)
+    start = clock()
+    area.remove(area._visible[0])
+    elapsed = clock() - start
+    _dispose(target)
+    return elapsed / count
+
+
+def layout_work(visible=200, changes=100):
+    """ Returns the time it takes to add and remove a notification while *visible* notifications are shown, and
+    the number of notifications that are measured and of full layout passes per change. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=False)
+    area.displayMany((u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None) for i in range(visible))
+    process_events()
+    before = area.layoutStatistics()
+    start = clock()
+    for i in range(changes):
+        area.remove(area._visible[0])
+        area.display(u'Notification {}'.format(i), u'info', None)
+        process_events()
+    elapsed = clock() - start
+    after = area.layoutStatistics()
+    _dispose(target)
+    return {
+        u'area.add_remove.visible_{}'.format(visible): elapsed / changes,
+        u'area.layout.measured_per_change_rate': (after[u'measured'] - before[u'measured']) / (2.0 * changes),
+        u'area.layout.passes_per_change_rate': (after[u'passes'] - before[u'passes']) / (2.0 * changes),
+    }
+
+
+def keyed_updates(updates=1000):
+    """ Returns the time per updateNotification() call while a job reports its progress as fast as it can
+    (including processing the resulting events), and the number of updates that were applied per call. """
+    from QNotifications import QNotificationArea
+    from QNotifications.metrics import NotificationMetrics
+    target = _target()
+    area = QNotificationArea(target, useQueue=False, metrics=NotificationMetrics())
+    area.display(u'Starting job', u'info', None, key=u'job')
+    process_events()
+    start = clock()
+    for i in range(updates):
+        area.updateNotification(u'job', message=u'Processing item {} of {}'.format(i, updates),
+                                progress=i / float(updates))
+        process_events()
+    _wait_until(lambda: not area._updates)
+    elapsed = clock() - start
+    applied = area.metricsSnapshot()[u'counters'][u'updated']
+    _dispose(target)
+    return {
+        u'area.update_notification': elapsed / updates,
+        u'area.update_notification.applied_per_call_rate': applied / float(updates),
+    }
+
+
+def memory_per_notification(count=500, **kwargs):
+    """ Returns the growth of the resident set size per live notification in bytes, or None if unknown. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=False, poolSize=0, **kwargs)
+    gc.collect()
+    before = rss()
+    for i in range(count):
+        area.display(u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+    process_events()
+    gc.collect()
+    after = rss()
+    _dispose(target)
+    if before is None or after is None:
+        return None
+    return (after - before) / count
+
+
+def memory_per_queued_notification(count=5000):
+    """ Returns the growth of the resident set size per queued notification in bytes, or None if unknown. """
+    from QNotifications import QNotificationArea
+    target = _target()
+    area = QNotificationArea(target, useQueue=True, maxMessages=1, poolSize=0)
+    area.display(u'Shown notification', u'info', None)
+    gc.collect()
+    before = rss()
+    for i in range(count):
+        area.display(u'Notification {}'.format(i), CATEGORIES[i % len(CATEGORIES)], None)
+    process_events()
+    gc.collect()
+    after = rss()
+    _dispose(target)
+    if before is None or after is None:
+        return None
+    return (after - before) / count
+
+
+def run():
+    """ Runs all benchmarks of this module.
+
+    :return: dict of results. Times are in seconds, throughputs in calls per second and memory in bytes.
+    """
+    application()
+    results = {
+        u'area.display.unqueued_per_second': display_throughput(useQueue=False),
+        u'area.display.queued_per_second': display_throughput(useQueue=True, maxMessages=2),
+        u'area.display.painter_per_second': display_throughput(useQueue=False, renderMode=u'painter'),
+        u'area.display_many.unqueued_per_second': display_throughput(many=True, useQueue=False),
+        u'area.display_many.queued_per_second': display_throughput(many=True, useQueue=True, maxMessages=2),
+        u'area.first_paint': first_paint_latency(),
+        u'area.first_paint.fade_in': first_paint_latency(fade=True),
+        u'area.remove': removal_time(),
+        u'area.remove.fade_out': removal_time(fade=True),
+        u'area.queue_drain.500': queue_drain_time(),
+        u'area.expire_queued': expiry_time(),
+    }
+    results.update(layout_work())
+    results.update(keyed_updates())
+    for mode in (u'widgets', u'painter'):
+        memory = memory_per_notification(renderMode=mode)
+        if memory is not None:
+            results[u'area.memory.{}_bytes'.format(mode)] = memory
+    memory = memory_per_queued_notification()
+    if memory is not None:
+        results[u'area.memory.queued_bytes'] = memory
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Compares many independent notification areas with areas created by a NotificationCenter (which share their
+style engine, animation driver, timeout scheduler and height cache): the memory and the number of timers
+per area, and the time it takes to show a notification in all of them.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_center
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from benchmarks.common import application, clock, print_results, process_events, rss
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+def _timer_count(areas):
+    """ Returns the number of distinct QTimers owned by the areas and the objects they use. """
+    from QNotifications.qt import QtCore
+    owners = set()
+    for area in areas:
+        owners.update((area, area.animationDriver, area.timeouts, area.pool))
+    return sum(len(owner.findChildren(QtCore.QTimer)) for owner in owners)
+
+
+def run(windows=30, notifications=5):
+    """ Runs the benchmark.
+
+    :param windows: int the number of windows (each with an area).
+    :param notifications: int the number of notifications that are shown in every area.
+    :return: dict with the memory and the number of timers per area, and the time in seconds it takes to
+             show the notifications in all areas, with independent areas and with a NotificationCenter.
+    """
+    from QNotifications.qt import QtWidgets
+    from QNotifications import NotificationCenter, QNotificationArea
+    application()
+    results = {}
+    for label in (u'independent', u'center'):
+        targets = [QtWidgets.QWidget() for _ in range(windows)]
+        for target in targets:
+            target.resize(400, 300)
+            target.show()
+        process_events()
+
+        before = rss()
+        if label == u'center':
+            center = NotificationCenter(maxVisible=windows * notifications)
+            areas = [center.createArea(target, topics=[u'all']) for target in targets]
+        else:
+            areas = [QNotificationArea(target, maxMessages=notifications) for target in targets]
+        after = rss()
+        if before is not None and after is not None:
+            results[u'center.{}.memory_per_area_bytes'.format(label)] = (after - before) / windows
+        results[u'center.{}.timers_per_area_rate'.format(label)] = _timer_count(areas) / windows
+
+        start = clock()
+        for i in range(notifications):
+            if label == u'center':
+                center.broadcast(u'Notification {}'.format(i), u'info', None)
+            else:
+                for area in areas:
+                    area.display(u'Notification {}'.format(i), u'info', None)
+        # Wait for the center's tick.
+        while label == u'center' and center.pendingCount():
+            process_events()
+        process_events()
+        results[u'center.{}.show_all'.format(label)] = clock() - start
+
+        for target in targets:
+            target.deleteLater()
+        process_events()
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
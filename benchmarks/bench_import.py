@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the cold-start cost of QNotifications with ``python -X importtime`` (Python 3.7+): the time it takes
+to import the package itself, which should not import Qt, and the time it takes to import QNotificationArea,
+which includes the Qt binding. Every measurement runs in a fresh interpreter.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_import
+
+This exits with status 1 if importing the package takes longer than PACKAGE_BUDGET.
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+from benchmarks.common import print_results
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# The maximum time in seconds that `import QNotifications` may take.
+PACKAGE_BUDGET = 0.01
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(statement):
+    """ Runs a statement in a fresh interpreter with -X importtime.
+
+    :param statement: str the statement to run, e.g. 'import QNotifications'.
+    :return: dict with the cumulative import time in seconds by module name.
+    """
+    process = subprocess.Popen([sys.executable, u'-X', u'importtime', u'-c', statement], cwd=_root,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(u'utf-8', u'replace'))
+
+    times = {}
+    # Lines look like "import time:       236 |        869 |   QNotifications".
+    for line in stderr.decode(u'utf-8', u'replace').splitlines():
+        if not line.startswith(u'import time:'):
+            continue
+        fields = line[len(u'import time:'):].split(u'|')
+        try:
+            cumulative = int(fields[1]) / 1e6
+        except (IndexError, ValueError):
+            # The header line.
+            continue
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+def run(repeat=5):
+    """ Runs the benchmark.
+
+    :return: dict with the best time in seconds to import the package and to import QNotificationArea (which
+             includes the time to import the package), and whether importing the package imported Qt.
+    """
+    if sys.version_info < (3, 7):
+        print(u'Skipping the import benchmark: -X importtime requires Python 3.7 or newer')
+        return {}
+
+    package = []
+    area = []
+    for _ in range(repeat):
+        times = import_times(u'import QNotifications')
+        package.append(times[u'QNotifications'])
+        if u'QNotifications.qt' in times:
+            raise RuntimeError(u'Importing QNotifications should not import the Qt binding')
+
+        times = import_times(u'from QNotifications import QNotificationArea')
+        area.append(times[u'QNotifications'] + times[u'QNotifications.QNotificationArea'])
+    return {
+        u'import.package': min(package),
+        u'import.area': min(area),
+    }
+
+
+if __name__ == u'__main__':
+    results = run()
+    print_results(results)
+    if results.get(u'import.package', 0) > PACKAGE_BUDGET:
+        print(u'Importing QNotifications exceeds the budget of {} ms'.format(PACKAGE_BUDGET * 1000))
+        sys.exit(1)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the notification center panel with a large number of entries: loading them, filtering them by
+category and by text, and painting the panel (of which only the visible rows should cost anything).
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_panel
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from benchmarks.common import application, best_of, clock, print_results, process_events, rss
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+CATEGORIES = [u'primary', u'success', u'info', u'warning', u'danger']
+
+
+def _records(entries):
+    from QNotifications.records import HistoryRecord
+    return [HistoryRecord(1500000000.0 + i, CATEGORIES[i % len(CATEGORIES)],
+                          u'Notification {} about job {}'.format(i, i % 977), u'timeout')
+            for i in range(entries)]
+
+
+def run(entries=100000, repeat=5):
+    """ Runs the benchmark.
+
+    :param entries: int the number of entries in the panel.
+    :return: dict with the time in seconds to load the entries, to filter and search them, to paint the panel
+             and to add an entry, and the memory used per entry.
+    """
+    from QNotifications.qt import QtGui
+    from QNotifications import QNotificationPanel
+    application()
+    records = _records(entries)
+
+    before = rss()
+    panel = QNotificationPanel()
+    panel.resize(600, 800)
+    panel.show()
+    start = clock()
+    panel.loadHistory(records)
+    process_events()
+    results = {u'panel.load': clock() - start}
+    after = rss()
+    if before is not None and after is not None:
+        results[u'panel.memory_per_entry_bytes'] = (after - before) / entries
+
+    pixmap = QtGui.QPixmap(panel.size())
+    results[u'panel.paint'] = best_of(lambda: panel.render(pixmap), repeat)
+    results[u'panel.filter_category'] = best_of(lambda: panel.model.setFilter([u'danger', u'warning']), repeat)
+    results[u'panel.search'] = best_of(lambda: panel.model.setFilter(None, u'job 42'), repeat)
+    panel.model.setFilter()
+    results[u'panel.append'] = best_of(
+        lambda: panel.model.append(1600000000.0, u'info', u'A new notification'), repeat, 100)
+
+    panel.deleteLater()
+    process_events()
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how long it takes to resize a target widget while notifications are shown, with and without the
+cache of message heights.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_resize
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from benchmarks.common import application, best_of, print_results, process_events
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+MESSAGE = (u'A notification with a message that is long enough to be wrapped over several lines '
+           u'when the window it is shown in becomes narrow, as happens while the user drags its edge.')
+
+
+def run(notifications=10, steps=100, repeat=5):
+    """ Runs the benchmark.
+
+    :param notifications: int the number of notifications that are shown.
+    :param steps: int the number of resizes per run.
+    :return: dict with the best time in seconds per resize, and the hit rate of the cache.
+    """
+    from QNotifications.qt import QtWidgets
+    from QNotifications import QNotificationArea
+    application()
+    results = {}
+    for cache_size in (0, 256):
+        label = u'cached' if cache_size else u'uncached'
+        target = QtWidgets.QWidget()
+        target.resize(800, 600)
+        target.show()
+        area = QNotificationArea(target, maxMessages=notifications, heightCacheSize=cache_size)
+        for i in range(notifications):
+            area.display(MESSAGE, u'info', None)
+        process_events()
+
+        def drag_edge():
+            # Drag the edge back and forth, as users do.
+            for step in range(steps):
+                target.resize(400 + abs(step % 40 - 20) * 20, 600)
+                process_events()
+
+        results[u'resize.{}'.format(label)] = best_of(drag_edge, repeat) / steps
+        statistics = area.heightCacheStatistics()
+        if statistics is not None:
+            results[u'resize.cached.hit_rate'] = statistics[u'hitRate']
+        target.deleteLater()
+        process_events()
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the schedulers in QNotifications.scheduler with the queue.Queue that was previously used
+for queued notifications.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_scheduler
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+from queue import Queue, Empty
+
+from QNotifications.scheduler import FifoScheduler, PriorityScheduler
+
+from benchmarks.common import best_of, print_results
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+PRIORITIES = [40, 30, 20, 10, 10, 0]
+
+
+def _items(size, seed=0):
+    rng = random.Random(seed)
+    return [(object(), rng.choice(PRIORITIES)) for _ in range(size)]
+
+
+def _drain_queue(items):
+    queue = Queue()
+    for item, _ in items:
+        queue.put(item)
+    try:
+        while True:
+            queue.get(False)
+    except Empty:
+        pass
+
+
+def _drain_scheduler(cls, items):
+    scheduler = cls()
+    for item, priority in items:
+        scheduler.push(item, priority)
+    try:
+        while True:
+            scheduler.pop()
+    except Empty:
+        pass
+
+
+def run(sizes=(10000, 50000), repeat=5):
+    """ Queues and drains *size* notifications with every implementation.
+
+    :return: dict with the best time in seconds per implementation and size.
+    """
+    results = {}
+    for size in sizes:
+        items = _items(size)
+        cases = {
+            u'queue.Queue': lambda: _drain_queue(items),
+            u'FifoScheduler': lambda: _drain_scheduler(FifoScheduler, items),
+            u'PriorityScheduler': lambda: _drain_scheduler(PriorityScheduler, items),
+        }
+        for name, func in cases.items():
+            results[u'scheduler.{}.{}'.format(name, size)] = best_of(func, repeat)
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the throughput of notifications sent from a worker process through a shared memory RingBuffer with
+the throughput of a multiprocessing.Queue (which pickles every notification and sends it through a pipe).
+The GUI side is simulated by draining the ring or the queue in the benchmark process.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_shm
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import time
+
+from benchmarks.common import clock, print_results
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+CATEGORIES = [u'primary', u'success', u'info', u'warning', u'danger']
+
+
+def _ring_worker(name, count):
+    from QNotifications.shm import RingBuffer
+    ring = RingBuffer.attach(name)
+    for i in range(count):
+        message = u'Processed item {} of job {}'.format(i, i % 977)
+        # Wait for the consumer instead of dropping, so that every notification is transported.
+        while not ring.put(message, CATEGORIES[i % len(CATEGORIES)], 5000):
+            time.sleep(0)
+    ring.close()
+
+
+def _queue_worker(queue, count):
+    from QNotifications.records import NotificationRecord
+    for i in range(count):
+        message = u'Processed item {} of job {}'.format(i, i % 977)
+        queue.put(NotificationRecord(message, CATEGORIES[i % len(CATEGORIES)], 5000))
+
+
+def _ring_throughput(count, batch_size):
+    from QNotifications.shm import RingBuffer
+    ring = RingBuffer(capacity=4096)
+    worker = multiprocessing.Process(target=_ring_worker, args=(ring.name, count))
+    start = clock()
+    worker.start()
+    received = 0
+    while received < count:
+        records = ring.drain(batch_size)
+        if not records:
+            time.sleep(0)
+        received += len(records)
+    elapsed = clock() - start
+    worker.join()
+    ring.close()
+    ring.unlink()
+    return count / elapsed
+
+
+def _queue_throughput(count):
+    queue = multiprocessing.Queue()
+    worker = multiprocessing.Process(target=_queue_worker, args=(queue, count))
+    start = clock()
+    worker.start()
+    for _ in range(count):
+        queue.get()
+    elapsed = clock() - start
+    worker.join()
+    return count / elapsed
+
+
+def run(count=200000, batch_size=256):
+    """ Runs the benchmark.
+
+    :param count: int the number of notifications that the worker sends.
+    :param batch_size: int the maximum number of notifications that are read from the ring at once.
+    :return: dict with the number of notifications per second that are transported through the ring and
+             through the queue (including the start of the worker process).
+    """
+    return {
+        u'shm.ring_notifications_per_second': _ring_throughput(count, batch_size),
+        u'shm.queue_notifications_per_second': _queue_throughput(count),
+    }
+
+
+if __name__ == u'__main__':
+    print_results(run())
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the time it takes to create notification areas and to add notifications to them, with the
+StyleEngine (the default) and with the default style sheets set on every area.
+
+Run from the root of the repository with::
+
+    python -m benchmarks.bench_styling
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from benchmarks.common import application, best_of, print_results, process_events
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+def _create_area(target, stylesheets):
+    from QNotifications import QNotificationArea
+    if stylesheets:
+        area = QNotificationArea(target, useGlobalCSS=True, useQueue=False, poolSize=0)
+        area.setStyleSheet(QNotificationArea.default_notification_styles)
+    else:
+        area = QNotificationArea(target, useQueue=False, poolSize=0)
+    return area
+
+
+def run(areas=50, notifications=100, repeat=5):
+    """ Runs the benchmark.
+
+    :param areas: int the number of areas that are created per run.
+    :param notifications: int the number of notifications that are added per run.
+    :return: dict with the best time in seconds per area / notification, with and without style sheets.
+    """
+    from QNotifications.qt import QtWidgets
+    application()
+    results = {}
+    for stylesheets in (False, True):
+        label = u'stylesheet' if stylesheets else u'engine'
+
+        def create_areas():
+            target = QtWidgets.QWidget()
+            target.resize(800, 600)
+            for _ in range(areas):
+                _create_area(target, stylesheets)
+            target.deleteLater()
+            process_events()
+
+        results[u'styling.{}.create_area'.format(label)] = best_of(create_areas, repeat) / areas
+
+        def add_notifications():
+            target = QtWidgets.QWidget()
+            target.resize(800, 600)
+            target.show()
+            area = _create_area(target, stylesheets)
+            categories = [u'primary', u'success', u'info', u'warning', u'danger']
+            for i in range(notifications):
+                area.display(u'Notification {}'.format(i), categories[i % len(categories)], None)
+            process_events()
+            target.deleteLater()
+            process_events()
+
+        results[u'styling.{}.add_notification'.format(label)] = best_of(add_notifications, repeat) / notifications
+    return results
+
+
+if __name__ == u'__main__':
+    print_results(run())
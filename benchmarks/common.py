@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+""" Helpers shared by the QNotifications benchmarks. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import timeit
+
+# High resolution clock for measuring latencies.
+try:
+    from time import perf_counter as clock
+except ImportError:
+    from timeit import default_timer as clock
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+_app = None
+
+
+def application():
+    """ Returns a QApplication that runs on the offscreen platform (created on the first call). """
+    global _app
+    os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+    from QNotifications.qt import QtWidgets
+    _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    return _app
+
+
+def process_events():
+    """ Processes all pending events of the application. """
+    application().processEvents()
+
+
+def best_of(func, repeat=5, number=1):
+    """ Returns the best time in seconds of *repeat* runs of *number* calls to func. """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def rss():
+    """ Returns the resident set size of the process in bytes, or None if it cannot be determined. """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open(u'/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf(u'SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def unit(name):
+    """ Returns the unit of a result, derived from its name. """
+    if name.endswith(u'_rate'):
+        return u''
+    if name.endswith(u'_per_second'):
+        return u'/s'
+    if name.endswith(u'_bytes'):
+        return u'B'
+    return u'ms'
+
+
+def higher_is_better(name):
+    """ Returns whether a higher value of a result is an improvement. """
+    return unit(name) in (u'', u'/s')
+
+
+def print_results(results):
+    """ Prints a dict of benchmark results. Times (in seconds) are printed in milliseconds. """
+    for name, value in sorted(results.items()):
+        if unit(name) == u'ms':
+            value *= 1000
+        print(u'{:<50} {:>14.3f} {}'.format(name, value, unit(name)))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the QNotifications benchmarks on the offscreen Qt platform, writes the results as JSON and compares
+them with a stored baseline. Exits with status 1 if a result regressed by more than the tolerance, and with
+status 2 if there is no baseline to compare with (unless --no-baseline is passed).
+
+Run from the root of the repository with::
+
+    python -m benchmarks.run                     # run and compare with benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline     # run and store the results as the new baseline
+    python -m benchmarks.run --no-baseline       # run without comparing
+    python -m benchmarks.run --only area scheduler --output results.json
+"""
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+
+from benchmarks.common import higher_is_better, print_results, unit
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+SUITES = [u'scheduler', u'area', u'styling', u'resize', u'import', u'panel', u'center', u'shm', u'animation']
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), u'baseline.json')
+
+
+def run_suites(names):
+    """ Runs the benchmark modules with the given names and returns their combined results. """
+    results = {}
+    for name in names:
+        module = importlib.import_module(u'benchmarks.bench_{}'.format(name))
+        results.update(module.run())
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """ Compares results with a baseline.
+
+    :param results: dict of results.
+    :param baseline: dict of baseline results.
+    :param tolerance: float the relative change that is still accepted (e.g. 0.25 for 25%).
+    :return: list of (name, baseline value, value, relative change) tuples of regressed results.
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference or unit(name) == u'':
+            continue
+        change = (value - reference) / reference
+        if higher_is_better(name):
+            change = -change
+        if change > tolerance:
+            regressions.append((name, reference, value, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=u'Runs the QNotifications benchmarks.')
+    parser.add_argument(u'--only', nargs=u'+', choices=SUITES, default=SUITES, help=u'the suites to run')
+    parser.add_argument(u'--output', help=u'file to write the results to as JSON')
+    parser.add_argument(u'--baseline', default=DEFAULT_BASELINE, help=u'baseline file to compare with')
+    parser.add_argument(u'--save-baseline', action=u'store_true', help=u'store the results as the baseline')
+    parser.add_argument(u'--no-baseline', action=u'store_true', help=u'do not compare the results with a baseline')
+    parser.add_argument(u'--tolerance', type=float, default=0.25,
+                        help=u'relative slowdown that is not reported as a regression (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    # A missing baseline would hide every regression, so it is an error unless comparing is turned off.
+    compare_baseline = not (args.save_baseline or args.no_baseline)
+    if compare_baseline and not os.path.exists(args.baseline):
+        print(u'No baseline found at {}; run with --save-baseline to create one, or pass --no-baseline.'.format(
+            args.baseline), file=sys.stderr)
+        return 2
+
+    results = run_suites(args.only)
+    print_results(results)
+
+    document = {
+        u'python': platform.python_version(),
+        u'platform': platform.platform(),
+        u'results': results,
+    }
+    if args.output:
+        with io.open(args.output, u'w', encoding=u'utf-8') as output:
+            output.write(json.dumps(document, indent=2, sort_keys=True))
+
+    if args.save_baseline:
+        # Keep the baseline results of suites that were not run.
+        if os.path.exists(args.baseline):
+            with io.open(args.baseline, encoding=u'utf-8') as stored:
+                previous = json.load(stored)[u'results']
+            previous.update(results)
+            document[u'results'] = previous
+        with io.open(args.baseline, u'w', encoding=u'utf-8') as output:
+            output.write(json.dumps(document, indent=2, sort_keys=True))
+        print(u'Baseline written to {}'.format(args.baseline))
+        return 0
+    if not compare_baseline:
+        return 0
+
+    with io.open(args.baseline, encoding=u'utf-8') as stored:
+        baseline = json.load(stored)[u'results']
+    regressions = compare(results, baseline, args.tolerance)
+    for name, reference, value, change in regressions:
+        print(u'REGRESSION {}: {:.6g} -> {:.6g} ({:+.0%})'.format(name, reference, value, change))
+    return 1 if regressions else 0
+
+
+if __name__ == u'__main__':
+    sys.exit(main())
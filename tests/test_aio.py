@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+""" Tests of the asyncio integration. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class AioTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        # The handles are resolved by the signals of the area, so the loop does not have to run.
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.target = QtWidgets.QWidget()
+        self.target.resize(400, 300)
+
+    def tearDown(self):
+        self.target.deleteLater()
+        self.app.processEvents()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def area(self, **kwargs):
+        from QNotifications import QNotificationArea
+        return QNotificationArea(self.target, **kwargs)
+
+    def test_shown_and_dismissed(self):
+        from QNotifications import aio
+        area = self.area(useQueue=False)
+        handle = aio.display(area, u'Uploading', u'info', None)
+        self.assertTrue(handle.shown.result())
+        self.assertFalse(handle.done())
+        handle.dismiss()
+        self.assertEqual(handle.dismissed.result(), u'api')
+
+    def test_queued_handle(self):
+        from QNotifications import aio
+        area = self.area(maxMessages=1)
+        first = aio.display(area, u'First', u'info', None)
+        second = aio.display(area, u'Second', u'info', None)
+        self.assertFalse(second.shown.done())
+        area.remove(first.notification, u'user')
+        self.assertEqual(first.dismissed.result(), u'user')
+        self.assertTrue(second.shown.result())
+        second.dismiss()
+        self.assertEqual(second.dismissed.result(), u'api')
+
+    def test_dropped_handle(self):
+        from QNotifications import aio
+        area = self.area(useQueue=False, rateLimits={u'info': (1, 1)})
+        aio.display(area, u'Allowed', u'info', None)
+        handle = aio.display(area, u'Throttled', u'info', None)
+        self.assertFalse(handle.shown.result())
+        self.assertEqual(handle.dismissed.result(), u'rate_limited')
+
+    def test_dismissed_handle_does_not_remove_reused_widget(self):
+        from QNotifications import aio
+        area = self.area(useQueue=False)
+        old = aio.display(area, u'Old', u'info', None)
+        old.dismiss()
+        new = aio.display(area, u'New', u'info', None)
+        old.dismiss()
+        self.assertFalse(new.done())
+        self.assertEqual(area.visibleCount(), 1)
+
+    def test_consume(self):
+        from QNotifications import aio
+        area = self.area(useQueue=False)
+
+        async def events():
+            for i in range(5):
+                yield u'Event {}'.format(i), u'info', None
+
+        count = self.loop.run_until_complete(aio.consume(area, events(), batch_size=2))
+        self.assertEqual(count, 5)
+        self.assertEqual(area.visibleCount(), 5)
+
+
+if __name__ == u'__main__':
+    unittest.main()
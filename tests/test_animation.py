@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+""" Tests of the AnimationDriver. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class AnimationDriverTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications.animation import AnimationDriver
+        self.driver = AnimationDriver()
+
+    def tick(self):
+        self.driver._AnimationDriver__tick()
+
+    def test_single_timer(self):
+        values = [[], []]
+        finished = []
+        for channel, setter in zip((u'x', u'y'), (values[0].append, values[1].append)):
+            self.driver.animate(self, channel, setter, 0.0, 1.0, 0, finished.append)
+        self.assertEqual(len(self.driver), 2)
+        self.assertTrue(self.driver._timer.isActive())
+        self.tick()
+        self.assertEqual(values, [[0.0, 1.0], [0.0, 1.0]])
+        self.assertEqual(finished, [self, self])
+        self.assertEqual(len(self.driver), 0)
+        self.assertFalse(self.driver._timer.isActive())
+
+    def test_animation_replaces_channel(self):
+        values = []
+        self.driver.animate(self, u'x', values.append, 0.0, 1.0, 0)
+        self.driver.animate(self, u'x', values.append, 1.0, 0.0, 0)
+        self.assertEqual(len(self.driver), 1)
+        self.tick()
+        self.assertEqual(values, [0.0, 1.0, 0.0])
+
+    def test_stop(self):
+        finished = []
+        self.driver.animate(self, u'x', lambda value: None, 0.0, 1.0, 1000, finished.append)
+        self.driver.animate(self, u'y', lambda value: None, 0.0, 1.0, 1000, finished.append)
+        self.driver.stop(self, u'x')
+        self.assertFalse(self.driver.isAnimating(self, u'x'))
+        self.assertTrue(self.driver.isAnimating(self))
+        self.driver.stop(self)
+        self.assertFalse(self.driver.isAnimating(self))
+        self.assertFalse(self.driver._timer.isActive())
+        self.assertEqual(finished, [])
+
+    def test_fade_in_removes_opacity_effect(self):
+        from QNotifications import QNotification
+        notification = QNotification(u'Saved', u'success')
+        notification.fadeIn(0, self.driver)
+        self.assertIsNotNone(notification.graphicsEffect())
+        self.tick()
+        self.assertIsNone(notification.graphicsEffect())
+        self.assertIsNone(notification.opacityEffect)
+
+    def test_fade_out(self):
+        from QNotifications import QNotification
+        notification = QNotification(u'Saved', u'success')
+        notification.display()
+        removed = []
+        notification.fadeOut(removed.append, 0, self.driver)
+        self.assertTrue(notification.isBeingRemoved)
+        self.tick()
+        self.assertEqual(removed, [notification])
+        self.assertEqual(notification.opacityEffect.opacity(), 0.0)
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+""" Tests of QNotificationArea. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtCore, QtGui, QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+# A message that wraps over several lines in a notification area of 400 pixels wide.
+LONG_MESSAGE = u' '.join([u'This message is long enough to wrap over several lines.'] * 4)
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class QNotificationAreaTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        self.target = QtWidgets.QWidget()
+        self.target.resize(400, 300)
+
+    def tearDown(self):
+        self.target.deleteLater()
+        self.app.processEvents()
+
+    def area(self, **kwargs):
+        from QNotifications import QNotificationArea
+        return QNotificationArea(self.target, **kwargs)
+
+    def click(self, area, x, y):
+        event = QtGui.QMouseEvent(QtCore.QEvent.MouseButtonPress, QtCore.QPointF(x, y), QtCore.Qt.LeftButton,
+                                  QtCore.Qt.LeftButton, QtCore.Qt.NoModifier)
+        area.mousePressEvent(event)
+
+    def test_display(self):
+        area = self.area(useQueue=False)
+        notification = area.display(u'Saved', u'success', None)
+        self.assertTrue(area.isShown(notification))
+
+    def test_handle_of_removed_notification(self):
+        area = self.area(useQueue=False)
+        old = area.display(u'Old', u'info', None)
+        widget = old.notification
+        area.remove(old)
+        new = area.display(u'New', u'info', None)
+        # The widget of the removed notification is reused, but the old handle no longer refers to it.
+        self.assertIs(new.notification, widget)
+        self.assertIsNone(old.notification)
+        self.assertFalse(area.isShown(old))
+        area.remove(old)
+        self.assertTrue(area.isShown(new))
+        self.assertEqual(old.dismissReason, u'api')
+
+    def test_pool_statistics(self):
+        area = self.area(useQueue=False, poolSize=2)
+        for i in range(5):
+            area.remove(area.display(u'Notification {}'.format(i), u'info', None))
+        self.assertEqual(area.poolStatistics(), {u'hits': 4, u'misses': 1, u'size': 1, u'maxSize': 2})
+
+    def test_reused_notification_fits_longer_message(self):
+        # The label only limits its height once it has been resized on screen.
+        self.target.show()
+        area = self.area(useQueue=False)
+        short = area.display(u'Short', u'info', None).notification
+        self.app.processEvents()
+        short_height = short.height()
+        area.remove(short)
+        notification = area.display(LONG_MESSAGE, u'info', None).notification
+        self.app.processEvents()
+        self.assertIs(notification, short)
+        fresh = self.area(useQueue=False, poolSize=0).display(LONG_MESSAGE, u'info', None).notification
+        self.app.processEvents()
+        self.assertGreater(fresh.height(), short_height * 2)
+        self.assertEqual(notification.height(), fresh.height())
+
+    def test_updated_notification_fits_longer_message(self):
+        self.target.show()
+        area = self.area(useQueue=False)
+        notification = area.display(u'Starting', u'info', None, key=u'job').notification
+        self.app.processEvents()
+        area.updateNotification(u'job', message=LONG_MESSAGE)
+        area._update_timer.timeout.emit()
+        self.app.processEvents()
+        fresh = area.display(LONG_MESSAGE, u'info', None).notification
+        self.app.processEvents()
+        self.assertEqual(notification.height(), fresh.height())
+        self.assertEqual(area.height(), area.sizeHint().height())
+
+    def test_painter_measures_rows_once(self):
+        area = self.area(useQueue=False, renderMode=u'painter')
+        for i in range(20):
+            area.display(u'Notification {}'.format(i), u'info', None)
+        area.grab()
+        area.mouseMoveEvent(QtGui.QMouseEvent(QtCore.QEvent.MouseMove, QtCore.QPointF(20, 20), QtCore.Qt.NoButton,
+                                              QtCore.Qt.NoButton, QtCore.Qt.NoModifier))
+        self.assertEqual(area.layoutStatistics()[u'measured'], 20)
+        self.assertEqual(area.height(), area._stack.height)
+
+    def test_painter_hit_test(self):
+        area = self.area(useQueue=False, renderMode=u'painter')
+        first = area.display(u'First', u'info', None).notification
+        second = area.display(u'Second', u'info', None).notification
+        x, y, width, height = area._stack.geometry(second)
+        self.assertEqual(area._painter.hit_test(area._stack, QtCore.QPoint(x + 5, y + 5)), (second, False))
+        self.assertEqual(area._painter.hit_test(area._stack, QtCore.QPoint(x + 5, y - 1)), (None, False))
+        self.click(area, x + width - 5, y + height // 2)
+        self.assertFalse(area.isShown(second))
+        self.assertTrue(area.isShown(first))
+        self.assertEqual(area._stack.geometry(first)[1], area._stack.margin)
+
+    def test_painter_row_follows_text(self):
+        area = self.area(useQueue=False, renderMode=u'painter')
+        notification = area.display(u'Starting', u'info', None, key=u'job').notification
+        below = area.display(u'Below', u'info', None).notification
+        short_height = area._stack.geometry(notification)[3]
+        area.updateNotification(u'job', message=LONG_MESSAGE)
+        area._update_timer.timeout.emit()
+        x, y, width, height = area._stack.geometry(notification)
+        self.assertGreater(height, short_height)
+        self.assertEqual(area._stack.geometry(below)[1], y + height + area._stack.spacing)
+        self.assertEqual(area.height(), area._stack.height)
+        self.assertEqual(area.layoutStatistics()[u'measured'], 3)
+
+    def test_display_many_measures_once(self):
+        notifications = [(u'Notification {}'.format(i), u'info', None) for i in range(30)]
+        many = self.area(useQueue=False)
+        many.displayMany(notifications)
+        single = self.area(useQueue=False)
+        for notification in notifications:
+            single.display(*notification)
+        self.assertEqual(many.layoutStatistics()[u'measured'], 30)
+        self.assertEqual(single.layoutStatistics()[u'measured'], 30)
+        self.assertEqual(many.height(), single.height())
+        self.assertEqual(len(many.heightCache), len(single.heightCache))
+
+    def test_remove_moves_rows_without_measuring(self):
+        area = self.area(useQueue=False)
+        notifications = [area.display(u'Notification {}'.format(i), u'info', None).notification for i in range(10)]
+        measured = area.layoutStatistics()[u'measured']
+        area.remove(notifications[0])
+        statistics = area.layoutStatistics()
+        self.assertEqual(statistics[u'measured'], measured)
+        self.assertEqual(statistics[u'moved'], 9)
+        self.assertEqual(notifications[1].y(), area._stack.margin)
+        self.assertEqual(area.height(), area._stack.height)
+
+    def test_empty_display_many_does_not_repaint(self):
+        self.target.show()
+        area = self.area(useQueue=False)
+        area.display(u'Saved', u'success', None)
+        self.app.processEvents()
+        paints = []
+        area.paintEvent = lambda event: paints.append(event)
+        for i in range(20):
+            self.assertEqual(area.displayMany([]), [])
+            self.app.processEvents()
+        self.assertEqual(paints, [])
+
+    def test_post_from_another_thread(self):
+        area = self.area(useQueue=False, postBatchSize=100)
+        requests = []
+        area._postRequested.connect(lambda: requests.append(None))
+        worker = threading.Thread(target=lambda: [area.post(u'Notification {}'.format(i), u'info', None)
+                                                  for i in range(250)])
+        worker.start()
+        worker.join()
+        # All posts before the first flush cost a single wake-up of the GUI thread.
+        self.app.processEvents()
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(area.visibleCount(), 0)
+        for count in (100, 200, 250):
+            area._post_timer.timeout.emit()
+            self.assertEqual(area.visibleCount(), count)
+        self.assertFalse(area._post_scheduled)
+        with self.assertRaises(ValueError):
+            area.post(u'Saved', u'unknown')
+
+    def test_coalesce_duplicates(self):
+        area = self.area(useQueue=False, coalesceWindow=60000)
+        first = area.display(u'Saved', u'success', None)
+        for i in range(2):
+            self.assertIs(area.display(u'Saved', u'success', None), first)
+        self.assertEqual(area.visibleCount(), 1)
+        self.assertEqual(first.notification.repeatCount, 3)
+        self.assertEqual(first.notification.message_display.text(), u'Saved \u00d73')
+        # Other messages, and messages that were removed, are not coalesced.
+        self.assertIsNot(area.display(u'Saved', u'info', None), first)
+        area.remove(first)
+        again = area.display(u'Saved', u'success', None)
+        self.assertIsNot(again, first)
+        self.assertEqual(again.notification.message_display.text(), u'Saved')
+
+    def test_coalesce_window(self):
+        area = self.area(useQueue=False, coalesceWindow=1)
+        first = area.display(u'Saved', u'success', None)
+        time.sleep(0.01)
+        self.assertIsNot(area.display(u'Saved', u'success', None), first)
+        self.assertEqual(area.visibleCount(), 2)
+
+    def test_coalesce_queued_duplicates(self):
+        area = self.area(maxMessages=1, coalesceWindow=60000)
+        first = area.display(u'First', u'info', None)
+        queued = area.display(u'Saved', u'success', None)
+        self.assertIs(area.display(u'Saved', u'success', None), queued)
+        self.assertEqual(len(area.queue), 1)
+        area.remove(first)
+        self.assertEqual(queued.notification.message_display.text(), u'Saved \u00d72')
+
+    def test_metrics(self):
+        self.assertIsNone(self.area().metricsSnapshot())
+        area = self.area(maxMessages=1, metrics=True)
+        first = area.display(u'First', u'info', None)
+        area.display(u'Second', u'info', None)
+        area.display(u'Third', u'info', None)
+        area.remove(first)
+        snapshot = area.metricsSnapshot()
+        counters = snapshot[u'counters']
+        self.assertEqual(counters[u'displayed'], 3)
+        self.assertEqual(counters[u'queued'], 2)
+        self.assertEqual(counters[u'dequeued'], 1)
+        self.assertEqual(counters[u'removed_other'], 1)
+        self.assertEqual(snapshot[u'gauges'], {u'queue_depth': 1, u'visible': 1, u'peak_visible': 1})
+        self.assertEqual(snapshot[u'histograms'][u'display_seconds'][u'count'], 3)
+        self.assertEqual(snapshot[u'histograms'][u'queue_seconds'][u'count'], 1)
+
+    def effects_area(self, entry_effect, exit_effect):
+        from QNotifications.animation import AnimationDriver
+        driver = AnimationDriver()
+        area = self.area(useQueue=False, animationDriver=driver)
+        area.setEntryEffect(entry_effect, 0)
+        area.setExitEffect(exit_effect, 0)
+        return area, driver._AnimationDriver__tick
+
+    def test_slide_in(self):
+        area, tick = self.effects_area(u'slideIn', None)
+        notification = area.display(u'Saved', u'success', None).notification
+        x, y, width, height = area._stack.geometry(notification)
+        self.assertEqual(notification.offsetX, area.width())
+        self.assertEqual(notification.x(), x + area.width())
+        tick()
+        self.assertEqual(notification.offsetX, 0)
+        self.assertEqual(notification.pos(), QtCore.QPoint(x, y))
+
+    def test_collapse(self):
+        area, tick = self.effects_area(None, u'collapse')
+        notifications = [area.display(u'Notification {}'.format(i), u'info', None).notification for i in range(3)]
+        positions = [notification.y() for notification in notifications]
+        height = area.height()
+        measured = area.layoutStatistics()[u'measured']
+        area.remove(notifications[0])
+        # The notifications below stay in place, and the area keeps its height, until they have moved up.
+        self.assertEqual([notification.y() for notification in notifications[1:]], positions[1:])
+        self.assertEqual(area.height(), height)
+        tick()
+        self.assertEqual([notification.y() for notification in notifications[1:]], positions[:2])
+        self.assertEqual(area.height(), area._stack.height)
+        self.assertEqual(area.layoutStatistics()[u'measured'], measured)
+
+    def test_slide_out(self):
+        area, tick = self.effects_area(None, u'slideOut')
+        first, second = [area.display(u'Notification {}'.format(i), u'info', None) for i in range(2)]
+        widget = second.notification
+        top = area._stack.geometry(first.notification)[1]
+        area.remove(first)
+        self.assertTrue(first.notification.isBeingRemoved)
+        self.assertTrue(area.isShown(second))
+        # The removed notification slides out first, and the one below moves up once it is gone.
+        tick()
+        self.assertFalse(area.isShown(first))
+        self.assertGreater(widget.offsetY, 0)
+        tick()
+        self.assertEqual(widget.y(), top)
+
+    def test_queued_notification_is_shown_when_room_is_made(self):
+        from QNotifications.records import QueuedNotification
+        area = self.area(maxMessages=1)
+        first = area.display(u'First', u'info', None)
+        second = area.display(u'Second', u'info', None)
+        self.assertIsInstance(second, QueuedNotification)
+        self.assertFalse(area.isShown(second))
+        area.remove(first)
+        self.assertTrue(area.isShown(second))
+        self.assertEqual(second.notification.message, u'Second')
+
+    def test_overflow_does_not_drop_expired_summary(self):
+        area = self.area(maxMessages=1, maxQueued=3, overflowPolicy=u'drop-oldest', expiredSummary=True)
+        area.display(u'Shown', u'info', None)
+        area.display(u'Stale', u'info', None, max_age=1)
+        time.sleep(0.01)
+        for i in range(4):
+            area.display(u'Notification {}'.format(i), u'info', None)
+        statistics = area.dropStatistics()
+        self.assertEqual(statistics[u'expired'], 1)
+        self.assertEqual(statistics[u'overflow'], 1)
+        self.assertEqual(len(area.queue), 3)
+        self.assertIsNotNone(area._expired_summary)
+
+    def test_keyed_updates_are_applied_together(self):
+        area = self.area(useQueue=False)
+        updated = []
+        area.notificationUpdated.connect(updated.append)
+        handle = area.display(u'Uploading', u'info', None, key=u'upload')
+        notification = handle.notification
+        for progress in (0.25, 0.5, 0.75):
+            self.assertTrue(area.updateNotification(u'upload', message=u'Uploading', progress=progress))
+        # A display with the same key updates the notification instead of showing another one.
+        self.assertIs(area.display(u'Upload finished', u'success', 3000, key=u'upload'), handle)
+        self.assertEqual(area.visibleCount(), 1)
+        self.assertEqual(notification.message, u'Uploading')
+        area._update_timer.timeout.emit()
+        self.assertEqual(updated, [notification])
+        self.assertEqual(notification.message_display.text(), u'Upload finished')
+        self.assertEqual(notification.category, u'success')
+        self.assertEqual(notification.timeout, 3000)
+        self.assertEqual(notification.progress_bar.value(), 750)
+        area.updateNotification(u'upload', progress=None)
+        area._update_timer.timeout.emit()
+        self.assertTrue(notification.progress_bar.isHidden())
+
+    def test_update_unknown_key(self):
+        area = self.area(useQueue=False)
+        self.assertFalse(area.updateNotification(u'upload', message=u'Uploading'))
+        handle = area.display(u'Uploading', u'info', None, key=u'upload')
+        area.remove(handle)
+        self.assertFalse(area.updateNotification(u'upload', message=u'Uploading'))
+        with self.assertRaises(ValueError):
+            area.updateNotification(u'upload', category=u'unknown')
+
+    def test_queued_update_with_progress(self):
+        area = self.area(maxMessages=1)
+        first = area.display(u'First', u'info', None)
+        queued = area.display(u'Uploading', u'info', None, key=u'upload')
+        area.updateNotification(u'upload', progress=0.5)
+        area._update_timer.timeout.emit()
+        area.remove(first)
+        self.assertEqual(queued.notification.progress_bar.value(), 500)
+        self.assertTrue(area.updateNotification(u'upload', progress=1.0))
+
+    def test_update_with_callable_message(self):
+        area = self.area(useQueue=False)
+        notification = area.display(u'Starting', u'info', None, key=u'job')
+        area.display(lambda: u'Finished', u'success', None, key=u'job')
+        area._update_timer.timeout.emit()
+        self.assertEqual(notification.notification.message, u'Finished')
+
+    def test_queued_update_with_callable_message(self):
+        calls = []
+
+        def message():
+            calls.append(None)
+            return u'Finished'
+
+        area = self.area(maxMessages=1)
+        first = area.display(u'First', u'info', None)
+        queued = area.display(u'Starting', u'info', None, key=u'job')
+        area.updateNotification(u'job', message=message)
+        area._update_timer.timeout.emit()
+        self.assertEqual(calls, [])
+        area.remove(first)
+        self.assertEqual(queued.notification.message, u'Finished')
+        self.assertEqual(len(calls), 1)
+
+    def test_dropped_callable_message_is_not_formatted(self):
+        calls = []
+
+        def message():
+            calls.append(None)
+            return u'Throttled'
+
+        area = self.area(useQueue=False, rateLimits={u'info': (1, 1)})
+        for i in range(100):
+            area.display(message, u'info', None)
+        self.assertEqual(area.dropStatistics()[u'rateLimited'], 99)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == u'__main__':
+    unittest.main()
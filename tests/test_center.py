@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+""" Tests of NotificationCenter. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtCore, QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class NotificationCenterTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications.center import NotificationCenter
+        self.center = NotificationCenter(maxVisible=2)
+        self.target = QtWidgets.QWidget()
+        self.target.resize(400, 300)
+
+    def tearDown(self):
+        self.target.deleteLater()
+        self.center.deleteLater()
+        self.app.processEvents()
+
+    def dispatch(self):
+        self.center._tick.timeout.emit()
+
+    def test_budget(self):
+        area = self.center.createArea(self.target, key=u'main')
+        for i in range(3):
+            self.center.display(u'Notification {}'.format(i), u'info', None, key=u'main')
+        self.dispatch()
+        self.assertEqual(self.center.visibleCount(), 2)
+        self.assertEqual(self.center.pendingCount(), 1)
+        area.remove(area._visible[0])
+        self.dispatch()
+        self.assertEqual(self.center.visibleCount(), 2)
+        self.assertEqual(self.center.pendingCount(), 0)
+        self.assertEqual(area.visibleCount(), 2)
+
+    def test_topics(self):
+        editor = self.center.createArea(self.target, key=u'editor', topics=[u'build'])
+        console = self.center.createArea(QtWidgets.QWidget(self.target), topics=[u'build'])
+        self.assertEqual(self.center.display(u'Build failed', u'danger', None, topic=u'build'), 2)
+        self.assertEqual(self.center.display(u'Nobody listens', u'info', None, topic=u'other'), 0)
+        self.dispatch()
+        self.assertEqual((editor.visibleCount(), console.visibleCount()), (1, 1))
+        with self.assertRaises(ValueError):
+            self.center.display(u'Saved', u'success', None, key=u'unknown')
+        with self.assertRaises(ValueError):
+            self.center.createArea(QtWidgets.QWidget(self.target), key=u'editor')
+
+    def test_register_again(self):
+        area = self.center.createArea(self.target, key=u'main')
+        self.center.unregister(area)
+        self.center.register(area, u'main')
+        self.center.display(u'First', u'info', None, key=u'main')
+        self.dispatch()
+        self.assertEqual(self.center.visibleCount(), 1)
+        area.remove(area._visible[0])
+        self.assertEqual(self.center.visibleCount(), 0)
+        for i in range(2):
+            self.center.display(u'Notification {}'.format(i), u'info', None, key=u'main')
+        self.dispatch()
+        self.assertEqual(self.center.pendingCount(), 0)
+        self.assertEqual(area.visibleCount(), 2)
+
+    def test_unregister_on_destroy(self):
+        area = self.center.createArea(self.target, key=u'main')
+        self.center.display(u'First', u'info', None, key=u'main')
+        self.dispatch()
+        area.deleteLater()
+        QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        self.assertIsNone(self.center.area(u'main'))
+        self.assertEqual(self.center.visibleCount(), 0)
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+""" Tests of the rate limits. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import unittest
+
+from QNotifications.flowcontrol import RateLimiter, TokenBucket
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst(self):
+        bucket = TokenBucket(1, 3)
+        self.assertEqual([bucket.consume(0.0) for _ in range(4)], [True, True, True, False])
+
+    def test_refill(self):
+        bucket = TokenBucket(2, 1)
+        self.assertTrue(bucket.consume(0.0))
+        self.assertFalse(bucket.consume(0.25))
+        self.assertTrue(bucket.consume(0.5))
+        # Tokens do not accumulate beyond the capacity.
+        self.assertTrue(bucket.consume(100.0))
+        self.assertFalse(bucket.consume(100.0))
+
+    def test_default_capacity(self):
+        self.assertEqual(TokenBucket(5).capacity, 5)
+        self.assertEqual(TokenBucket(0.5).capacity, 1)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_limits_per_category(self):
+        limiter = RateLimiter({u'info': (1, 2), u'warning': 1})
+        self.assertEqual([limiter.allow(u'info', 0.0) for _ in range(3)], [True, True, False])
+        self.assertEqual([limiter.allow(u'warning', 0.0) for _ in range(2)], [True, False])
+        self.assertTrue(all(limiter.allow(u'danger', 0.0) for _ in range(100)))
+
+
+if __name__ == u'__main__':
+    unittest.main()
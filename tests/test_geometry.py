@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+""" Tests of the StackLayout. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import unittest
+
+from QNotifications.geometry import StackLayout
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class Row(object):
+
+    def __init__(self, height):
+        self.height = height
+
+
+class StackLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        # Rows that are wider than 100 pixels are half as high.
+        self.stack = StackLayout(lambda row, width: row.height // (2 if width > 100 else 1), margin=10, spacing=5)
+        self.stack.width = 100
+        self.rows = [Row(height) for height in (20, 40, 30)]
+        for row in self.rows:
+            self.stack.append(row)
+
+    def tops(self):
+        return [self.stack.geometry(row)[1] for row in self.stack]
+
+    def test_append(self):
+        self.assertEqual(self.tops(), [10, 35, 80])
+        self.assertEqual(self.stack.geometry(self.rows[1]), (10, 35, 80, 40))
+        self.assertEqual(self.stack.height, 120)
+        self.assertEqual(self.stack.measured, 3)
+        self.assertEqual(self.stack.passes, 0)
+
+    def test_empty(self):
+        stack = StackLayout(lambda row, width: 10)
+        self.assertEqual(stack.height, 0)
+        self.assertIsNone(stack.rowAt(0))
+
+    def test_remove_moves_rows_below(self):
+        moved = self.stack.remove(self.rows[0])
+        self.assertEqual(moved, [(self.rows[1], (10, 10, 80, 40)), (self.rows[2], (10, 55, 80, 30))])
+        self.assertNotIn(self.rows[0], self.stack)
+        self.assertEqual(self.stack.height, 95)
+        self.assertEqual(self.stack.measured, 3)
+        self.assertEqual(self.stack.moved, 2)
+        self.assertEqual(self.stack.remove(self.rows[2]), [])
+        self.assertEqual(self.stack.height, 60)
+
+    def test_update(self):
+        self.assertEqual(self.stack.update(self.rows[0]), [])
+        self.rows[0].height = 30
+        changed = self.stack.update(self.rows[0])
+        self.assertEqual([row for row, geometry in changed], self.rows)
+        self.assertEqual(self.tops(), [10, 45, 90])
+        self.assertEqual(self.stack.height, 130)
+        self.assertEqual(self.stack.measured, 5)
+
+    def test_relayout(self):
+        geometries = self.stack.relayout(220)
+        self.assertEqual([row for row, geometry in geometries], self.rows)
+        self.assertEqual(self.stack.geometry(self.rows[2]), (10, 50, 200, 15))
+        self.assertEqual(self.stack.passes, 1)
+        self.assertEqual(self.stack.measured, 6)
+
+    def test_row_at(self):
+        self.assertIsNone(self.stack.rowAt(5))
+        self.assertIs(self.stack.rowAt(10), self.rows[0])
+        self.assertIs(self.stack.rowAt(29), self.rows[0])
+        # The space between two rows.
+        self.assertIsNone(self.stack.rowAt(32))
+        self.assertIs(self.stack.rowAt(35), self.rows[1])
+        self.assertIs(self.stack.rowAt(109), self.rows[2])
+        self.assertIsNone(self.stack.rowAt(110))
+
+
+if __name__ == u'__main__':
+    unittest.main()
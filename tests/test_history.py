@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+""" Tests of the history log and NotificationHistory. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from QNotifications.history import HistoryLog, NotificationHistory
+from QNotifications.records import HistoryRecord
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class HistoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fields(self, records):
+        return [(r.timestamp, r.category, r.message, r.reason) for r in records]
+
+
+class HistoryLogTest(HistoryTestCase):
+
+    def test_round_trip(self):
+        log = HistoryLog(self.directory)
+        written = [HistoryRecord(1.0, u'info', u'First', u'timeout'),
+                   HistoryRecord(2.0, u'danger', u'Caf\u00e9 \u2715', u'user'),
+                   HistoryRecord(3.0, u'success', u'', None)]
+        for record in written:
+            log.append(record)
+        self.assertEqual(self.fields(log), self.fields(written))
+        self.assertEqual(self.fields(log.tail(2)), self.fields(written[1:]))
+        self.assertEqual(self.fields(log.range(2.0, 3.0)), self.fields(written[1:2]))
+        log.close()
+
+        # The records of a previous session are read from the segment files.
+        log = HistoryLog(self.directory)
+        self.assertEqual(self.fields(log), self.fields(written))
+        log.append(HistoryRecord(4.0, u'warning', u'Fourth', u'expired'))
+        self.assertEqual(self.fields(log.tail(1)), [(4.0, u'warning', u'Fourth', u'expired')])
+        log.close()
+
+    def test_rotation(self):
+        log = HistoryLog(self.directory, segment_size=128, max_segments=2)
+        for i in range(40):
+            log.append(HistoryRecord(float(i), u'info', u'Message {:02d}'.format(i), u'timeout'))
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        records = list(log)
+        # The oldest segments were deleted, and the remaining records are the most recent ones, in order.
+        self.assertEqual(records[-1].message, u'Message 39')
+        self.assertEqual([r.timestamp for r in records], [float(i) for i in range(40 - len(records), 40)])
+        self.assertEqual(self.fields(log.tail(len(records))), self.fields(records))
+        self.assertEqual(self.fields(log.range(38.0)), self.fields(records[-2:]))
+        log.close()
+
+    def test_truncates_long_messages(self):
+        log = HistoryLog(self.directory, segment_size=64)
+        log.append(HistoryRecord(1.0, u'info', u'x' * 1000))
+        message = log.tail(1)[0].message
+        self.assertTrue(0 < len(message) < 64)
+        self.assertEqual(message, u'x' * len(message))
+        log.close()
+
+
+class NotificationHistoryTest(HistoryTestCase):
+
+    def test_ring_buffer(self):
+        history = NotificationHistory(capacity=3)
+        for i in range(5):
+            history.record(u'Message {}'.format(i), u'info', u'timeout', timestamp=float(i))
+        self.assertEqual(len(history), 3)
+        self.assertEqual([r.message for r in history.recent()], [u'Message 2', u'Message 3', u'Message 4'])
+        self.assertEqual([r.message for r in history.range(3.0)], [u'Message 3', u'Message 4'])
+
+    def test_durable_history(self):
+        history = NotificationHistory(self.directory, capacity=2)
+        for i in range(5):
+            history.record(u'Message {}'.format(i), u'info', u'user', timestamp=float(i))
+        # Records that are no longer in the ring buffer are read from the log.
+        self.assertEqual([r.message for r in history.tail(4)],
+                         [u'Message 1', u'Message 2', u'Message 3', u'Message 4'])
+        history.close()
+
+        history = NotificationHistory(self.directory, capacity=2)
+        self.assertEqual([r.message for r in history.recent()], [u'Message 3', u'Message 4'])
+        self.assertEqual(len(history.range(0.0)), 5)
+        history.close()
+
+    def test_closed_history(self):
+        # An area flushes the history when it is destroyed, which can be after the application closed it.
+        history = NotificationHistory(self.directory)
+        history.record(u'Saved', u'success', u'timeout')
+        history.close()
+        history.flush()
+        history.record(u'Removed on shutdown', u'info', u'api')
+        history.close()
+        self.assertEqual([r.message for r in history.recent()], [u'Saved'])
+        log = HistoryLog(self.directory)
+        log.close()
+        log.flush()
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+""" Tests of the notification metrics and their export. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from QNotifications.metrics import Histogram, NotificationMetrics
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_snapshot(self):
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.snapshot(), {
+            u'buckets': [(1.0, 2), (2.0, 3), (u'+Inf', 4)],
+            u'sum': 6.0,
+            u'count': 4,
+        })
+
+
+class NotificationMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_snapshot(self):
+        metrics = NotificationMetrics()
+        metrics.increment(u'displayed', 3)
+        metrics.registerGauge(u'visible', lambda: 2)
+        metrics.observeVisible(5)
+        metrics.observeVisible(1)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot[u'counters'][u'displayed'], 3)
+        self.assertEqual(snapshot[u'gauges'], {u'visible': 2, u'peak_visible': 5})
+        self.assertEqual(snapshot[u'histograms'][u'queue_seconds'][u'count'], 0)
+
+    def test_invalid_counter_and_format(self):
+        with self.assertRaises(KeyError):
+            NotificationMetrics().increment(u'unknown')
+        with self.assertRaises(ValueError):
+            NotificationMetrics(export_format=u'xml')
+
+    def test_prometheus(self):
+        metrics = NotificationMetrics(labels={u'area': u'editor'})
+        metrics.increment(u'removed_user')
+        metrics.displayTime.observe(0.002)
+        text = metrics.toPrometheus()
+        self.assertIn(u'# TYPE qnotifications_removed_user_total counter\n', text)
+        self.assertIn(u'qnotifications_removed_user_total{area="editor"} 1\n', text)
+        self.assertIn(u'qnotifications_display_seconds_bucket{area="editor",le="0.0025"} 1\n', text)
+        self.assertIn(u'qnotifications_display_seconds_bucket{area="editor",le="+Inf"} 1\n', text)
+        self.assertIn(u'qnotifications_display_seconds_count{area="editor"} 1\n', text)
+        self.assertTrue(text.endswith(u'\n'))
+
+    def test_export_to_file(self):
+        path = os.path.join(self.directory, u'metrics.json')
+        metrics = NotificationMetrics(export_to=path)
+        metrics.increment(u'queued')
+        metrics.export()
+        with io.open(path, encoding=u'utf-8') as exported:
+            self.assertEqual(json.load(exported)[u'counters'][u'queued'], 1)
+        metrics.increment(u'queued')
+        metrics.export()
+        with io.open(path, encoding=u'utf-8') as exported:
+            self.assertEqual(json.load(exported)[u'counters'][u'queued'], 2)
+        self.assertEqual(os.listdir(self.directory), [u'metrics.json'])
+
+    def test_export_to_callable(self):
+        exported = []
+        NotificationMetrics(export_to=exported.append, export_format=u'prometheus').export()
+        self.assertEqual(len(exported), 1)
+        self.assertIn(u'qnotifications_displayed_total 0\n', exported[0])
+        # Without a destination, nothing is exported.
+        NotificationMetrics().export()
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+""" Tests of the notification center panel and its model. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class NotificationListModelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications.QNotificationPanel import NotificationListModel
+        self.model = NotificationListModel()
+        for i, category in enumerate((u'info', u'danger', u'info', u'success')):
+            self.model.append(float(i), category, u'Message {}'.format(i))
+
+    def messages(self):
+        return [self.model.data(self.model.index(row, 0)) for row in range(self.model.rowCount())]
+
+    def test_most_recent_first(self):
+        from QNotifications.QNotificationPanel import CATEGORY_ROLE, REASON_ROLE, TIMESTAMP_ROLE
+        self.assertEqual(self.messages(), [u'Message 3', u'Message 2', u'Message 1', u'Message 0'])
+        index = self.model.index(0, 0)
+        self.assertEqual(self.model.data(index, CATEGORY_ROLE), u'success')
+        self.assertEqual(self.model.data(index, TIMESTAMP_ROLE), 3.0)
+        self.assertIsNone(self.model.data(index, REASON_ROLE))
+
+    def test_filter(self):
+        self.model.setFilter([u'info'])
+        self.assertEqual(self.messages(), [u'Message 2', u'Message 0'])
+        self.model.setFilter([u'info', u'danger'], u'MESSAGE 1')
+        self.assertEqual(self.messages(), [u'Message 1'])
+        # Entries that are added while a filter is set are only listed if they match it.
+        self.model.append(4.0, u'danger', u'Message 10')
+        self.model.append(5.0, u'info', u'Message 5')
+        self.assertEqual(self.messages(), [u'Message 10', u'Message 1'])
+        self.model.setFilter()
+        self.assertEqual(self.model.rowCount(), 6)
+
+    def test_update_and_reason(self):
+        changed = []
+        self.model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+        self.model.setFilter(text=u'message')
+        self.model.setReason(1, u'user')
+        self.model.update(3, u'warning', u'Message 3 (updated)')
+        self.assertEqual(changed, [2, 0])
+        self.assertEqual(self.model.store.record(1).reason, u'user')
+        self.assertEqual(self.model.store.category(3), u'warning')
+        # An entry that no longer matches the filter is removed from the list.
+        self.model.update(0, u'info', u'Other')
+        self.assertEqual(self.messages(), [u'Message 3 (updated)', u'Message 2', u'Message 1'])
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class QNotificationPanelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications import QNotificationArea
+        from QNotifications.QNotificationPanel import QNotificationPanel
+        self.target = QtWidgets.QWidget()
+        self.target.resize(400, 300)
+        self.area = QNotificationArea(self.target, useQueue=False, rateLimits={u'warning': (1, 1)})
+        self.panel = QNotificationPanel(self.area)
+
+    def tearDown(self):
+        self.panel.deleteLater()
+        self.target.deleteLater()
+        self.app.processEvents()
+
+    def test_lists_notifications_of_area(self):
+        from QNotifications.QNotificationPanel import REASON_ROLE
+        model = self.panel.model
+        shown = self.area.display(u'Uploading', u'info', None, key=u'upload')
+        self.area.updateNotification(u'upload', message=u'Uploaded', category=u'success')
+        self.area._update_timer.timeout.emit()
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.data(model.index(0, 0)), u'Uploaded')
+        self.area.remove(shown)
+        self.assertEqual(model.data(model.index(0, 0), REASON_ROLE), u'api')
+
+    def test_lists_dropped_notifications(self):
+        from QNotifications.QNotificationPanel import REASON_ROLE
+        model = self.panel.model
+        self.area.display(u'Low disk space', u'warning', None)
+        self.area.display(u'Low disk space', u'warning', None)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.data(model.index(0, 0), REASON_ROLE), u'rate_limited')
+
+    def test_filter(self):
+        self.area.display(u'Saved', u'success', None)
+        self.area.display(u'Failed', u'danger', None)
+        self.panel.categoryButtons[u'danger'].setChecked(False)
+        self.assertEqual(self.panel.model.rowCount(), 1)
+        self.panel.searchField.setText(u'fail')
+        self.panel._search_timer.timeout.emit()
+        self.assertEqual(self.panel.model.rowCount(), 0)
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+""" Tests of the NotificationPool. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class NotificationPoolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def pool(self, **kwargs):
+        from QNotifications import QNotification
+        from QNotifications.pool import NotificationPool
+        return NotificationPool(QNotification, **kwargs)
+
+    def test_reuse(self):
+        pool = self.pool()
+        first = pool.acquire(u'First', u'info')
+        pool.release(first)
+        self.assertEqual(pool.size, 1)
+        second = pool.acquire(u'Second', u'danger', 1000, u'Close')
+        self.assertIs(second, first)
+        self.assertEqual(second.message, u'Second')
+        self.assertEqual(second.category, u'danger')
+        self.assertEqual(second.close_button.text(), u'Close')
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+        self.assertEqual(pool.hitRate, 0.5)
+
+    def test_reset_clears_state(self):
+        pool = self.pool()
+        notification = pool.acquire(u'Uploading', u'info', None, u'Close')
+        notification.key = u'upload'
+        notification.setRepeatCount(3)
+        notification.setProgress(0.5)
+        notification.dismissReason = u'user'
+        pool.release(notification)
+        notification = pool.acquire(u'Saved', u'success')
+        self.assertIsNone(notification.key)
+        self.assertIsNone(notification.dismissReason)
+        self.assertIsNone(notification.record)
+        self.assertEqual(notification.repeatCount, 1)
+        self.assertEqual(notification.close_button.text(), u'\u2715')
+        self.assertFalse(notification.isBeingRemoved)
+        notification.display()
+        self.assertEqual(notification.message_display.text(), u'Saved')
+
+    def test_high_water_mark(self):
+        pool = self.pool(max_size=2)
+        notifications = [pool.acquire(u'Notification {}'.format(i), u'info') for i in range(3)]
+        for notification in notifications:
+            pool.release(notification)
+        self.assertEqual(pool.size, 2)
+        self.assertEqual(pool.misses, 3)
+
+    def test_disabled(self):
+        pool = self.pool(max_size=0)
+        pool.release(pool.acquire(u'Saved', u'info'))
+        self.assertEqual(pool.size, 0)
+        pool.acquire(u'Saved', u'info')
+        self.assertEqual(pool.hits, 0)
+
+    def test_trim(self):
+        pool = self.pool(idle_timeout=1)
+        pool.release(pool.acquire(u'Saved', u'info'))
+        pool.idleTimeout = 60000
+        pool.trim()
+        self.assertEqual(pool.size, 1)
+        pool.idleTimeout = 1
+        pool._idle[0] = (pool._idle[0][0], pool._idle[0][1] - 1)
+        pool.trim()
+        self.assertEqual(pool.size, 0)
+        self.assertFalse(pool._trim_timer.isActive())
+
+    def test_invalid_category_keeps_widget(self):
+        pool = self.pool()
+        pool.release(pool.acquire(u'Saved', u'info'))
+        with self.assertRaises(ValueError):
+            pool.acquire(u'Saved', u'unknown')
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(pool.hits, 0)
+
+
+if __name__ == u'__main__':
+    unittest.main()
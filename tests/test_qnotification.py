@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+""" Smoke tests of QNotification. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class QNotificationTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def test_construct(self):
+        from QNotifications import QNotification
+        notification = QNotification(u'Saved', u'success', 1000)
+        self.assertEqual(notification.message, u'Saved')
+        self.assertEqual(notification.category, u'success')
+        self.assertEqual(notification.close_button.text(), u'\u2715')
+
+    def test_construct_with_button_text(self):
+        from QNotifications import QNotification
+        notification = QNotification(u'Saved', u'info', None, u'Close')
+        self.assertEqual(notification.close_button.text(), u'Close')
+
+    def test_invalid_category(self):
+        from QNotifications import QNotification
+        with self.assertRaises(ValueError):
+            QNotification(u'Saved', u'unknown')
+
+    def test_style_engine(self):
+        from QNotifications import QNotification
+        from QNotifications.styling import StyleEngine
+        notification = QNotification(u'Saved', u'warning', None, u'Close')
+        notification.setStyleEngine(StyleEngine.instance())
+        notification.setStyleEngine(None)
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+""" Tests of the schedulers and the DeadlineHeap. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import unittest
+
+from QNotifications.scheduler import DeadlineHeap, Empty, FifoScheduler, PriorityScheduler
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+def drain(scheduler):
+    items = []
+    while True:
+        try:
+            items.append(scheduler.pop())
+        except Empty:
+            return items
+
+
+class FifoSchedulerTest(unittest.TestCase):
+
+    def test_order(self):
+        scheduler = FifoScheduler()
+        for item, priority in ((u'a', 0), (u'b', 10), (u'c', -5)):
+            scheduler.push(item, priority)
+        self.assertEqual(len(scheduler), 3)
+        self.assertEqual(scheduler.peek_priority(), 0)
+        self.assertEqual(drain(scheduler), [u'a', u'b', u'c'])
+        self.assertIsNone(scheduler.peek_priority())
+
+    def test_remove(self):
+        scheduler = FifoScheduler()
+        items = [object() for _ in range(5)]
+        for item in items:
+            scheduler.push(item)
+        self.assertTrue(scheduler.remove(items[2]))
+        self.assertFalse(scheduler.remove(items[2]))
+        self.assertEqual(len(scheduler), 4)
+        self.assertEqual(drain(scheduler), [items[0], items[1], items[3], items[4]])
+
+    def test_oldest_and_last_skip_removed_items(self):
+        scheduler = FifoScheduler()
+        items = [object() for _ in range(4)]
+        for item in items:
+            scheduler.push(item)
+        scheduler.remove(items[0])
+        scheduler.remove(items[3])
+        self.assertIs(scheduler.oldest(), items[1])
+        self.assertEqual(scheduler.last(), (items[2], 0))
+        scheduler.remove(items[1])
+        scheduler.remove(items[2])
+        self.assertIsNone(scheduler.oldest())
+        self.assertIsNone(scheduler.last())
+        self.assertEqual(len(scheduler), 0)
+
+
+class PrioritySchedulerTest(unittest.TestCase):
+
+    def test_order(self):
+        scheduler = PriorityScheduler()
+        for item, priority in ((u'low', 0), (u'high', 10), (u'first', 5), (u'second', 5)):
+            scheduler.push(item, priority)
+        self.assertEqual(scheduler.peek_priority(), 10)
+        self.assertEqual(drain(scheduler), [u'high', u'first', u'second', u'low'])
+
+    def test_oldest_and_last(self):
+        scheduler = PriorityScheduler()
+        scheduler.push(u'a', 5)
+        scheduler.push(u'b', 1)
+        scheduler.push(u'c', 1)
+        scheduler.push(u'd', 9)
+        self.assertEqual(scheduler.oldest(), u'a')
+        self.assertEqual(scheduler.last(), (u'c', 1))
+
+    def test_remove(self):
+        scheduler = PriorityScheduler()
+        items = [object() for _ in range(3)]
+        for priority, item in enumerate(items):
+            scheduler.push(item, priority)
+        self.assertTrue(scheduler.remove(items[2]))
+        self.assertFalse(scheduler.remove(items[2]))
+        self.assertEqual(scheduler.peek_priority(), 1)
+        self.assertEqual(drain(scheduler), [items[1], items[0]])
+
+
+class DeadlineHeapTest(unittest.TestCase):
+
+    def test_pop_expired_in_order(self):
+        heap = DeadlineHeap()
+        a, b, c = object(), object(), object()
+        heap.schedule(b, 2.0, u'b')
+        heap.schedule(a, 1.0, u'a')
+        heap.schedule(c, 3.0, u'c')
+        self.assertEqual(heap.next_deadline(), 1.0)
+        self.assertEqual(heap.pop_expired(2.0), [(a, u'a'), (b, u'b')])
+        self.assertEqual(len(heap), 1)
+        self.assertNotIn(a, heap)
+        self.assertIn(c, heap)
+        self.assertEqual(heap.pop_expired(2.5), [])
+
+    def test_cancel(self):
+        heap = DeadlineHeap()
+        a, b = object(), object()
+        heap.schedule(a, 1.0, u'payload')
+        heap.schedule(b, 2.0)
+        self.assertEqual(heap.cancel(a), u'payload')
+        self.assertIsNone(heap.cancel(a))
+        self.assertIsNone(heap.deadline(a))
+        self.assertEqual(heap.next_deadline(), 2.0)
+        self.assertEqual(heap.pop_expired(5.0), [(b, None)])
+        self.assertIsNone(heap.next_deadline())
+
+    def test_reschedule_replaces_deadline(self):
+        heap = DeadlineHeap()
+        a = object()
+        heap.schedule(a, 1.0, u'first')
+        heap.schedule(a, 4.0, u'second')
+        self.assertEqual(len(heap), 1)
+        self.assertEqual(heap.deadline(a), 4.0)
+        self.assertEqual(heap.pop_expired(3.0), [])
+        self.assertEqual(heap.pop_expired(4.0), [(a, u'second')])
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+""" Tests of the shared memory RingBuffer and SharedMemoryBridge (Python 3.8 or newer). """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+try:
+    from QNotifications.shm import RingBuffer
+except ImportError:
+    RingBuffer = None
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(RingBuffer is None, u'multiprocessing.shared_memory is not available')
+class RingBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = RingBuffer(capacity=4, slot_size=32)
+
+    def tearDown(self):
+        self.ring.close()
+        self.ring.unlink()
+
+    def fields(self, records):
+        return [(r.message, r.category, r.timeout) for r in records]
+
+    def test_put_and_drain(self):
+        self.assertTrue(self.ring.put(u'Saved', u'success', 2000))
+        self.assertTrue(self.ring.put(u'Failed', u'danger', None))
+        self.assertEqual(len(self.ring), 2)
+        self.assertEqual(self.fields(self.ring.drain()), [(u'Saved', u'success', 2000), (u'Failed', u'danger', None)])
+        self.assertEqual(len(self.ring), 0)
+        self.assertEqual(self.ring.drain(), [])
+
+    def test_full_ring_drops(self):
+        for i in range(4):
+            self.assertTrue(self.ring.put(u'Message {}'.format(i), u'info'))
+        self.assertFalse(self.ring.put(u'Message 4', u'info'))
+        self.assertEqual(self.ring.dropped, 1)
+        self.assertEqual([r.message for r in self.ring.drain(2)], [u'Message 0', u'Message 1'])
+        self.assertEqual(len(self.ring), 2)
+
+    def test_wraparound(self):
+        received = []
+        for i in range(11):
+            self.assertTrue(self.ring.put(u'Message {}'.format(i), u'info'))
+            if i % 3 == 2:
+                received.extend(r.message for r in self.ring.drain())
+        received.extend(r.message for r in self.ring.drain())
+        self.assertEqual(received, [u'Message {}'.format(i) for i in range(11)])
+
+    def test_truncation(self):
+        # A slot of 32 bytes holds 24 bytes of message; a character that is cut in half is dropped.
+        self.ring.put(u'x' * 100, u'info')
+        self.ring.put(u'x' * 23 + u'\u00e9', u'info')
+        messages = [r.message for r in self.ring.drain()]
+        self.assertEqual(messages, [u'x' * 24, u'x' * 23])
+
+    def test_invalid_category(self):
+        with self.assertRaises(ValueError):
+            self.ring.put(u'Saved', u'unknown')
+
+    def test_attach(self):
+        worker = RingBuffer.attach(self.ring.name)
+        self.assertEqual((worker.capacity, worker.slotSize), (4, 32))
+        worker.put(u'From the worker', u'warning', 100)
+        worker.close()
+        self.assertEqual(self.fields(self.ring.drain()), [(u'From the worker', u'warning', 100)])
+
+
+
+@unittest.skipIf(RingBuffer is None or QtWidgets is None, u'Qt or multiprocessing.shared_memory is not available')
+class SharedMemoryBridgeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications import QNotificationArea
+        from QNotifications.shmbridge import SharedMemoryBridge
+        self.target = QtWidgets.QWidget()
+        self.target.resize(400, 300)
+        self.area = QNotificationArea(self.target, useQueue=False)
+        self.bridge = SharedMemoryBridge(self.area)
+        self.ring = self.bridge.createChannel(capacity=8, slot_size=64)
+
+    def tearDown(self):
+        self.bridge.close()
+        self.target.deleteLater()
+        self.app.processEvents()
+
+    def test_poll(self):
+        batches = []
+        display_many = self.area.displayMany
+        self.area.displayMany = lambda records: batches.append(len(records)) or display_many(records)
+        self.bridge.poll()
+        self.assertEqual(batches, [])
+        worker = RingBuffer.attach(self.ring.name)
+        worker.put(u'From the worker', u'info', None)
+        worker.put(u'Done', u'success', None)
+        worker.close()
+        self.bridge.poll()
+        self.bridge.poll()
+        self.assertEqual(batches, [2])
+        self.assertEqual(self.area.visibleCount(), 2)
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+""" Tests of the StyleEngine. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtGui, QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class StyleEngineTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def test_overridden_default_styles(self):
+        from QNotifications import QNotificationArea
+
+        class CustomArea(QNotificationArea):
+            default_notification_styles = u"""
+                QNotification { font-size: 12px; border-radius: 3px; }
+                QNotification #message { color: #000000; }
+                QNotification#info { background-color: #abcdef; }
+            """
+
+        target = QtWidgets.QWidget()
+        engine = CustomArea(target).styleEngine
+        self.assertEqual(engine.style(u'info').background, QtGui.QColor(u'#abcdef'))
+        self.assertEqual(engine.style(u'danger').background, QtGui.QColor(u'#d9534f'))
+        self.assertEqual(engine.textColor, QtGui.QColor(u'#000000'))
+        self.assertEqual(engine.font.pixelSize(), 12)
+        self.assertEqual(engine.radius, 3)
+        self.assertIs(CustomArea(target).styleEngine, engine)
+        target.deleteLater()
+
+    def test_default_styles_use_shared_engine(self):
+        from QNotifications import QNotificationArea
+        from QNotifications.styling import StyleEngine
+        target = QtWidgets.QWidget()
+        self.assertIs(QNotificationArea(target).styleEngine, StyleEngine.instance())
+        target.deleteLater()
+
+
+if __name__ == u'__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+""" Tests of the TimeoutScheduler. They are skipped if no Qt binding is installed. """
+
+# Python3 compatibility.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault(u'QT_QPA_PLATFORM', u'offscreen')
+try:
+    from QNotifications.qt import QtWidgets
+except ImportError:
+    QtWidgets = None
+
+__author__ = u"Daniel Schreij"
+__license__ = u"GPLv3"
+
+
+@unittest.skipIf(QtWidgets is None, u'No Qt binding is installed')
+class TimeoutSchedulerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        from QNotifications.timers import TimeoutScheduler
+        self.scheduler = TimeoutScheduler()
+        self.expired = []
+
+    def test_single_timer_for_earliest_deadline(self):
+        objects = [object() for _ in range(3)]
+        for obj, timeout in zip(objects, (60000, 1000, 30000)):
+            self.scheduler.schedule(obj, timeout, self.expired.append)
+        self.assertEqual(len(self.scheduler), 3)
+        # The timer is armed for the earliest deadline (Qt may add a few percent of slack).
+        self.assertLess(self.scheduler._timer.remainingTime(), 2000)
+        self.scheduler.cancel(objects[1])
+        self.assertGreater(self.scheduler._timer.remainingTime(), 20000)
+        self.assertIsNone(self.scheduler.remaining(objects[1]))
+
+    def test_fire(self):
+        objects = [object() for _ in range(3)]
+        for obj, timeout in zip(objects, (0, 0, 60000)):
+            self.scheduler.schedule(obj, timeout, self.expired.append)
+        self.scheduler._timer.timeout.emit()
+        self.assertEqual(self.expired, objects[:2])
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertTrue(self.scheduler._timer.isActive())
+        self.scheduler.cancel(objects[2])
+        self.assertFalse(self.scheduler._timer.isActive())
+
+    def test_pause_and_resume(self):
+        obj = object()
+        self.scheduler.schedule(obj, 1000, self.expired.append)
+        self.scheduler.pause(obj)
+        self.assertFalse(self.scheduler._timer.isActive())
+        remaining = self.scheduler.remaining(obj)
+        time.sleep(0.02)
+        self.assertEqual(self.scheduler.remaining(obj), remaining)
+        self.scheduler.resume(obj)
+        self.assertTrue(self.scheduler._timer.isActive())
+        self.assertLessEqual(self.scheduler.remaining(obj), remaining)
+        self.assertGreater(self.scheduler.remaining(obj), remaining - 20)
+
+    def test_schedule_while_paused(self):
+        obj = object()
+        self.scheduler.schedule(obj, 100, self.expired.append)
+        self.scheduler.pause(obj)
+        self.scheduler.schedule(obj, 5000, self.expired.append)
+        self.assertEqual(self.scheduler.remaining(obj), 5000)
+        self.assertFalse(self.scheduler._timer.isActive())
+
+
+if __name__ == u'__main__':
+    unittest.main()